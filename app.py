@@ -2,6 +2,7 @@ from flask import Flask
 from config import config_by_name
 from routes import main_routes, api_routes
 from models.database import db
+from models.storage import configure_storage
 from flask_migrate import Migrate
 import datetime
 
@@ -12,6 +13,8 @@ def create_app(config_name='default'):
 
     # Initialize SQLAlchemy
     db.init_app(app)
+    with app.app_context():
+        configure_storage(db.engine, app.config['SQLITE_STORAGE_PROFILE'])
 
     # Initialize Flask-Migrate
     migrate = Migrate(app, db)
@@ -12,6 +12,9 @@ class Config:
                               'sqlite:///occult_symbols.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # SQLite PRAGMA profile applied to each connection (see models/storage.py)
+    SQLITE_STORAGE_PROFILE = 'balanced'
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -22,6 +25,7 @@ class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SECRET_KEY = 'this-would-be-a-secure-key-in-production'
+    SQLITE_STORAGE_PROFILE = 'throughput'
 
 
 class TestingConfig(Config):
@@ -29,6 +33,7 @@ class TestingConfig(Config):
     TESTING = True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLITE_STORAGE_PROFILE = 'memory'
 
 
 # Configuration dictionary to easily select environment
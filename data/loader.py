@@ -306,17 +306,22 @@ class DataLoader:
         """Prepare symbol category data for visualization"""
         result = []
 
+        # Index symbols by id once instead of masking the frame for every member
+        symbols_by_id = {
+            row["id"]: row for row in symbols_df[["id", "name", "tradition", "element"]].to_dict("records")
+        }
+
         for category in categories:
             # Get the symbols in this category
             category_symbols = []
             for symbol_id in category["symbols"]:
-                symbol = symbols_df[symbols_df["id"] == symbol_id]
-                if not symbol.empty:
+                symbol = symbols_by_id.get(symbol_id)
+                if symbol is not None:
                     category_symbols.append({
                         "id": symbol_id,
-                        "name": symbol["name"].values[0],
-                        "tradition": symbol["tradition"].values[0],
-                        "element": symbol["element"].values[0]
+                        "name": symbol["name"],
+                        "tradition": symbol["tradition"],
+                        "element": symbol["element"]
                     })
 
             result.append({
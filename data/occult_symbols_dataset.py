@@ -667,6 +667,8 @@ ELEMENTS = [
 TIME_PERIODS = [
     {
         "name": "Ancient (before 0 CE)",
+        "start_year": -40000,
+        "end_year": 0,
         "symbols": [1, 2, 3, 5, 6, 14, 15, 16, 22, 23, 24, 30],
         "description": "Symbols originating in ancient civilizations, often with religious significance",
         "key_developments": ["Sacred writing systems", "State religion symbolism", "Astronomical alignments"],
@@ -674,6 +676,8 @@ TIME_PERIODS = [
     },
     {
         "name": "Classical (0-500 CE)",
+        "start_year": 0,
+        "end_year": 500,
         "symbols": [4, 13, 12],
         "description": "Symbols developed during Greco-Roman and early post-classical period",
         "key_developments": ["Mystery religions", "Syncretism", "Philosophical schools"],
@@ -681,6 +685,8 @@ TIME_PERIODS = [
     },
     {
         "name": "Medieval (500-1500 CE)",
+        "start_year": 500,
+        "end_year": 1500,
         "symbols": [7, 8, 11],
         "description": "Symbols developed during European medieval period and equivalent eras elsewhere",
         "key_developments": ["Grimoire traditions", "Alchemical symbolism", "Religious mysticism"],
@@ -688,6 +694,8 @@ TIME_PERIODS = [
     },
     {
         "name": "Early Modern (1500-1900 CE)",
+        "start_year": 1500,
+        "end_year": 1900,
         "symbols": [10, 18, 25, 26, 27, 28, 29],
         "description": "Symbols from Renaissance through the early industrial period",
         "key_developments": ["Hermetic revival", "Secret societies", "Printing of occult texts"],
@@ -695,6 +703,8 @@ TIME_PERIODS = [
     },
     {
         "name": "Modern (1900 CE-present)",
+        "start_year": 1900,
+        "end_year": 2100,
         "symbols": [17, 19, 20, 21],
         "description": "Symbols created or significantly reimagined in the modern era",
         "key_developments": ["New magical systems", "Psychological interpretation", "Digital sharing"],
@@ -796,7 +806,8 @@ def get_symbols_by_time_period(period_name):
     """Get all symbols from a specific time period"""
     for period in TIME_PERIODS:
         if period["name"] == period_name:
-            return [get_symbol_by_id(id) for id in period["symbols"]]
+            symbols_by_id = {symbol["id"]: symbol for symbol in SYMBOLS}
+            return [symbols_by_id.get(id) for id in period["symbols"]]
     return []
 
 
@@ -821,10 +832,11 @@ def calculate_tradition_influence_score():
                 tradition_scores[tradition] = {"symbols": 0, "connections": 0, "score": 0}
             tradition_scores[tradition]["symbols"] += 1
 
-    # Count connections involving each tradition
+    # Count connections involving each tradition (index symbols once instead of a scan per lookup)
+    symbols_by_id = {symbol["id"]: symbol for symbol in SYMBOLS}
     for connection in CONNECTIONS:
-        source_symbol = get_symbol_by_id(connection["source"])
-        target_symbol = get_symbol_by_id(connection["target"])
+        source_symbol = symbols_by_id[connection["source"]]
+        target_symbol = symbols_by_id[connection["target"]]
 
         source_traditions = source_symbol["tradition"].split("/")
         target_traditions = target_symbol["tradition"].split("/")
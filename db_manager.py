@@ -5,7 +5,11 @@ import argparse
 import json
 import os
 import sys
+import time
+import random
 import logging
+import tempfile
+import threading
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
@@ -13,7 +17,18 @@ from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
 
 from app import create_app
-from models.database import db, Symbol, Tradition, Connection, Element, TimePeriod
+from models.database import db, Symbol, Tradition, Connection, Element, TimePeriod, SuggestedConnection
+from models.migrations import backfill_period_bounds, backfill_symbol_categories, upgrade_indexes
+from models.storage import STORAGE_PROFILES, configure_storage, storage_settings
+from services.indexing import index_symbol_visual_elements, rebuild_visual_index, remove_symbol_from_indexes, \
+    rebuild_correspondence_index, remove_element_from_indexes, clear_indexes, index_tradition_references, \
+    rebuild_reference_index, remove_tradition_from_indexes, index_symbol_periods, rebuild_period_index, \
+    curated_symbol_categories, store_symbol_categories
+from services.fulltext import fulltext_available, rebuild_fulltext_index, search_symbols, like_search_symbols
+from services.fuzzy_index import FuzzyIndex
+from services.graph_export import EXPORT_FORMATS, export_graph
+from services.link_prediction_service import LinkPredictionService
+from services.similarity_service import SimilarityService
 
 # Set up rich console for better display
 console = Console()
@@ -242,6 +257,8 @@ def add_symbol(args):
                 new_symbol.elements.append(element)
 
         db.session.add(new_symbol)
+        index_symbol_visual_elements(new_symbol)
+        index_symbol_periods(new_symbol)
         db.session.commit()
 
         console.print(f"[green]Symbol '{name}' added successfully with ID {new_symbol.id}[/green]")
@@ -319,6 +336,7 @@ def add_tradition(args):
         )
 
         db.session.add(new_tradition)
+        index_tradition_references(new_tradition)
         db.session.commit()
 
         console.print(f"[green]Tradition '{name}' added successfully[/green]")
@@ -374,7 +392,7 @@ def add_connection(args):
             console.print("[red]Please enter a valid ID number[/red]")
 
     # Check if connection already exists
-    existing = Connection.query.filter_by(source_id=source_id, target_id=target_id).first()
+    existing = Connection.between(source_id, target_id)
     if existing:
         console.print(f"[yellow]Connection from '{source.name}' to '{target.name}' already exists.[/yellow]")
         if not Confirm.ask("Do you want to update it?"):
@@ -513,6 +531,8 @@ def edit_symbol(args):
         symbol.description = description
         symbol.usage = usage
         symbol.visual_elements = json.dumps(new_visual_elements)
+        index_symbol_visual_elements(symbol)
+        index_symbol_periods(symbol)
 
         # Update elements if we have that relationship
         if hasattr(symbol, 'elements'):
@@ -638,6 +658,7 @@ def edit_tradition(args):
         tradition.major_texts = json.dumps(new_major_texts)
         tradition.key_figures = json.dumps(new_key_figures)
         tradition.core_concepts = json.dumps(new_core_concepts)
+        index_tradition_references(tradition)
 
         db.session.commit()
         console.print(f"[green]Tradition '{name}' updated successfully[/green]")
@@ -686,7 +707,8 @@ def delete_symbol(args):
         for conn in target_connections:
             db.session.delete(conn)
 
-        # Then delete the symbol
+        # Then delete the symbol and its index entries
+        remove_symbol_from_indexes(symbol_id)
         db.session.delete(symbol)
         db.session.commit()
 
@@ -723,6 +745,7 @@ def delete_tradition(args):
         return
 
     try:
+        remove_tradition_from_indexes(tradition.id)
         db.session.delete(tradition)
         db.session.commit()
 
@@ -828,6 +851,7 @@ def export_data(args):
             "connections": connections_data,
             "elements": elements_data,
             "time_periods": time_periods_data,
+            "metadata": {"symbol_categories": curated_symbol_categories()},
             "export_info": {
                 "date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 "symbol_count": len(symbols_data),
@@ -852,6 +876,28 @@ def export_data(args):
         console.print(f"[red]Error exporting data: {str(e)}[/red]")
 
 
+def export_graph_file(args):
+    """Export the connection graph to GraphML, GEXF or a CSV edge list"""
+    export_format = args.format or "graphml"
+    output_file = args.file or f"symbol_graph.{EXPORT_FORMATS[export_format][1]}"
+
+    console.print(f"[cyan]Exporting {export_format} graph to {output_file}...[/cyan]")
+
+    try:
+        output_dir = os.path.dirname(output_file)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        # Chunks are written as they are produced, so the graph is never held in memory
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            for chunk in export_graph(export_format):
+                f.write(chunk)
+
+        console.print(f"[green]Graph exported successfully to {output_file}[/green]")
+    except Exception as e:
+        console.print(f"[red]Error exporting graph: {str(e)}[/red]")
+
+
 def import_data(args):
     """Import data from JSON file"""
     input_file = args.file
@@ -890,6 +936,7 @@ def import_data(args):
         if mode == "replace":
             # Delete all existing data
             Connection.query.delete()
+            clear_indexes()
             Symbol.query.delete()
             Tradition.query.delete()
             Element.query.delete() if hasattr(Element, 'query') else None
@@ -917,6 +964,8 @@ def import_data(args):
                     visual_elements=json.dumps(symbol_data.get('visual_elements', []))
                 )
                 db.session.add(new_symbol)
+                index_symbol_visual_elements(new_symbol)
+                index_symbol_periods(new_symbol)
                 symbol_count += 1
             except Exception as e:
                 console.print(f"[red]Error importing symbol {symbol_data.get('id')}: {str(e)}[/red]")
@@ -940,6 +989,7 @@ def import_data(args):
                     core_concepts=json.dumps(tradition_data.get('core_concepts', []))
                 )
                 db.session.add(new_tradition)
+                index_tradition_references(new_tradition)
                 tradition_count += 1
             except Exception as e:
                 console.print(f"[red]Error importing tradition {tradition_data.get('name')}: {str(e)}[/red]")
@@ -950,10 +1000,8 @@ def import_data(args):
             source_id = connection_data.get('source')
             target_id = connection_data.get('target')
 
-            # Skip if connection exists in merge mode
-            if mode == "merge" and Connection.query.filter_by(
-                    source_id=source_id, target_id=target_id
-            ).first():
+            # Skip if the pair is already connected (in either direction)
+            if Connection.between(source_id, target_id):
                 continue
 
             # Check if source and target exist
@@ -978,6 +1026,9 @@ def import_data(args):
             except Exception as e:
                 console.print(f"[red]Error importing connection {source_id}->{target_id}: {str(e)}[/red]")
 
+        # Restore curated symbol categories (exports made before they were stored have none)
+        store_symbol_categories(import_data.get('metadata', {}).get('symbol_categories', []))
+
         # Commit all changes
         db.session.commit()
 
@@ -1029,6 +1080,7 @@ def prune_orphans(args):
 
         if prune_elements:
             for element in orphaned_elements:
+                remove_element_from_indexes(element.id)
                 db.session.delete(element)
 
         db.session.commit()
@@ -1095,6 +1147,469 @@ def stats(args):
         console.print(table)
 
 
+def reindex(args):
+    """Rebuild the derived lookup indexes from the stored symbol data"""
+    console.print("[cyan]Rebuilding lookup indexes...[/cyan]")
+
+    try:
+        visual_count = rebuild_visual_index()
+        correspondence_count = rebuild_correspondence_index()
+        reference_count = rebuild_reference_index()
+        period_count = rebuild_period_index()
+        db.session.commit()
+        console.print(f"[green]Indexes rebuilt: {visual_count} visual-term postings, "
+                      f"{correspondence_count} element correspondences, "
+                      f"{reference_count} tradition figures/texts/concepts, "
+                      f"{period_count} time-period memberships[/green]")
+        if rebuild_fulltext_index():
+            console.print("[green]Full-text index rebuilt[/green]")
+        else:
+            console.print("[yellow]FTS5 is not available; search will use LIKE scans[/yellow]")
+    except Exception as e:
+        db.session.rollback()
+        console.print(f"[red]Error rebuilding indexes: {str(e)}[/red]")
+
+
+def migrate(args):
+    """Upgrade an existing database: dedupe connection pairs, add missing indexes, backfill period bounds
+    and curated symbol categories"""
+    console.print("[cyan]Upgrading database indexes...[/cyan]")
+
+    try:
+        removed = upgrade_indexes()
+        if removed:
+            console.print(f"[yellow]Removed {removed} duplicate connections (kept the strongest of each pair)[/yellow]")
+        console.print("[green]Indexes are up to date[/green]")
+
+        updated = backfill_period_bounds()
+        if updated:
+            memberships = rebuild_period_index()
+            db.session.commit()
+            console.print(f"[green]Set year bounds of {updated} time periods "
+                          f"({memberships} time-period memberships)[/green]")
+
+        stored = backfill_symbol_categories()
+        if stored:
+            console.print(f"[green]Stored {stored} curated symbol category memberships[/green]")
+    except Exception as e:
+        db.session.rollback()
+        console.print(f"[red]Error upgrading database: {str(e)}[/red]")
+
+
+def check_plans(args):
+    """Capture EXPLAIN QUERY PLAN of the service queries on a fresh seeded database
+
+    Fails (exit status 1) when an index-driven query scans a large table or,
+    unless --update is given, when a plan differs from the stored snapshot.
+    """
+    from db_setup import initialize_database
+    from services.query_plans import SNAPSHOT_FILE, capture_plans, check_plans as compare_plans, \
+        load_snapshot, order_indexes, save_snapshot, uncovered_methods
+
+    console.print("[cyan]Seeding an in-memory database and capturing query plans...[/cyan]")
+    plan_app = create_app('testing')
+    initialize_database(plan_app)
+    with plan_app.app_context():
+        order_indexes()
+        uncovered = uncovered_methods()
+        captured = capture_plans()
+
+    failures, changed = compare_plans(captured, load_snapshot(), uncovered)
+
+    table = Table(title="Query Plans")
+    table.add_column("Case", style="cyan")
+    table.add_column("Queries", justify="right")
+    table.add_column("Full scans", style="yellow")
+    table.add_column("Status")
+    failed_cases = {name for name, _ in failures}
+    for name, case in captured.items():
+        scans = sorted({t for query in case["queries"] for t in query["scans"]})
+        if name in failed_cases:
+            status = "[red]SCAN[/red]"
+        elif name in changed:
+            status = "[yellow]changed[/yellow]"
+        else:
+            status = "[green]ok[/green]"
+        table.add_row(name, str(len(case["queries"])), ', '.join(scans), status)
+    console.print(table)
+
+    for name, message in failures:
+        console.print(f"[red]{name}:[/red] {message}")
+
+    if args.update:
+        save_snapshot(captured)
+        console.print(f"[green]Snapshot written to {SNAPSHOT_FILE}[/green]")
+    elif changed:
+        console.print(f"[yellow]Plans differ from {SNAPSHOT_FILE} for: {', '.join(changed)}. "
+                      f"Review and rerun with --update to accept.[/yellow]")
+
+    if failures or (changed and not args.update):
+        sys.exit(1)
+
+
+def benchmark_search(args):
+    """Compare search latency of the FTS5 index against the LIKE scan"""
+    repeat = args.repeat or 50
+    limit = args.limit or 50
+    queries = args.queries or ["cross", "egypt", "protection", "sacred geometry", "moon"]
+
+    if not fulltext_available():
+        console.print("[red]FTS5 is not available in this SQLite build; nothing to compare[/red]")
+        return
+
+    table = Table(title=f"Search Latency ({Symbol.query.count()} symbols, {repeat} runs, top {limit})")
+    table.add_column("Query", style="green")
+    table.add_column("FTS5 hits", justify="right")
+    table.add_column("FTS5 mean ms", justify="right", style="cyan")
+    table.add_column("FTS5 p95 ms", justify="right", style="cyan")
+    table.add_column("LIKE hits", justify="right")
+    table.add_column("LIKE mean ms", justify="right", style="yellow")
+    table.add_column("LIKE p95 ms", justify="right", style="yellow")
+
+    for query in queries:
+        row = [query]
+        for search in (search_symbols, like_search_symbols):
+            hits = len(search(query, limit))  # warm-up
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                search(query, limit)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            row += [str(hits), f"{sum(timings) / len(timings):.3f}",
+                    f"{timings[min(len(timings) - 1, int(len(timings) * 0.95))]:.3f}"]
+        table.add_row(*row)
+
+    console.print(table)
+
+
+def benchmark_fuzzy(args):
+    """Time the trigram fuzzy index on synthetic symbol names with typos"""
+    size = args.symbols or 100000
+    num_queries = args.queries or 1000
+    rng = random.Random(args.seed or 0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+
+    def random_word():
+        return ''.join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+
+    def misspell(name):
+        chars = list(name)
+        position = rng.randrange(len(chars))
+        edit = rng.choice(["delete", "insert", "replace", "swap"])
+        if edit == "delete" and len(chars) > 4:
+            del chars[position]
+        elif edit == "insert":
+            chars.insert(position, rng.choice(letters))
+        elif edit == "swap" and position < len(chars) - 1:
+            chars[position], chars[position + 1] = chars[position + 1], chars[position]
+        else:
+            chars[position] = rng.choice(letters)
+        return ''.join(chars)
+
+    vocabulary = [random_word() for _ in range(max(size, 10))]
+    names = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))).title() for _ in range(size)]
+
+    console.print(f"[cyan]Building fuzzy index over {size} synthetic symbols...[/cyan]")
+    start = time.perf_counter()
+    index = FuzzyIndex((name, ('symbol', i)) for i, name in enumerate(names))
+    build_seconds = time.perf_counter() - start
+
+    timings = []
+    hits = 0
+    for _ in range(num_queries):
+        target = rng.randrange(size)
+        query = misspell(names[target])
+        start = time.perf_counter()
+        matches = index.match(query, limit=10)
+        timings.append((time.perf_counter() - start) * 1000)
+        if any(match[0] == ('symbol', target) for match in matches):
+            hits += 1
+
+    timings.sort()
+    table = Table(title=f"Fuzzy Search ({size} symbols, {len(index)} terms, {num_queries} misspelled queries)")
+    table.add_column("Metric", style="green")
+    table.add_column("Value", justify="right", style="cyan")
+    table.add_row("Build time", f"{build_seconds:.2f} s")
+    table.add_row("Mean query", f"{sum(timings) / len(timings):.3f} ms")
+    table.add_row("p50 query", f"{timings[len(timings) // 2]:.3f} ms")
+    table.add_row("p95 query", f"{timings[min(len(timings) - 1, int(len(timings) * 0.95))]:.3f} ms")
+    table.add_row("Max query", f"{timings[-1]:.3f} ms")
+    table.add_row("Target in top 10", f"{100.0 * hits / num_queries:.1f}%")
+    console.print(table)
+
+
+# Symbols fetched per read in the storage benchmark
+STORAGE_BENCHMARK_PAGE = 50
+
+
+def benchmark_storage(args):
+    """Measure read throughput during concurrent bulk writes for each storage profile
+
+    Each profile gets a fresh database file seeded with synthetic symbols.
+    One writer thread inserts batches of symbols in transactions (like a
+    db_sync run) while reader threads fetch pages of symbols by id range.
+    """
+    profiles = args.profiles or [name for name in STORAGE_PROFILES if name != 'memory']
+    seconds = args.seconds
+    readers = args.readers
+    batch = args.batch
+    size = args.symbols
+
+    unknown = [name for name in profiles if name not in STORAGE_PROFILES]
+    if unknown:
+        console.print(f"[red]Unknown storage profile(s): {', '.join(unknown)}. "
+                      f"Choose from {', '.join(STORAGE_PROFILES)}[/red]")
+        return
+
+    table = Table(title=f"Reads During Bulk Writes ({size} symbols, {readers} readers, "
+                        f"batches of {batch}, {seconds:g} s)")
+    table.add_column("Profile", style="green")
+    table.add_column("Journal")
+    table.add_column("Reads/s", justify="right", style="cyan")
+    table.add_column("Mean ms", justify="right", style="cyan")
+    table.add_column("p95 ms", justify="right", style="cyan")
+    table.add_column("Max ms", justify="right", style="cyan")
+    table.add_column("Failed reads", justify="right", style="red")
+    table.add_column("Rows written/s", justify="right", style="yellow")
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        for profile in profiles:
+            console.print(f"[cyan]Benchmarking storage profile '{profile}'...[/cyan]")
+            engine = db.create_engine(f"sqlite:///{os.path.join(directory, profile + '.db')}")
+            configure_storage(engine, profile)
+            try:
+                with engine.connect() as connection:
+                    journal = storage_settings(connection)['journal_mode']
+                timings, failed, written = _storage_workload(engine, seconds, readers, batch, size)
+            except RuntimeError as e:
+                console.print(f"[red]Profile '{profile}' failed: {str(e)}[/red]")
+                continue
+            finally:
+                engine.dispose()
+
+            timings.sort()
+            if timings:
+                latency = [f"{sum(timings) / len(timings):.3f}",
+                           f"{timings[min(len(timings) - 1, int(len(timings) * 0.95))]:.3f}",
+                           f"{timings[-1]:.1f}"]
+            else:
+                latency = ["-", "-", "-"]
+            table.add_row(profile, journal, f"{len(timings) / seconds:.0f}", *latency,
+                          str(failed), f"{written / seconds:.0f}")
+
+    console.print(table)
+
+
+def _storage_workload(engine, seconds, readers, batch, size, page=STORAGE_BENCHMARK_PAGE):
+    """Run the concurrent read/write workload; return (read latencies in ms, failed reads, rows written)
+
+    Raises:
+        RuntimeError: if the writer or a reader thread failed
+    """
+    symbols = Symbol.__table__
+    db.metadata.create_all(engine, tables=[symbols])
+
+    def rows(start, count):
+        return [{"id": i, "name": f"Synthetic Symbol {i}", "tradition": f"Tradition {i % 40}",
+                 "century_origin": i % 40 - 20, "description": f"Synthetic description {i} " * 4,
+                 "usage": "Benchmark", "visual_elements": "circle, line"} for i in range(start, start + count)]
+
+    with engine.begin() as connection:
+        connection.execute(symbols.insert(), rows(1, size))
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    timings = []
+    errors = []
+    counts = {"failed": 0, "written": 0}
+    statement = db.select(symbols.c.id, symbols.c.name, symbols.c.tradition, symbols.c.century_origin) \
+        .where(symbols.c.id.between(db.bindparam('low'), db.bindparam('high'))).order_by(symbols.c.id)
+
+    def write():
+        next_id = size + 1
+        while not stop.is_set():
+            with engine.begin() as connection:
+                connection.execute(symbols.insert(), rows(next_id, batch))
+            next_id += batch
+            with lock:
+                counts["written"] += batch
+
+    def read(seed):
+        rng = random.Random(seed)
+        local, failed = [], 0
+        with engine.connect() as connection:
+            while not stop.is_set():
+                low = rng.randint(1, size - page + 1)
+                start = time.perf_counter()
+                try:
+                    connection.execute(statement, {"low": low, "high": low + page - 1}).all()
+                    connection.rollback()
+                except db.exc.OperationalError:
+                    # 'database is locked' after busy_timeout expired
+                    connection.rollback()
+                    failed += 1
+                    continue
+                local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            timings.extend(local)
+            counts["failed"] += failed
+
+    def guarded(name, work, *work_args):
+        # Record the failure and end the run, so a dead thread is not reported as a slow one
+        try:
+            work(*work_args)
+        except Exception as e:
+            with lock:
+                errors.append(f"{name}: {e}")
+            stop.set()
+
+    threads = [threading.Thread(target=guarded, args=("writer", write))] + \
+              [threading.Thread(target=guarded, args=(f"reader {seed}", read, seed)) for seed in range(readers)]
+    try:
+        for thread in threads:
+            thread.start()
+        stop.wait(seconds)
+    finally:
+        stop.set()
+        for thread in threads:
+            if thread.is_alive():
+                thread.join()
+    if errors:
+        raise RuntimeError('; '.join(errors))
+    return timings, counts["failed"], counts["written"]
+
+
+def suggest_connections(args):
+    """Run the link-prediction job and store suggested connections"""
+    top_k = args.top_k
+    block_size = args.block_size
+
+    console.print(f"[cyan]Scoring candidate connections (top {top_k}, block size {block_size})...[/cyan]")
+
+    try:
+        suggestions = LinkPredictionService(top_k=top_k, block_size=block_size).generate_suggestions()
+    except Exception as e:
+        db.session.rollback()
+        console.print(f"[red]Error generating suggestions: {str(e)}[/red]")
+        return
+
+    if not suggestions:
+        console.print("[yellow]No candidate connections found.[/yellow]")
+        return
+
+    table = Table(title=f"Suggested Connections ({len(suggestions)} stored)")
+    table.add_column("Source", style="green")
+    table.add_column("Target", style="green")
+    table.add_column("Score", justify="right", style="cyan")
+    table.add_column("Common", justify="right")
+    table.add_column("Adamic-Adar", justify="right")
+    table.add_column("Jaccard", justify="right")
+
+    for suggestion in suggestions[:20]:
+        table.add_row(
+            str(suggestion['source']),
+            str(suggestion['target']),
+            f"{suggestion['score']:.3f}",
+            str(suggestion['common_neighbors']),
+            f"{suggestion['adamic_adar']:.3f}",
+            f"{suggestion['jaccard']:.3f}"
+        )
+
+    console.print(table)
+    console.print("Run [bold]db_manager.py review[/bold] to accept or reject them")
+
+
+def compute_similar(args):
+    """Recompute TF-IDF similar-symbol neighbors (incrementally unless --full)"""
+    top_k = args.top_k
+    block_size = args.block_size
+    mode = "full" if args.full else "incremental"
+
+    console.print(f"[cyan]Computing similar symbols ({mode}, top {top_k}, block size {block_size})...[/cyan]")
+
+    try:
+        count = SimilarityService(top_k=top_k, block_size=block_size).compute(full=args.full)
+    except Exception as e:
+        db.session.rollback()
+        console.print(f"[red]Error computing similar symbols: {str(e)}[/red]")
+        return
+
+    if count:
+        console.print(f"[green]Recomputed neighbors for {count} symbols[/green]")
+    else:
+        console.print("[yellow]No symbol text changed since the last run[/yellow]")
+
+
+def review_suggestions(args):
+    """Interactively accept or reject pending suggested connections"""
+    console.print(Panel.fit("[bold]Review Suggested Connections[/bold]", border_style="green"))
+
+    SuggestedConnection.__table__.create(db.engine, checkfirst=True)
+    suggestions = SuggestedConnection.query.filter_by(status='pending') \
+        .order_by(SuggestedConnection.score.desc()).all()
+
+    if not suggestions:
+        console.print("[yellow]No pending suggestions. Run the 'suggest' command first.[/yellow]")
+        return
+
+    accepted = 0
+    rejected = 0
+    for suggestion in suggestions:
+        source = Symbol.query.get(suggestion.source_id)
+        target = Symbol.query.get(suggestion.target_id)
+        if not source or not target:
+            continue
+
+        console.print(f"\n[bold]{source.name}[/bold] ({source.tradition}) ↔ "
+                      f"[bold]{target.name}[/bold] ({target.tradition})")
+        console.print(f"Score: {suggestion.score:.3f}  |  Common neighbors: {suggestion.common_neighbors}  |  "
+                      f"Adamic-Adar: {suggestion.adamic_adar:.3f}  |  Jaccard: {suggestion.jaccard:.3f}  |  "
+                      f"Shared elements: {suggestion.shared_elements}  |  "
+                      f"Shared traditions: {suggestion.shared_traditions}")
+
+        action = Prompt.ask("[bold]Action[/bold]", choices=["accept", "reject", "skip", "quit"], default="skip")
+        if action == "quit":
+            break
+        if action == "skip":
+            continue
+
+        try:
+            if action == "accept":
+                while True:
+                    strength_input = Prompt.ask("[bold]Connection Strength[/bold] (0.0-1.0)", default="0.5")
+                    try:
+                        strength = float(strength_input)
+                        if 0 <= strength <= 1:
+                            break
+                        console.print("[red]Strength must be between 0.0 and 1.0[/red]")
+                    except ValueError:
+                        console.print("[red]Please enter a valid number[/red]")
+
+                description = Prompt.ask("[bold]Connection Description[/bold]",
+                                         default="Suggested by link prediction")
+                # The pair may have been connected by hand since the suggestion was made
+                if not Connection.between(suggestion.source_id, suggestion.target_id):
+                    db.session.add(Connection(
+                        source_id=suggestion.source_id,
+                        target_id=suggestion.target_id,
+                        strength=strength,
+                        description=description
+                    ))
+                suggestion.status = 'accepted'
+                accepted += 1
+            else:
+                suggestion.status = 'rejected'
+                rejected += 1
+
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            console.print(f"[red]Error updating suggestion: {str(e)}[/red]")
+
+    console.print(f"[green]Review finished: accepted {accepted}, rejected {rejected}[/green]")
+
+
 def main():
     """Main entry point for the CLI tool"""
     parser = argparse.ArgumentParser(description="Occult Symbols Database Manager")
@@ -1161,6 +1676,11 @@ def main():
     export_parser.add_argument("--file", help="Output file path")
     export_parser.set_defaults(func=export_data)
 
+    export_graph_parser = subparsers.add_parser("export-graph", help="Export connection graph (GraphML/GEXF/CSV)")
+    export_graph_parser.add_argument("--format", choices=list(EXPORT_FORMATS), help="Output format (default graphml)")
+    export_graph_parser.add_argument("--file", help="Output file path")
+    export_graph_parser.set_defaults(func=export_graph_file)
+
     import_parser = subparsers.add_parser("import", help="Import database from JSON")
     import_parser.add_argument("--file", required=True, help="Input file path")
     import_parser.add_argument("--mode", choices=["merge", "replace"], help="Import mode")
@@ -1173,8 +1693,65 @@ def main():
     stats_parser = subparsers.add_parser("stats", help="Display database statistics")
     stats_parser.set_defaults(func=stats)
 
+    reindex_parser = subparsers.add_parser("reindex", help="Rebuild derived lookup indexes")
+    reindex_parser.set_defaults(func=reindex)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Upgrade an existing database schema (indexes, time period bounds, symbol categories)")
+    migrate_parser.set_defaults(func=migrate)
+
+    plans_parser = subparsers.add_parser("check-plans", help="Check query plans against the stored snapshot")
+    plans_parser.add_argument("--update", action="store_true", help="Rewrite the snapshot with the current plans")
+    plans_parser.set_defaults(func=check_plans)
+
+    benchmark_parser = subparsers.add_parser("benchmark-search", help="Compare FTS5 and LIKE search latency")
+    benchmark_parser.add_argument("queries", nargs="*", help="Queries to time (default: a small built-in set)")
+    benchmark_parser.add_argument("--repeat", type=int, help="Timed runs per query (default 50)")
+    benchmark_parser.add_argument("--limit", type=int, help="Results per search (default 50)")
+    benchmark_parser.set_defaults(func=benchmark_search)
+
+    fuzzy_parser = subparsers.add_parser("benchmark-fuzzy", help="Time fuzzy search on synthetic misspellings")
+    fuzzy_parser.add_argument("--symbols", type=int, help="Number of synthetic symbols (default 100000)")
+    fuzzy_parser.add_argument("--queries", type=int, help="Number of misspelled queries (default 1000)")
+    fuzzy_parser.add_argument("--seed", type=int, help="Random seed (default 0)")
+    fuzzy_parser.set_defaults(func=benchmark_fuzzy)
+
+    storage_parser = subparsers.add_parser("benchmark-storage",
+                                           help="Compare read throughput during bulk writes per storage profile")
+    storage_parser.add_argument("profiles", nargs="*",
+                                help=f"Profiles to compare: {', '.join(STORAGE_PROFILES)} (default: all but memory)")
+    storage_parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run (default 5)")
+    storage_parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads (default 4)")
+    storage_parser.add_argument("--batch", type=int, default=5000,
+                                help="Symbols inserted per write transaction (default 5000)")
+    storage_parser.add_argument("--symbols", type=int, default=20000,
+                                help=f"Symbols seeded before the run (default 20000, at least {STORAGE_BENCHMARK_PAGE})")
+    storage_parser.add_argument("--dir", help="Directory for the benchmark databases (default: system temp)")
+    storage_parser.set_defaults(func=benchmark_storage)
+
+    # Link prediction commands
+    suggest_parser = subparsers.add_parser("suggest", help="Suggest missing connections via link prediction")
+    suggest_parser.add_argument("--top-k", type=int, default=100, help="Number of suggestions to keep (default 100)")
+    suggest_parser.add_argument("--block-size", type=int, default=1024, help="Rows scored per block (default 1024)")
+    suggest_parser.set_defaults(func=suggest_connections)
+
+    review_parser = subparsers.add_parser("review", help="Review suggested connections")
+    review_parser.set_defaults(func=review_suggestions)
+
+    similar_parser = subparsers.add_parser("similar", help="Compute text-similar symbols (TF-IDF)")
+    similar_parser.add_argument("--full", action="store_true", help="Recompute every symbol, not only changed ones")
+    similar_parser.add_argument("--top-k", type=int, default=10, help="Neighbors stored per symbol (default 10)")
+    similar_parser.add_argument("--block-size", type=int, default=512, help="Rows multiplied per block (default 512)")
+    similar_parser.set_defaults(func=compute_similar)
+
     args = parser.parse_args()
 
+    for option in ("top_k", "block_size", "seconds", "readers", "batch", "symbols"):
+        value = getattr(args, option, None)
+        if value is not None and value <= 0:
+            parser.error(f"--{option.replace('_', '-')} must be positive")
+    if getattr(args, "func", None) is benchmark_storage and args.symbols < STORAGE_BENCHMARK_PAGE:
+        parser.error(f"--symbols must be at least {STORAGE_BENCHMARK_PAGE} (one page of reads)")
+
     # Initialize database connection
     app = init_db()
 
@@ -1198,8 +1775,9 @@ def main():
             "Add symbol", "Add tradition", "Add connection",
             "Edit symbol", "Edit tradition",
             "Delete symbol", "Delete tradition", "Delete connection",
-            "Export data", "Import data",
-            "Prune orphans", "Show stats",
+            "Export data", "Export graph", "Import data",
+            "Prune orphans", "Show stats", "Rebuild indexes",
+            "Suggest connections", "Review suggestions", "Compute similar symbols",
             "Exit"
         ]
 
@@ -1231,6 +1809,11 @@ def main():
             file = Prompt.ask("[bold]Output file path[/bold]", default="occult_symbols_export.json")
             args.file = file
             export_data(args)
+        elif action == "Export graph":
+            args.format = Prompt.ask("[bold]Format[/bold]", choices=list(EXPORT_FORMATS), default="graphml")
+            args.file = Prompt.ask("[bold]Output file path[/bold]",
+                                   default=f"symbol_graph.{EXPORT_FORMATS[args.format][1]}")
+            export_graph_file(args)
         elif action == "Import data":
             file = Prompt.ask("[bold]Input file path[/bold]")
             mode = Prompt.ask("[bold]Import mode[/bold]", choices=["merge", "replace"], default="merge")
@@ -1241,6 +1824,19 @@ def main():
             prune_orphans(args)
         elif action == "Show stats":
             stats(args)
+        elif action == "Rebuild indexes":
+            reindex(args)
+        elif action == "Suggest connections":
+            args.top_k = suggest_parser.get_default("top_k")
+            args.block_size = suggest_parser.get_default("block_size")
+            suggest_connections(args)
+        elif action == "Review suggestions":
+            review_suggestions(args)
+        elif action == "Compute similar symbols":
+            args.full = False
+            args.top_k = similar_parser.get_default("top_k")
+            args.block_size = similar_parser.get_default("block_size")
+            compute_similar(args)
         elif action == "Exit":
             console.print("[green]Goodbye![/green]")
 
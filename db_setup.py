@@ -2,14 +2,19 @@ from app import create_app
 from models.database import db, Symbol, Connection, Tradition, Element, TimePeriod
 import json
 from data.occult_symbols_dataset import get_complete_dataset
+from services.fulltext import fulltext_available
+from services.indexing import index_symbol_visual_elements, index_element_correspondences, \
+    index_tradition_references, rebuild_period_index, store_symbol_categories
 
 
-def initialize_database():
-    """Initialize database with occult symbols dataset"""
-    app = create_app()
+def initialize_database(app=None):
+    """Initialize database with occult symbols dataset (of the default app unless one is given)"""
+    app = app or create_app()
     with app.app_context():
         # Create all tables
         db.create_all()
+        # Full-text index and its sync triggers, before any symbols are inserted
+        fulltext_available()
 
         # Check if database is already populated
         if Symbol.query.count() > 0:
@@ -28,6 +33,7 @@ def initialize_database():
                 correspondences=json.dumps(element_data.get("correspondences", {}))
             )
             db.session.add(element)
+            index_element_correspondences(element)
             # Store in dictionary for later reference
             elements[element_data["name"]] = element
 
@@ -58,13 +64,19 @@ def initialize_database():
                     symbol.elements.append(elements[element_name])
 
             db.session.add(symbol)
+            index_symbol_visual_elements(symbol)
             symbols[symbol_data["id"]] = symbol
 
         # Commit to get symbol IDs
         db.session.commit()
 
-        # Insert connections
+        # Insert connections, one per undirected symbol pair
+        pairs = set()
         for conn_data in dataset["connections"]:
+            pair = frozenset((conn_data["source"], conn_data["target"]))
+            if pair in pairs:
+                continue
+            pairs.add(pair)
             connection = Connection(
                 source_id=conn_data["source"],
                 target_id=conn_data["target"],
@@ -86,15 +98,10 @@ def initialize_database():
                 core_concepts=json.dumps(trad_data.get("core_concepts", []))
             )
             db.session.add(tradition)
+            index_tradition_references(tradition)
 
         # Insert time periods
         for period_data in dataset["time_periods"]:
-            # Convert century-based dates to years
-            if 'symbols' in period_data:
-                symbols_json = json.dumps(period_data["symbols"])
-            else:
-                symbols_json = "[]"
-
             period = TimePeriod(
                 name=period_data["name"],
                 start_year=period_data.get("start_year", 0),
@@ -103,6 +110,12 @@ def initialize_database():
             )
             db.session.add(period)
 
+        # Derive period membership from each symbol's century of origin
+        rebuild_period_index()
+
+        # Store the curated symbol categories
+        store_symbol_categories(dataset["metadata"]["symbol_categories"])
+
         # Commit all changes
         db.session.commit()
         print("Database successfully initialized with occult symbols data.")
@@ -6,6 +6,8 @@ import logging
 from datetime import datetime
 from app import create_app
 from models.database import db, Symbol, Tradition, Element, Connection, TimePeriod
+from services.indexing import index_symbol_visual_elements, index_symbol_periods, index_tradition_references, \
+    store_symbol_categories
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
@@ -13,8 +15,8 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger('db_sync')
 
 
-def synchronize_db_with_json(json_file):
-    """Synchronize the database with the contents of a JSON file"""
+def synchronize_db_with_json(json_file, app=None):
+    """Synchronize the database (of the default app unless one is given) with a JSON file"""
     if not os.path.exists(json_file):
         logger.error(f"JSON file not found: {json_file}")
         return False
@@ -27,7 +29,7 @@ def synchronize_db_with_json(json_file):
         logger.error(f"Error decoding JSON from {json_file}")
         return False
 
-    app = create_app()
+    app = app or create_app()
     with app.app_context():
         # Initialize counters for logging
         symbols_added = 0
@@ -55,11 +57,13 @@ def synchronize_db_with_json(json_file):
                     visual_elements_json = json.dumps(symbol_data['visual_elements'])
                     if symbol.visual_elements != visual_elements_json:
                         symbol.visual_elements = visual_elements_json
+                        index_symbol_visual_elements(symbol)
                         updated = True
 
                 # Handle century_origin
                 if 'century_origin' in symbol_data and symbol.century_origin != symbol_data['century_origin']:
                     symbol.century_origin = symbol_data['century_origin']
+                    index_symbol_periods(symbol)
                     updated = True
 
                 if updated:
@@ -77,6 +81,8 @@ def synchronize_db_with_json(json_file):
                         visual_elements=json.dumps(symbol_data.get('visual_elements', []))
                     )
                     db.session.add(new_symbol)
+                    index_symbol_visual_elements(new_symbol)
+                    index_symbol_periods(new_symbol)
                     symbols_added += 1
                 except Exception as e:
                     logger.error(f"Error adding symbol {symbol_data.get('id')}: {str(e)}")
@@ -106,6 +112,7 @@ def synchronize_db_with_json(json_file):
                             updated = True
 
                 if updated:
+                    index_tradition_references(tradition)
                     traditions_updated += 1
             else:
                 # Create new tradition
@@ -120,6 +127,7 @@ def synchronize_db_with_json(json_file):
                         core_concepts=json.dumps(tradition_data.get('core_concepts', []))
                     )
                     db.session.add(new_tradition)
+                    index_tradition_references(new_tradition)
                     traditions_added += 1
                 except Exception as e:
                     logger.error(f"Error adding tradition {name}: {str(e)}")
@@ -130,11 +138,8 @@ def synchronize_db_with_json(json_file):
             source_id = conn_data.get('source')
             target_id = conn_data.get('target')
 
-            # Check if connection exists
-            connection = Connection.query.filter_by(
-                source_id=source_id,
-                target_id=target_id
-            ).first()
+            # Check if connection exists (in either direction)
+            connection = Connection.between(source_id, target_id)
 
             if not connection:
                 try:
@@ -149,13 +154,19 @@ def synchronize_db_with_json(json_file):
                 except Exception as e:
                     logger.error(f"Error adding connection {source_id}->{target_id}: {str(e)}")
 
+        # Synchronize curated symbol categories (the listed ones are replaced, others kept)
+        categories = data.get('metadata', {}).get('symbol_categories', [])
+        logger.info(f"Synchronizing {len(categories)} symbol categories")
+        category_changes = store_symbol_categories(categories)
+
         # Commit all changes
         try:
             db.session.commit()
             logger.info(f"Database synchronized successfully: "
                         f"Added {symbols_added} symbols, {traditions_added} traditions, "
                         f"{connections_added} connections; "
-                        f"Updated {symbols_updated} symbols, {traditions_updated} traditions")
+                        f"Updated {symbols_updated} symbols, {traditions_updated} traditions; "
+                        f"Changed {category_changes} symbol category memberships")
             return True
         except Exception as e:
             db.session.rollback()
@@ -1,12 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 import json
+from datetime import datetime
 
 db = SQLAlchemy()
 
 # Association table for many-to-many relationships
 symbol_element_association = db.Table('symbol_element',
                                       db.Column('symbol_id', db.Integer, db.ForeignKey('symbol.id'), primary_key=True),
-                                      db.Column('element_id', db.Integer, db.ForeignKey('element.id'), primary_key=True)
+                                      db.Column('element_id', db.Integer, db.ForeignKey('element.id'), primary_key=True),
+                                      # The primary key only serves symbol -> elements lookups
+                                      db.Index('ix_symbol_element_element', 'element_id', 'symbol_id')
                                       )
 
 
@@ -50,6 +55,20 @@ class Connection(db.Model):
     strength = db.Column(db.Float, nullable=False)
     description = db.Column(db.Text)
 
+    # Both lookup directions, with strength so degree/strength aggregates are index-only
+    __table_args__ = (
+        db.Index('ix_connection_source_target', 'source_id', 'target_id', 'strength'),
+        db.Index('ix_connection_target_source', 'target_id', 'source_id', 'strength'),
+    )
+
+    @classmethod
+    def between(cls, first_id, second_id):
+        """Return the connection linking two symbols in either direction, or None"""
+        return cls.query.filter(db.or_(
+            db.and_(cls.source_id == first_id, cls.target_id == second_id),
+            db.and_(cls.source_id == second_id, cls.target_id == first_id)
+        )).first()
+
     def to_dict(self):
         """Convert instance to dictionary"""
         return {
@@ -60,6 +79,17 @@ class Connection(db.Model):
         }
 
 
+def connection_pair_key(connection_table):
+    """Lower and higher symbol id of a connection: its canonical undirected pair"""
+    source, target = connection_table.c.source_id, connection_table.c.target_id
+    return (db.case((source < target, source), else_=target),
+            db.case((source < target, target), else_=source))
+
+
+# At most one connection per undirected symbol pair, whichever way round it was entered
+db.Index('ux_connection_pair', *connection_pair_key(Connection.__table__), unique=True)
+
+
 class Tradition(db.Model):
     """Model for esoteric traditions"""
     id = db.Column(db.Integer, primary_key=True)
@@ -118,4 +148,195 @@ class TimePeriod(db.Model):
             'start_year': self.start_year,
             'end_year': self.end_year,
             'description': self.description
-        }
\ No newline at end of file
+        }
+
+
+class SymbolVisualTerm(db.Model):
+    """Inverted index entry mapping a normalized visual term to a symbol"""
+    term = db.Column(db.String(100), primary_key=True)
+    symbol_id = db.Column(db.Integer, db.ForeignKey('symbol.id'), primary_key=True, index=True)
+
+
+class ElementCorrespondence(db.Model):
+    """Flattened key/value correspondence of an element (e.g. colors = Gold)"""
+    id = db.Column(db.Integer, primary_key=True)
+    element_id = db.Column(db.Integer, db.ForeignKey('element.id'), nullable=False, index=True)
+    key = db.Column(db.String(100), nullable=False)
+    value = db.Column(db.String(255), nullable=False)
+    key_norm = db.Column(db.String(100), nullable=False)
+    value_norm = db.Column(db.String(255), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_element_correspondence_key_value', 'key_norm', 'value_norm'),
+        db.Index('ix_element_correspondence_value', 'value_norm'),
+    )
+
+
+class TraditionReference(db.Model):
+    """Key figure, major text or core concept of a tradition, normalized for lookup"""
+    id = db.Column(db.Integer, primary_key=True)
+    tradition_id = db.Column(db.Integer, db.ForeignKey('tradition.id'), nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)  # figure/text/concept
+    value = db.Column(db.String(255), nullable=False)
+    value_norm = db.Column(db.String(255), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_tradition_reference_kind_value', 'kind', 'value_norm'),
+    )
+
+
+class TimePeriodSymbol(db.Model):
+    """Membership of a symbol in a time period, derived from its century of origin"""
+    period_id = db.Column(db.Integer, db.ForeignKey('time_period.id'), primary_key=True)
+    symbol_id = db.Column(db.Integer, db.ForeignKey('symbol.id'), primary_key=True, index=True)
+
+
+class SymbolCategory(db.Model):
+    """Curated membership of a symbol in a visualization category"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    symbol_id = db.Column(db.Integer, db.ForeignKey('symbol.id'), nullable=False, index=True)
+
+    __table_args__ = (db.UniqueConstraint('name', 'symbol_id', name='ux_symbol_category'),)
+
+
+class SuggestedConnection(db.Model):
+    """Model for machine-suggested connections awaiting manual review"""
+    id = db.Column(db.Integer, primary_key=True)
+    source_id = db.Column(db.Integer, db.ForeignKey('symbol.id'), nullable=False)
+    target_id = db.Column(db.Integer, db.ForeignKey('symbol.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False, index=True)
+    common_neighbors = db.Column(db.Integer, nullable=False, default=0)
+    adamic_adar = db.Column(db.Float, nullable=False, default=0.0)
+    jaccard = db.Column(db.Float, nullable=False, default=0.0)
+    shared_elements = db.Column(db.Integer, nullable=False, default=0)
+    shared_traditions = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)  # pending/accepted/rejected
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    source = db.relationship('Symbol', foreign_keys=[source_id])
+    target = db.relationship('Symbol', foreign_keys=[target_id])
+
+    __table_args__ = (db.UniqueConstraint('source_id', 'target_id', name='uq_suggested_connection_pair'),)
+
+    def to_dict(self):
+        """Convert instance to dictionary"""
+        return {
+            'id': self.id,
+            'source': self.source_id,
+            'target': self.target_id,
+            'score': self.score,
+            'common_neighbors': self.common_neighbors,
+            'adamic_adar': self.adamic_adar,
+            'jaccard': self.jaccard,
+            'shared_elements': self.shared_elements,
+            'shared_traditions': self.shared_traditions,
+            'status': self.status
+        }
+
+
+class SimilarSymbol(db.Model):
+    """Precomputed text-similarity neighbor of a symbol (TF-IDF cosine)"""
+    symbol_id = db.Column(db.Integer, db.ForeignKey('symbol.id'), primary_key=True)
+    neighbor_id = db.Column(db.Integer, db.ForeignKey('symbol.id'), primary_key=True, index=True)
+    score = db.Column(db.Float, nullable=False)
+
+
+class SymbolTextDigest(db.Model):
+    """Digest of the text a symbol's similarity neighbors were computed from"""
+    symbol_id = db.Column(db.Integer, primary_key=True)
+    digest = db.Column(db.String(40), nullable=False)
+
+
+class DatasetVersion(db.Model):
+    """Single-row counter bumped whenever the symbol dataset changes"""
+    __tablename__ = 'dataset_version'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def current(cls):
+        """Return the current dataset version (0 if nothing was ever recorded)"""
+        if not _has_version_table(db.engine):
+            return 0
+        version = db.session.execute(db.select(cls.version).where(cls.id == 1)).scalar()
+        return version or 0
+
+    @classmethod
+    def bump(cls, connection):
+        """Increment the dataset version inside the caller's transaction and return it"""
+        if str(connection.engine.url) not in _version_tables:
+            cls.__table__.create(connection, checkfirst=True)
+        result = connection.execute(
+            cls.__table__.update().where(cls.id == 1).values(version=cls.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(cls.__table__.insert().values(id=1, version=1))
+        return connection.execute(db.select(cls.version).where(cls.id == 1)).scalar()
+
+
+# Models whose changes invalidate anything derived from the dataset
+VERSIONED_MODELS = (Symbol, Connection, Tradition, Element, TimePeriod, SymbolCategory)
+
+_version_tables = set()
+_change_listeners = []
+
+
+def _has_version_table(engine):
+    """Check (and remember) whether the dataset_version table exists"""
+    key = str(engine.url)
+    if key not in _version_tables and inspect(engine).has_table(DatasetVersion.__tablename__):
+        _version_tables.add(key)
+    return key in _version_tables
+
+
+def on_dataset_change(listener):
+    """Register listener(version, changes), called after each committed dataset change
+
+    ``changes`` maps a model name to the set of primary keys that were added,
+    modified or deleted, or is None when the change is not known row by row
+    (bulk insert/update/delete) and any derived state must be rebuilt.
+    """
+    _change_listeners.append(listener)
+    return listener
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_version_after_flush(session, flush_context):
+    """Bump the dataset version and record touched rows when a flush changed versioned models"""
+    changes = {}
+    for obj in list(session.new) + list(session.deleted) + list(session.dirty):
+        if not isinstance(obj, VERSIONED_MODELS):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        changes.setdefault(type(obj).__name__, set()).add(obj.id)
+    if changes:
+        version = DatasetVersion.bump(session.connection())
+        session.info.setdefault('dataset_changes', []).append((version, changes))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bump_version_on_bulk_write(orm_execute_state):
+    """Bump the dataset version for bulk ORM insert/update/delete statements"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, VERSIONED_MODELS):
+        session = orm_execute_state.session
+        version = DatasetVersion.bump(session.connection())
+        session.info.setdefault('dataset_changes', []).append((version, None))
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_dataset_change(session):
+    """Pass committed change records on to the registered listeners"""
+    for version, changes in session.info.pop('dataset_changes', []):
+        for listener in _change_listeners:
+            listener(version, changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dataset_change(session):
+    """Forget change records of a rolled-back transaction"""
+    session.info.pop('dataset_changes', None)
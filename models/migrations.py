@@ -0,0 +1,89 @@
+import logging
+from sqlalchemy.schema import CreateIndex
+from data.occult_symbols_dataset import TIME_PERIODS, VISUALIZATION_METADATA
+from models.database import Connection, SymbolCategory, TimePeriod, connection_pair_key, symbol_element_association, db
+from services.indexing import ensure_table, store_symbol_categories
+
+logger = logging.getLogger('migrations')
+
+
+def dedupe_connections():
+    """Delete all but one connection per undirected symbol pair
+
+    The strongest connection of each pair is kept (the oldest on ties), so
+    re-entered or reversed duplicates collapse onto the best-rated row.
+
+    Returns:
+        Number of connections deleted
+    """
+    low, high = connection_pair_key(Connection.__table__)
+    ranked = db.select(
+        Connection.id,
+        db.func.row_number().over(partition_by=(low, high),
+                                  order_by=(Connection.strength.desc(), Connection.id)).label('rank')
+    ).subquery()
+    duplicates = db.select(ranked.c.id).where(ranked.c.rank > 1)
+    return Connection.query.filter(Connection.id.in_(duplicates)).delete(synchronize_session=False)
+
+
+def upgrade_indexes():
+    """Bring an existing database up to the indexes declared on the models
+
+    Databases created before these indexes existed only get them from
+    create_all when a table is new. This removes duplicate connection pairs
+    (which would violate ux_connection_pair) and creates any missing index of
+    the connection and symbol_element tables. IF NOT EXISTS is used because
+    SQLite does not reflect expression indexes.
+
+    Returns:
+        Number of duplicate connections deleted
+    """
+    removed = dedupe_connections()
+    connection = db.session.connection()
+    for table in (Connection.__table__, symbol_element_association):
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            connection.execute(CreateIndex(index, if_not_exists=True))
+    db.session.commit()
+    logger.info(f"Removed {removed} duplicate connections; indexes are in place")
+    return removed
+
+
+def backfill_period_bounds():
+    """Set the year bounds of seed time periods stored before the dataset had them
+
+    Such periods were inserted as 0/0 and so contain no symbols. Only periods
+    still at 0/0 are updated, so bounds edited since are kept. The caller
+    must rebuild the period membership index when anything changed.
+
+    Returns:
+        Number of time periods updated
+    """
+    updated = 0
+    for period in TIME_PERIODS:
+        updated += TimePeriod.query.filter_by(name=period["name"], start_year=0, end_year=0).update(
+            {"start_year": period["start_year"], "end_year": period["end_year"]}, synchronize_session=False
+        )
+    db.session.commit()
+    if updated:
+        logger.info(f"Backfilled year bounds of {updated} time periods")
+    return updated
+
+
+def backfill_symbol_categories():
+    """Store the seed dataset's curated symbol categories in a database that has none
+
+    Databases created before the categories were stored would otherwise fall
+    back to keyword matching for every symbol. Nothing is done once any
+    membership exists, so curated edits are kept.
+
+    Returns:
+        Number of memberships stored
+    """
+    ensure_table(SymbolCategory)
+    if db.session.query(SymbolCategory.id).first() is not None:
+        return 0
+    stored = store_symbol_categories(VISUALIZATION_METADATA["symbol_categories"])
+    db.session.commit()
+    if stored:
+        logger.info(f"Backfilled {stored} curated symbol category memberships")
+    return stored
@@ -0,0 +1,73 @@
+import logging
+from sqlalchemy import event
+
+logger = logging.getLogger('storage')
+
+# SQLite PRAGMA settings applied to every new connection, by profile name.
+# Negative cache_size is in KiB; mmap_size is in bytes; busy_timeout in ms.
+STORAGE_PROFILES = {
+    # SQLite's own defaults: rollback journal, so a committing writer blocks readers
+    'rollback': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000
+    },
+    # WAL lets readers continue on the last committed snapshot while a write is in progress
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000
+    },
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000
+    },
+    # In-memory databases have no journal file to tune and nothing to make durable
+    'memory': {
+        'synchronous': 'OFF',
+        'temp_store': 'MEMORY'
+    }
+}
+
+
+def configure_storage(engine, profile):
+    """Apply a storage profile to every connection the engine opens
+
+    Does nothing for non-SQLite engines. journal_mode is skipped for
+    in-memory databases, which only support their own 'memory' journal.
+
+    Raises:
+        ValueError: if the profile name is unknown
+    """
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile '{profile}' (expected one of {', '.join(STORAGE_PROFILES)})")
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = dict(STORAGE_PROFILES[profile])
+    if engine.url.database in (None, '', ':memory:'):
+        pragmas.pop('journal_mode', None)
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    logger.debug(f"Using storage profile '{profile}' for {engine.url}")
+
+
+def storage_settings(connection):
+    """Current values of the profile PRAGMAs on a connection, for display"""
+    names = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout')
+    return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
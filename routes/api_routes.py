@@ -1,8 +1,14 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from data.loader import DataLoader
 from services.symbol_service import SymbolService
 from services.tradition_service import TraditionService
 from services.analysis_service import AnalysisService
+from services.graph_service import GraphAnalysisService
+from services.similarity_service import SimilarityService
+from services.query_service import QueryService
+from services.time_period_service import TimePeriodService
+from services.graph_export import EXPORT_FORMATS, export_graph
+from services.network_codec import encode_columnar
 from models.database import Symbol, Tradition, db
 
 # Create Blueprint
@@ -18,15 +24,38 @@ bp = Blueprint('api', __name__)
 symbol_service = SymbolService()
 tradition_service = TraditionService()
 analysis_service = AnalysisService()
+graph_service = GraphAnalysisService()
+similarity_service = SimilarityService()
+query_service = QueryService()
+time_period_service = TimePeriodService()
 
 
 # Symbol routes
 @bp.route('/symbols')
 def get_symbols():
-    """Return all symbols as JSON"""
+    """Return all symbols as JSON
+
+    visual=term,term filters by visual elements; op=and (default) or op=or.
+    """
+    visual = request.args.get('visual')
+    if visual is not None:
+        op = request.args.get('op', 'and').lower()
+        if op not in ('and', 'or'):
+            return jsonify({"error": "op must be 'and' or 'or'"}), 400
+        terms = [t for t in visual.split(',') if t.strip()]
+        return jsonify(symbol_service.find_by_visual_terms(terms, op))
+
     return jsonify(symbol_service.get_all_symbols())
 
 
+@bp.route('/visual-terms')
+def get_visual_terms():
+    """Return visual terms with symbol counts for autocomplete"""
+    prefix = request.args.get('prefix', '')
+    limit = request.args.get('limit', 20, type=int)
+    return jsonify(symbol_service.get_visual_term_frequencies(prefix, limit))
+
+
 @bp.route('/symbols/<int:symbol_id>')
 def get_symbol(symbol_id):
     """Return a specific symbol by ID"""
@@ -43,29 +72,115 @@ def get_symbol_connections(symbol_id):
     return jsonify(connected_symbols)
 
 
+@bp.route('/symbols/<int:symbol_id>/similar')
+def get_similar_symbols(symbol_id):
+    """Return symbols with the most similar description, usage and visual elements"""
+    if not symbol_service.get_symbol_by_id(symbol_id):
+        return jsonify({"error": "Symbol not found"}), 404
+    limit = request.args.get('limit', 10, type=int)
+    return jsonify(similarity_service.get_similar(symbol_id, limit))
+
+
 @bp.route('/connections')
 def get_connections():
     """Return symbol connections for network graph"""
     return jsonify(symbol_service.get_connections())
 
 
+# Largest subgraph served by /network?sample=N
+MAX_NETWORK_SAMPLE = 5000
+
+
 @bp.route('/network')
 def get_network_data():
-    """Return prepared network data for visualization"""
-    return jsonify(symbol_service.get_network_data())
+    """Return prepared network data for visualization
+
+    format: json (default) or columnar, a compact binary layout of typed
+    arrays decoded by networkGraph.js (see services/network_codec.py)
+    sample: return a tradition-stratified subgraph of about this many symbols
+    """
+    export_format = request.args.get('format', 'json').lower()
+    if export_format not in ('json', 'columnar'):
+        return jsonify({"error": "Query parameter 'format' must be 'json' or 'columnar'"}), 400
+    sample = request.args.get('sample', type=int)
+    if 'sample' in request.args and (sample is None or sample < 1):
+        return jsonify({"error": "Query parameter 'sample' must be a positive integer"}), 400
+    network = symbol_service.get_network_data(min(sample, MAX_NETWORK_SAMPLE) if sample else None)
+    if export_format == 'columnar':
+        return Response(encode_columnar(network), mimetype='application/octet-stream')
+    return jsonify(network)
 
 
 @bp.route('/timeline')
 def get_timeline():
-    """Return symbol timeline data for visualization"""
-    return jsonify(symbol_service.get_timeline_data())
+    """Return symbol timeline data for visualization
+
+    With any of start/end/bins (years, bin count) a binned, level-of-detail
+    timeline is returned instead of the full symbol list.
+    """
+    if not any(arg in request.args for arg in ('start', 'end', 'bins')):
+        return jsonify(symbol_service.get_timeline_data())
+
+    return jsonify(symbol_service.get_binned_timeline(
+        start=request.args.get('start', type=int),
+        end=request.args.get('end', type=int),
+        bins=request.args.get('bins', 20, type=int)
+    ))
 
 
 @bp.route('/search')
 def search_symbols():
-    """Search symbols by name, tradition, element, or description"""
+    """Search symbols by name, tradition, element, or description
+
+    Results are ranked by relevance (top 'limit', default 50) and carry a
+    score and a highlighted snippet. When nothing matches literally, fuzzy
+    matches are returned instead, marked with fuzzy=true. With facets=1 or any
+    tradition/element/century filter (repeatable), the response is an object
+    with total, results and per-facet counts.
+    """
     query = request.args.get('q', '').lower()
-    return jsonify(symbol_service.search(query))
+
+    filters = {}
+    for facet in ('tradition', 'element'):
+        if facet in request.args:
+            filters[facet] = request.args.getlist(facet)
+    if 'century' in request.args:
+        try:
+            filters['century'] = [int(c) for c in request.args.getlist('century')]
+        except ValueError:
+            return jsonify({"error": "Century filters must be integers"}), 400
+
+    limit = request.args.get('limit', 50, type=int)
+    if filters or request.args.get('facets', '').lower() in ('1', 'true', 'yes'):
+        return jsonify(symbol_service.faceted_search(query, filters, limit))
+
+    return jsonify(symbol_service.search(query, limit))
+
+
+@bp.route('/search/fuzzy')
+def fuzzy_search_symbols():
+    """Typo-tolerant search over symbol names, aliases and traditions"""
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify(symbol_service.fuzzy_search(query, limit))
+
+
+@bp.route('/suggest')
+def suggest():
+    """Return typeahead suggestions for a name prefix, most connected/popular first"""
+    prefix = request.args.get('prefix', '')
+    limit = request.args.get('limit', 10, type=int)
+    return jsonify(symbol_service.suggest(prefix, min(max(limit, 0), 50)))
+
+
+@bp.route('/query', methods=['POST'])
+def run_query():
+    """Resolve a nested JSON query over symbols, connections, traditions and elements"""
+    spec = request.get_json(silent=True)
+    try:
+        return jsonify(query_service.execute(spec))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 # Tradition routes
@@ -75,6 +190,31 @@ def get_traditions():
     return jsonify(tradition_service.get_all_traditions())
 
 
+@bp.route('/traditions/active')
+def get_active_traditions():
+    """Return traditions active in a given century"""
+    century = request.args.get('century', type=int)
+    if century is None:
+        return jsonify({"error": "Query parameter 'century' (integer) is required"}), 400
+    return jsonify(tradition_service.get_active_traditions(century))
+
+
+@bp.route('/traditions/overlapping')
+def get_overlapping_traditions():
+    """Return traditions whose lifespan overlaps the named tradition"""
+    name = request.args.get('name', '')
+    overlapping = tradition_service.get_overlapping_traditions(name)
+    if overlapping is None:
+        return jsonify({"error": "Tradition not found"}), 404
+    return jsonify(overlapping)
+
+
+@bp.route('/traditions/concurrent-matrix')
+def get_concurrent_matrix():
+    """Return pairwise lifespan overlaps between traditions"""
+    return jsonify(tradition_service.get_concurrent_matrix())
+
+
 @bp.route('/traditions/<string:name>')
 def get_tradition(name):
     """Return a specific tradition by name"""
@@ -84,6 +224,16 @@ def get_tradition(name):
     return jsonify({"error": "Tradition not found"}), 404
 
 
+@bp.route('/traditions/<string:name>/similar')
+def get_similar_traditions(name):
+    """Return traditions with approximately the most similar concepts, figures, texts and elements"""
+    limit = request.args.get('limit', 10, type=int)
+    similar = tradition_service.get_similar_traditions(name, limit)
+    if similar is None:
+        return jsonify({"error": "Tradition not found"}), 404
+    return jsonify(similar)
+
+
 @bp.route('/traditions/<string:name>/symbols')
 def get_tradition_symbols(name):
     """Return symbols associated with a specific tradition"""
@@ -91,6 +241,27 @@ def get_tradition_symbols(name):
     return jsonify(tradition_symbols)
 
 
+# Tradition figures, texts and concepts, indexed across traditions
+REFERENCE_KINDS = {'figures': 'figure', 'texts': 'text', 'concepts': 'concept'}
+
+
+@bp.route('/<any(figures, texts, concepts):kind>')
+def get_shared_references(kind):
+    """Return key figures, major texts or core concepts shared by several traditions"""
+    min_traditions = request.args.get('min_traditions', 2, type=int)
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify(tradition_service.get_shared_references(REFERENCE_KINDS[kind], min_traditions, limit))
+
+
+@bp.route('/<any(figures, texts, concepts):kind>/<path:name>/traditions')
+def get_reference_traditions(kind, name):
+    """Return traditions listing a key figure, major text or core concept"""
+    traditions = tradition_service.get_traditions_by_reference(REFERENCE_KINDS[kind], name)
+    if not traditions:
+        return jsonify({"error": f"No tradition lists {REFERENCE_KINDS[kind]} '{name}'"}), 404
+    return jsonify(traditions)
+
+
 @bp.route('/tradition-timeline')
 def get_tradition_timeline():
     """Return tradition timeline data"""
@@ -113,6 +284,16 @@ def get_element(name):
     return jsonify({"error": "Element not found"}), 404
 
 
+@bp.route('/correspondences')
+def get_correspondences():
+    """Return elements with a matching correspondence key/value and their symbols"""
+    key = request.args.get('key', '')
+    value = request.args.get('value', '')
+    if not key and not value:
+        return jsonify({"error": "Provide at least one of 'key' or 'value'"}), 400
+    return jsonify(analysis_service.get_correspondence_matches(key, value))
+
+
 @bp.route('/tradition-frequency')
 def get_tradition_frequency():
     """Return tradition frequency data"""
@@ -125,6 +306,101 @@ def get_geographic_distribution():
     return jsonify(analysis_service.get_geographic_distribution())
 
 
+@bp.route('/symbol-categories')
+def get_symbol_categories():
+    """Return symbols grouped by category (protective, cosmic, ...)"""
+    return jsonify(analysis_service.get_symbol_categories())
+
+
+@bp.route('/regional-influence')
+def get_regional_influence():
+    """Return traditions and influence intensity per region"""
+    return jsonify(analysis_service.get_regional_influence())
+
+
+@bp.route('/tradition-transitions')
+def get_tradition_transitions():
+    """Return transitions from earlier to later traditions with their mean connection strength"""
+    return jsonify(analysis_service.get_tradition_transitions())
+
+
+# Graph analytics routes
+@bp.route('/analytics/components')
+def get_components():
+    """Return connected components of the symbol connection graph"""
+    return jsonify(graph_service.get_components())
+
+
+@bp.route('/analytics/bridges')
+def get_bridges():
+    """Return bridge connections and articulation-point symbols"""
+    return jsonify(graph_service.get_bridges())
+
+
+@bp.route('/analytics/tradition-matrix')
+def get_tradition_matrix():
+    """Return tradition x tradition connection counts in row/col/value form"""
+    return jsonify(graph_service.get_tradition_matrix())
+
+
+@bp.route('/analytics/tradition-influence')
+def get_tradition_influence():
+    """Return influence scores per tradition
+
+    Optional flags: weighted=1 weights connections by strength,
+    centrality=1 weights symbols by their degree centrality.
+    """
+    weighted = request.args.get('weighted', '').lower() in ('1', 'true', 'yes')
+    centrality = request.args.get('centrality', '').lower() in ('1', 'true', 'yes')
+    return jsonify(analysis_service.get_tradition_influence(weighted, centrality))
+
+
+@bp.route('/analytics/cube')
+def get_analytics_cube():
+    """Return a slice or roll-up of the century x tradition x element cube
+
+    group_by: comma-separated dimensions (century, tradition, element)
+    filter: repeatable 'dimension:value|value' (or 'century:low..high')
+    """
+    group_by = [d.strip() for d in request.args.get('group_by', '').split(',') if d.strip()]
+    try:
+        return jsonify(analysis_service.get_cube(group_by, request.args.getlist('filter')))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# Time period routes
+@bp.route('/time-periods')
+def get_time_periods():
+    """Return all time periods with their symbol counts"""
+    return jsonify(time_period_service.get_time_periods())
+
+
+@bp.route('/time-periods/<path:name>/symbols')
+def get_time_period_symbols(name):
+    """Return the symbols whose century of origin falls in a time period"""
+    result = time_period_service.get_period_symbols(name)
+    if result is None:
+        return jsonify({"error": "Time period not found"}), 404
+    return jsonify(result)
+
+
+@bp.route('/export/graph')
+def export_connection_graph():
+    """Stream the connection graph as GraphML, GEXF or a CSV edge list
+
+    format: graphml (default), gexf or csv
+    """
+    export_format = request.args.get('format', 'graphml').lower()
+    try:
+        chunks = export_graph(export_format)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename=symbol_graph.{extension}"})
+
+
 @bp.route('/dashboard/summary')
 def get_dashboard_summary():
     """Return summarized data for dashboard overview"""
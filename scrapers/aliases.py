@@ -0,0 +1,36 @@
+# scrapers/aliases.py
+# Alternative names for symbols, shared by the scrapers and the search indexes
+import re
+
+# Well-known alternative names, keyed by a fragment of the lower-cased symbol name
+KNOWN_ALIASES = {
+    'ankh': ['key of life', 'crux ansata'],
+    'eye of horus': ['eye of ra', 'wadjet'],
+    'pentagram': ['pentacle', 'five pointed star'],
+}
+
+
+def name_variations(name):
+    """Return alternative spellings of a lower-cased symbol name (excluding the name itself)"""
+    variations = []
+
+    # Remove special characters
+    clean_name = re.sub(r'[^\w\s]', '', name)
+    if clean_name != name:
+        variations.append(clean_name)
+
+    # Remove "the" prefix
+    if name.startswith('the '):
+        variations.append(name[4:])
+
+    # Handle hyphenation variations
+    if '-' in name:
+        variations.append(name.replace('-', ' '))
+        variations.append(name.replace('-', ''))
+
+    # Add common spelling variations
+    for fragment, aliases in KNOWN_ALIASES.items():
+        if fragment in name:
+            variations.extend(aliases)
+
+    return [alias for alias in variations if alias]
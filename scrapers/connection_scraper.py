@@ -1,5 +1,6 @@
 # scrapers/connection_scraper.py
 from .base_scraper import BaseScraper
+from .aliases import name_variations
 import re
 import itertools
 import hashlib
@@ -47,34 +48,7 @@ class ConnectionScraper(BaseScraper):
                 aliases[name] = symbol_id
 
             # Add variations
-            variations = []
-
-            # Remove special characters
-            clean_name = re.sub(r'[^\w\s]', '', name)
-            if clean_name != name:
-                variations.append(clean_name)
-
-            # Remove "the" prefix
-            if name.startswith('the '):
-                variations.append(name[4:])
-
-            # Handle hyphenation variations
-            if '-' in name:
-                variations.append(name.replace('-', ' '))
-                variations.append(name.replace('-', ''))
-
-            # Add common spelling variations
-            if 'ankh' in name:
-                variations.append('key of life')
-                variations.append('crux ansata')
-
-            if 'eye of horus' in name:
-                variations.append('eye of ra')
-                variations.append('wadjet')
-
-            if 'pentagram' in name:
-                variations.append('pentacle')
-                variations.append('five pointed star')
+            variations = name_variations(name)
 
             # Add aliases to the dictionary
             for alias in variations:
@@ -1,3 +1,4 @@
 from .symbol_service import SymbolService
 from .tradition_service import TraditionService
-from .analysis_service import AnalysisService
\ No newline at end of file
+from .analysis_service import AnalysisService
+from .graph_service import GraphAnalysisService
\ No newline at end of file
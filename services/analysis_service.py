@@ -1,5 +1,24 @@
 import json
-from models.database import Element, Symbol, Tradition, db
+import re
+import numpy as np
+from models.database import Element, ElementCorrespondence, Symbol, SymbolCategory, Tradition, \
+    symbol_element_association, db
+from services.cache import dataset_cache
+from services.cube import SymbolCube
+from services.indexing import ensure_table
+from services.graph_service import GraphAnalysisService, get_connection_graph, split_traditions, \
+    tradition_incidence
+
+# Symbol categories and the word stems in a symbol's name, description or usage that place a symbol
+# with no curated category (SymbolCategory) in them
+SYMBOL_CATEGORIES = {
+    "Protective": ("protect", "amulet", "banish", "ward", "evil eye"),
+    "Transformative": ("transform", "alchem", "evolution", "cycl", "renewal", "rebirth", "philosopher"),
+    "Life-giving": ("life", "fertil", "growth", "creation", "heal"),
+    "Wisdom-bearing": ("wisdom", "knowledge", "numerolog", "mystical", "teaching", "studies", "understanding"),
+    "Unifying": ("union", "unity", "harmony", "opposit", "dualit", "unif"),
+    "Cosmic": ("cosm", "planet", "lunar", "univers", "celestial", "astro")
+}
 
 
 class AnalysisService:
@@ -8,6 +27,7 @@ class AnalysisService:
     def get_element_distribution(self):
         """Get element distribution data"""
         elements = Element.query.all()
+        correspondences = self._get_correspondences()
 
         element_details = []
         for element in elements:
@@ -17,7 +37,7 @@ class AnalysisService:
                 "description": element.description,
                 "symbols": [s.id for s in element.symbols],
                 "traditions": list(set([s.tradition for s in element.symbols])),
-                "correspondences": json.loads(element.correspondences) if element.correspondences else {}
+                "correspondences": correspondences.get(element.id, {})
             })
 
         return element_details
@@ -88,6 +108,250 @@ class AnalysisService:
                 "description": element.description,
                 "symbols": [s.id for s in element.symbols],
                 "traditions": list(set([s.tradition for s in element.symbols])),
-                "correspondences": json.loads(element.correspondences) if element.correspondences else {}
+                "correspondences": self._get_correspondences().get(element.id, {})
             }
-        return None
\ No newline at end of file
+        return None
+
+    def get_tradition_influence(self, weight_by_strength=False, use_centrality=False):
+        """Get an influence score per tradition from the live database
+
+        The base score is ``2 * symbols + connections``, where a connection counts
+        once for every tradition of either endpoint. Connections can be weighted by
+        their strength, and each symbol can be weighted by ``1 + degree centrality``.
+        """
+        return dataset_cache.get(
+            ('tradition_influence', weight_by_strength, use_centrality),
+            lambda: self._compute_tradition_influence(weight_by_strength, use_centrality)
+        )
+
+    def _compute_tradition_influence(self, weight_by_strength, use_centrality):
+        graph = get_connection_graph()
+        incidence, traditions = tradition_incidence(graph)
+        num_traditions = len(traditions)
+
+        # Symbol term: one (symbol, tradition) pair per incidence entry
+        pairs = incidence.tocoo()
+        symbol_counts = np.bincount(pairs.col, minlength=num_traditions)
+        symbol_weights = np.ones(graph.num_nodes)
+        if use_centrality and graph.num_nodes > 1:
+            degree = np.bincount(graph.sources, minlength=graph.num_nodes) + \
+                np.bincount(graph.targets, minlength=graph.num_nodes)
+            symbol_weights = 1.0 + degree / (graph.num_nodes - 1)
+        symbol_term = np.bincount(pairs.col, weights=symbol_weights[pairs.row], minlength=num_traditions)
+
+        # Connection term: union of endpoint traditions per connection
+        involved = (incidence[graph.sources] + incidence[graph.targets]).tocoo()
+        connection_counts = np.bincount(involved.col, minlength=num_traditions)
+        connection_weights = graph.strengths if weight_by_strength else np.ones(graph.num_edges)
+        connection_term = np.bincount(involved.col, weights=connection_weights[involved.row],
+                                      minlength=num_traditions)
+
+        scores = 2 * symbol_term + connection_term
+
+        result = [
+            {
+                "tradition": tradition,
+                "symbols": int(symbol_counts[i]),
+                "connections": int(connection_counts[i]),
+                "score": round(float(scores[i]), 4)
+            }
+            for i, tradition in enumerate(traditions)
+        ]
+
+        # Sort by score
+        result.sort(key=lambda x: x["score"], reverse=True)
+
+        return result
+
+    def get_symbol_categories(self):
+        """Get symbols grouped by their curated categories (SymbolCategory)
+
+        Symbols without any curated membership are placed by the SYMBOL_CATEGORIES
+        keywords in their text instead. The result is computed on the first request
+        after a dataset change and cached until the next one.
+        """
+        return dataset_cache.get(('symbol_categories',), self._compute_symbol_categories)
+
+    def _compute_symbol_categories(self):
+        ensure_table(SymbolCategory)
+        patterns = {name: re.compile(r'\b(?:' + '|'.join(map(re.escape, stems)) + ')')
+                    for name, stems in SYMBOL_CATEGORIES.items()}
+
+        curated = {}
+        for name, symbol_id in db.session.execute(
+                db.select(SymbolCategory.name, SymbolCategory.symbol_id)).all():
+            curated.setdefault(symbol_id, set()).add(name)
+
+        elements = {}
+        for symbol_id, element in db.session.execute(
+                db.select(symbol_element_association.c.symbol_id, Element.name)
+                .join(Element, Element.id == symbol_element_association.c.element_id)
+                .order_by(Element.name)).all():
+            elements.setdefault(symbol_id, []).append(element)
+
+        # Known categories first, in their usual order, then any other curated ones
+        members = {name: [] for name in SYMBOL_CATEGORIES}
+        for name in sorted(set().union(*curated.values()) - set(members)):
+            members[name] = []
+
+        for symbol_id, name, tradition, description, usage in db.session.execute(
+                db.select(Symbol.id, Symbol.name, Symbol.tradition, Symbol.description, Symbol.usage)
+                .order_by(Symbol.id)).all():
+            categories = curated.get(symbol_id)
+            if categories is None:
+                text = ' '.join([name or '', description or '', usage or '']).lower()
+                categories = {category for category, pattern in patterns.items() if pattern.search(text)}
+            for category in categories:
+                members[category].append({
+                    "id": symbol_id,
+                    "name": name,
+                    "tradition": tradition,
+                    "element": ','.join(elements.get(symbol_id, []))
+                })
+
+        return [{"name": name, "symbols": symbols, "count": len(symbols)} for name, symbols in members.items()]
+
+    def get_regional_influence(self):
+        """Get the traditions of each region and an intensity (1-10) from their influence scores
+
+        Computed on the first request after a dataset change and cached until the next one.
+        """
+        return dataset_cache.get(('regional_influence',), self._compute_regional_influence)
+
+    def _compute_regional_influence(self):
+        influence = {row["tradition"]: row for row in self.get_tradition_influence()}
+
+        regions = {}
+        for name, region in db.session.execute(db.select(Tradition.name, Tradition.region)).all():
+            for part in (region or '').split('/'):
+                part = part.strip()
+                if part:
+                    regions.setdefault(part, []).append(name)
+
+        result = []
+        for region, traditions in regions.items():
+            scores = [influence[t] for t in traditions if t in influence]
+            result.append({
+                "region": region,
+                "traditions": sorted(traditions),
+                "symbols": sum(row["symbols"] for row in scores),
+                "connections": sum(row["connections"] for row in scores),
+                "score": round(sum(row["score"] for row in scores), 4)
+            })
+
+        top = max((row["score"] for row in result), default=0)
+        for row in result:
+            row["intensity"] = int(round(1 + 9 * row["score"] / top)) if top else 1
+
+        result.sort(key=lambda x: (-x["score"], x["region"]))
+        return result
+
+    def get_tradition_transitions(self):
+        """Get earlier -> later tradition transitions from connections between their symbols
+
+        Computed on the first request after a dataset change and cached until the next one.
+        """
+        return dataset_cache.get(('tradition_transitions',), self._compute_tradition_transitions)
+
+    def _compute_tradition_transitions(self):
+        matrix = GraphAnalysisService().get_tradition_matrix()
+        traditions = matrix["traditions"]
+
+        # A tradition starts at its recorded start century, or else at its earliest symbol
+        starts = {}
+        for tradition, century in db.session.execute(
+                db.select(Symbol.tradition, db.func.min(Symbol.century_origin)).group_by(Symbol.tradition)).all():
+            for name in split_traditions(tradition):
+                starts[name] = min(century, starts.get(name, century))
+        starts.update(dict(db.session.execute(db.select(Tradition.name, Tradition.start_century)).all()))
+
+        result = []
+        for row, col, count, strength in zip(matrix["rows"], matrix["cols"], matrix["counts"],
+                                             matrix["strength_sums"]):
+            if row >= col:
+                continue
+            source, target = traditions[row], traditions[col]
+            if (starts.get(target, 0), target) < (starts.get(source, 0), source):
+                source, target = target, source
+            result.append({
+                "source": source,
+                "target": target,
+                "strength": round(strength / count, 4),
+                "connections": count
+            })
+
+        result.sort(key=lambda x: (-x["strength"], -x["connections"], x["source"], x["target"]))
+        return result
+
+    def get_cube(self, group_by=None, filters=None):
+        """Get a slice / roll-up of the century x tradition x element cube
+
+        Args:
+            group_by: list of dimensions to keep (century, tradition, element)
+            filters: list of 'dimension:value|value' strings; centuries also
+                     accept an inclusive range such as 'century:-5..5'
+
+        Raises:
+            ValueError: for unknown dimensions or malformed filters
+        """
+        cube = dataset_cache.get(('symbol_cube',), SymbolCube.build)
+
+        parsed = {}
+        for spec in filters or []:
+            dim, sep, values = spec.partition(':')
+            dim = dim.strip()
+            if not sep or not values:
+                raise ValueError(f"Malformed filter '{spec}', expected 'dimension:value|value'")
+            if dim == 'century':
+                try:
+                    if '..' in values:
+                        low, high = values.split('..', 1)
+                        parsed[dim] = (int(low), int(high))
+                    else:
+                        parsed[dim] = [int(v) for v in values.split('|')]
+                except ValueError:
+                    raise ValueError(f"Invalid century filter '{values}'")
+            else:
+                parsed[dim] = [v.strip() for v in values.split('|')]
+
+        return {
+            "group_by": group_by or [],
+            "cells": cube.query(group_by, parsed)
+        }
+
+    def get_correspondence_matches(self, key=None, value=None):
+        """Get elements with a matching correspondence and the symbols of those elements
+
+        Key and value are matched case-insensitively; either may be omitted.
+        """
+        ensure_table(ElementCorrespondence)
+        query = db.select(Element.name, ElementCorrespondence.key, ElementCorrespondence.value,
+                          Symbol.id, Symbol.name, Symbol.tradition) \
+            .join(Element, Element.id == ElementCorrespondence.element_id) \
+            .outerjoin(symbol_element_association, symbol_element_association.c.element_id == Element.id) \
+            .outerjoin(Symbol, Symbol.id == symbol_element_association.c.symbol_id)
+        if key:
+            query = query.where(ElementCorrespondence.key_norm == key.strip().lower())
+        if value:
+            query = query.where(ElementCorrespondence.value_norm == value.strip().lower())
+
+        matches = {}
+        for element, match_key, match_value, symbol_id, symbol_name, tradition in \
+                db.session.execute(query.order_by(Element.name, Symbol.id)).all():
+            match = matches.setdefault((element, match_key, match_value), {
+                "element": element,
+                "key": match_key,
+                "value": match_value,
+                "symbols": []
+            })
+            if symbol_id is not None:
+                match["symbols"].append({"id": symbol_id, "name": symbol_name, "tradition": tradition})
+
+        return list(matches.values())
+
+    def _get_correspondences(self):
+        """Parsed correspondence dicts by element id, cached per dataset version"""
+        def load():
+            rows = db.session.execute(db.select(Element.id, Element.correspondences)).all()
+            return {element_id: json.loads(value) if value else {} for element_id, value in rows}
+        return dataset_cache.get(('element_correspondences',), load)
@@ -0,0 +1,40 @@
+import threading
+from models.database import DatasetVersion
+
+
+class VersionedCache:
+    """In-memory cache whose entries are dropped whenever the dataset version changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+
+    def get(self, key, compute):
+        """Return the cached value for key, computing it if missing or stale"""
+        version = DatasetVersion.current()
+
+        with self._lock:
+            if version != self._version:
+                self._entries = {}
+                self._version = version
+            if key in self._entries:
+                return self._entries[key]
+
+        value = compute()
+
+        with self._lock:
+            # Only keep the result if no newer version arrived while computing
+            if self._version == version:
+                self._entries[key] = value
+        return value
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries = {}
+            self._version = None
+
+
+# Shared cache used by the analysis services
+dataset_cache = VersionedCache()
@@ -0,0 +1,108 @@
+import numpy as np
+from models.database import Symbol, Element, symbol_element_association, db
+from services.graph_service import split_traditions
+
+# Label used for symbols without any element association
+NO_ELEMENT = 'None'
+
+
+class SymbolCube:
+    """Dense century x tradition x element count cube
+
+    A symbol with several traditions or elements contributes one count to every
+    (tradition, element) combination it belongs to, so roll-ups count
+    memberships rather than distinct symbols.
+    """
+
+    DIMENSIONS = ('century', 'tradition', 'element')
+
+    def __init__(self, labels, counts):
+        self.labels = labels
+        self.counts = counts
+        self.codes = {dim: {label: i for i, label in enumerate(values)} for dim, values in labels.items()}
+
+    @classmethod
+    def build(cls):
+        """Build the cube from the database in one pass"""
+        symbol_rows = db.session.execute(
+            db.select(Symbol.id, Symbol.century_origin, Symbol.tradition)
+        ).all()
+        element_rows = db.session.execute(
+            db.select(symbol_element_association.c.symbol_id, Element.name)
+            .join(Element, Element.id == symbol_element_association.c.element_id)
+        ).all()
+
+        elements_by_symbol = {}
+        for symbol_id, element in element_rows:
+            elements_by_symbol.setdefault(symbol_id, []).append(element)
+
+        centuries = sorted({row[1] for row in symbol_rows})
+        traditions = sorted({t for row in symbol_rows for t in split_traditions(row[2])})
+        elements = sorted({row[1] for row in element_rows} | {NO_ELEMENT})
+        century_codes = {c: i for i, c in enumerate(centuries)}
+        tradition_codes = {t: i for i, t in enumerate(traditions)}
+        element_codes = {e: i for i, e in enumerate(elements)}
+
+        c_index, t_index, e_index = [], [], []
+        for symbol_id, century, tradition in symbol_rows:
+            symbol_elements = elements_by_symbol.get(symbol_id) or [NO_ELEMENT]
+            for t in split_traditions(tradition):
+                for e in symbol_elements:
+                    c_index.append(century_codes[century])
+                    t_index.append(tradition_codes[t])
+                    e_index.append(element_codes[e])
+
+        counts = np.zeros((len(centuries), len(traditions), len(elements)), dtype=np.int64)
+        np.add.at(counts, (c_index, t_index, e_index), 1)
+
+        return cls({'century': centuries, 'tradition': traditions, 'element': elements}, counts)
+
+    def query(self, group_by=None, filters=None):
+        """Slice by filters, then sum out every dimension not in group_by
+
+        Args:
+            group_by: list of dimension names to keep
+            filters: dict mapping dimension name to a list of accepted labels
+                     (centuries may also be given as a (low, high) range tuple)
+
+        Returns:
+            List of dicts, one per non-empty cell, each with a 'count'
+        """
+        group_by = list(group_by or [])
+        filters = filters or {}
+        for dim in group_by + list(filters):
+            if dim not in self.DIMENSIONS:
+                raise ValueError(f"Unknown dimension '{dim}'")
+
+        cube = self.counts
+        labels = dict(self.labels)
+        for axis, dim in enumerate(self.DIMENSIONS):
+            if dim not in filters:
+                continue
+            positions = self._positions(dim, filters[dim])
+            cube = np.take(cube, positions, axis=axis)
+            labels[dim] = [self.labels[dim][i] for i in positions]
+
+        drop_axes = tuple(axis for axis, dim in enumerate(self.DIMENSIONS) if dim not in group_by)
+        reduced = cube.sum(axis=drop_axes)
+        kept = [dim for dim in self.DIMENSIONS if dim in group_by]
+
+        if not kept:
+            return [{"count": int(reduced)}]
+
+        # Reorder axes to match the requested group_by order
+        reduced = np.transpose(reduced, [kept.index(dim) for dim in group_by])
+        result = []
+        for cell in zip(*np.nonzero(reduced)):
+            row = {dim: labels[dim][i] for dim, i in zip(group_by, cell)}
+            row["count"] = int(reduced[cell])
+            result.append(row)
+        return result
+
+    def _positions(self, dim, values):
+        """Positions along a dimension matching the filter values"""
+        if dim == 'century' and isinstance(values, tuple):
+            low, high = values
+            return [i for i, c in enumerate(self.labels['century']) if low <= c <= high]
+        codes = self.codes[dim]
+        return sorted(codes[v] for v in values if v in codes)
@@ -0,0 +1,174 @@
+import threading
+from models.database import DatasetVersion, Symbol, on_dataset_change, db
+from services.graph_service import split_traditions
+from services.indexing import changed_ids
+
+# Facets indexed for every symbol
+FACETS = ('tradition', 'element', 'century')
+
+
+class FacetIndex:
+    """Bitmap index of symbols per tradition, element and century
+
+    Every symbol owns one bit position; each facet value keeps a Python big-int
+    bitmap of the symbols carrying it. Filters are evaluated with bitwise OR
+    within a facet and AND across facets, and facet counts are popcounts of
+    the result intersected with each value's bitmap.
+
+    The index follows the dataset version: changes committed in this process
+    are applied incrementally from change events, anything else (another
+    process, bulk writes, element renames) triggers a full rebuild.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self.version = None
+        self._reset()
+        on_dataset_change(self._on_change)
+
+    def _reset(self):
+        self.positions = {}     # symbol id -> bit position
+        self.symbol_ids = []    # bit position -> symbol id (None once freed)
+        self.free = []          # recycled bit positions
+        self.all_bits = 0
+        self.bitmaps = {facet: {} for facet in FACETS}
+        self.values = {}        # symbol id -> {facet: set of values}
+
+    def sync(self):
+        """Bring the index up to the current dataset version"""
+        current = DatasetVersion.current()
+        with self._lock:
+            if self.version == current:
+                return
+            pending, self._pending = self._pending, []
+
+            changed = changed_ids(pending, self.version, current, 'Symbol',
+                                  ('Symbol', 'Connection', 'Tradition', 'TimePeriod'))
+            if changed is not None:
+                self._update_symbols(changed)
+            else:
+                self._rebuild()
+            self.version = current
+
+    def search(self, candidate_ids=None, filters=None):
+        """Evaluate facet filters over an optional candidate set
+
+        Args:
+            candidate_ids: ids matching a text query, or None for all symbols
+            filters: dict mapping facet name to a list of accepted values
+
+        Returns:
+            (sorted matching symbol ids, facet counts for the matching set)
+        """
+        self.sync()
+        with self._lock:
+            if candidate_ids is None:
+                result = self.all_bits
+            else:
+                result = 0
+                for symbol_id in candidate_ids:
+                    position = self.positions.get(symbol_id)
+                    if position is not None:
+                        result |= 1 << position
+
+            for facet, values in (filters or {}).items():
+                if facet not in self.bitmaps:
+                    raise ValueError(f"Unknown facet '{facet}'")
+                selected = 0
+                for value in values:
+                    selected |= self.bitmaps[facet].get(value, 0)
+                result &= selected
+
+            counts = {}
+            for facet, bitmaps in self.bitmaps.items():
+                facet_counts = {}
+                for value, bitmap in bitmaps.items():
+                    count = (result & bitmap).bit_count()
+                    if count:
+                        facet_counts[value] = count
+                counts[facet] = dict(sorted(facet_counts.items(), key=lambda x: (-x[1], str(x[0]))))
+
+            return self._ids_of(result), counts
+
+    def ids_with(self, facet, value):
+        """Sorted ids of the symbols having one facet value"""
+        self.sync()
+        with self._lock:
+            return self._ids_of(self.bitmaps[facet].get(value, 0))
+
+    def _ids_of(self, bitmap):
+        """Symbol ids for the set bits of a bitmap"""
+        ids = []
+        while bitmap:
+            low = bitmap & -bitmap
+            ids.append(self.symbol_ids[low.bit_length() - 1])
+            bitmap ^= low
+        return sorted(ids)
+
+    def _on_change(self, version, changes):
+        with self._lock:
+            self._pending.append((version, changes))
+
+    def _rebuild(self):
+        self._reset()
+        for symbol_id, facet_values in self._load_values().items():
+            self._add(symbol_id, facet_values)
+
+    def _update_symbols(self, symbol_ids):
+        if not symbol_ids:
+            return
+        fresh = self._load_values(symbol_ids)
+        for symbol_id in symbol_ids:
+            self._remove(symbol_id)
+            if symbol_id in fresh:
+                self._add(symbol_id, fresh[symbol_id])
+
+    def _add(self, symbol_id, facet_values):
+        position = self.free.pop() if self.free else len(self.symbol_ids)
+        if position == len(self.symbol_ids):
+            self.symbol_ids.append(symbol_id)
+        else:
+            self.symbol_ids[position] = symbol_id
+        self.positions[symbol_id] = position
+        bit = 1 << position
+        self.all_bits |= bit
+        for facet, values in facet_values.items():
+            for value in values:
+                self.bitmaps[facet][value] = self.bitmaps[facet].get(value, 0) | bit
+        self.values[symbol_id] = facet_values
+
+    def _remove(self, symbol_id):
+        position = self.positions.pop(symbol_id, None)
+        if position is None:
+            return
+        mask = ~(1 << position)
+        self.all_bits &= mask
+        for facet, values in self.values.pop(symbol_id).items():
+            for value in values:
+                remaining = self.bitmaps[facet][value] & mask
+                if remaining:
+                    self.bitmaps[facet][value] = remaining
+                else:
+                    del self.bitmaps[facet][value]
+        self.symbol_ids[position] = None
+        self.free.append(position)
+
+    @staticmethod
+    def _load_values(symbol_ids=None):
+        """Facet values per symbol id, optionally restricted to some ids"""
+        query = Symbol.query.options(db.selectinload(Symbol.elements))
+        if symbol_ids is not None:
+            query = query.filter(Symbol.id.in_(list(symbol_ids)))
+        return {
+            symbol.id: {
+                'tradition': set(split_traditions(symbol.tradition)),
+                'element': {e.name for e in symbol.elements},
+                'century': {symbol.century_origin}
+            }
+            for symbol in query.all()
+        }
+
+
+# Process-wide index shared by the search endpoints
+facet_index = FacetIndex()
@@ -0,0 +1,149 @@
+import logging
+import re
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from models.database import Element, Symbol, symbol_element_association, db
+
+logger = logging.getLogger('fulltext')
+
+FTS_TABLE = 'symbol_fts'
+
+# bm25() column weights: name, tradition, description
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+# Tokens of the snippet window around the best-matching column
+SNIPPET_TOKENS = 16
+
+# External-content FTS5 table over symbol, kept in sync by triggers so every
+# writer (db_setup, db_sync, db_manager, bulk SQL) updates it without extra code
+_TRIGGERS = {
+    'symbol_fts_ai': """
+        CREATE TRIGGER symbol_fts_ai AFTER INSERT ON symbol BEGIN
+            INSERT INTO symbol_fts(rowid, name, tradition, description)
+            VALUES (new.id, new.name, new.tradition, new.description);
+        END""",
+    'symbol_fts_ad': """
+        CREATE TRIGGER symbol_fts_ad AFTER DELETE ON symbol BEGIN
+            INSERT INTO symbol_fts(symbol_fts, rowid, name, tradition, description)
+            VALUES ('delete', old.id, old.name, old.tradition, old.description);
+        END""",
+    'symbol_fts_au': """
+        CREATE TRIGGER symbol_fts_au AFTER UPDATE OF id, name, tradition, description ON symbol BEGIN
+            INSERT INTO symbol_fts(symbol_fts, rowid, name, tradition, description)
+            VALUES ('delete', old.id, old.name, old.tradition, old.description);
+            INSERT INTO symbol_fts(rowid, name, tradition, description)
+            VALUES (new.id, new.name, new.tradition, new.description);
+        END"""
+}
+
+_available = {}
+
+
+def fulltext_available():
+    """Create the FTS5 index and triggers if needed; False when FTS5 cannot be used"""
+    key = str(db.engine.url)
+    if key in _available:
+        return _available[key]
+
+    if db.engine.dialect.name != 'sqlite':
+        _available[key] = False
+        return False
+
+    try:
+        with db.engine.begin() as connection:
+            existing = set(connection.execute(text("SELECT name FROM sqlite_master")).scalars())
+            existing &= {FTS_TABLE, *_TRIGGERS}
+            if existing != {FTS_TABLE, *_TRIGGERS}:
+                _create_index(connection, existing)
+        _available[key] = True
+    except OperationalError as e:
+        logger.warning(f"Full-text search unavailable, falling back to LIKE: {e}")
+        _available[key] = False
+    return _available[key]
+
+
+def rebuild_fulltext_index():
+    """Drop and recreate the FTS5 index from the symbol table
+
+    Returns:
+        True if the index was rebuilt, False if FTS5 is unavailable
+    """
+    _available.pop(str(db.engine.url), None)
+    if db.engine.dialect.name == 'sqlite':
+        with db.engine.begin() as connection:
+            for trigger in _TRIGGERS:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    return fulltext_available()
+
+
+def _create_index(connection, existing):
+    """Create the FTS5 table and triggers and load the current symbols into it"""
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "name, tradition, description, content='symbol', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ))
+    for name, statement in _TRIGGERS.items():
+        if name not in existing:
+            connection.execute(text(statement))
+    # Missing triggers mean the index may have missed writes, so reload it
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    logger.info("Built full-text index over symbols")
+
+
+def match_expression(query):
+    """FTS5 MATCH expression requiring every query word as a token prefix"""
+    words = re.findall(r'\w+', (query or '').lower())
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_symbols(query, limit=None):
+    """BM25-ranked full-text matches, best first
+
+    Returns:
+        List of (symbol id, score, snippet) tuples; higher scores are better
+    """
+    expression = match_expression(query)
+    if not expression:
+        return []
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    statement = (
+        f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score, "
+        f"snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}) "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :expression ORDER BY score"
+    )
+    params = {"expression": expression}
+    if limit is not None:
+        statement += " LIMIT :limit"
+        params["limit"] = limit
+    rows = db.session.execute(text(statement), params).all()
+    # bm25() is negative with better matches lower; flip it for readability
+    return [(symbol_id, -score, snippet) for symbol_id, score, snippet in rows]
+
+
+def like_search_symbols(query, limit=None):
+    """Unranked substring matches over name, tradition and description (fallback path)"""
+    pattern = f"%{(query or '').lower()}%"
+    statement = db.select(Symbol.id).where(db.or_(
+        db.func.lower(Symbol.name).like(pattern),
+        db.func.lower(Symbol.tradition).like(pattern),
+        db.func.lower(Symbol.description).like(pattern)
+    )).order_by(Symbol.id)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return [(symbol_id, None, None) for symbol_id in db.session.execute(statement).scalars()]
+
+
+def element_symbol_ids(query):
+    """Ids of symbols associated with an element whose name contains query"""
+    pattern = f"%{(query or '').lower()}%"
+    # Matching element ids first lets SQLite look symbols up by element_id
+    # instead of scanning the whole association table in symbol_id order
+    element_ids = db.select(Element.id).where(db.func.lower(Element.name).like(pattern))
+    return db.session.execute(
+        db.select(symbol_element_association.c.symbol_id)
+        .where(symbol_element_association.c.element_id.in_(element_ids))
+        .order_by(symbol_element_association.c.symbol_id)
+        .distinct()
+    ).scalars().all()
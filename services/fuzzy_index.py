@@ -0,0 +1,129 @@
+import re
+import numpy as np
+from models.database import Symbol, Tradition, db
+from scrapers.aliases import name_variations
+from services.graph_service import split_traditions
+from services.prefix_index import normalize_key
+
+# Minimum trigram similarity (Jaccard over trigram sets) for a fuzzy match
+SIMILARITY_THRESHOLD = 0.3
+
+# Words shorter than this are only matched as part of the full name
+MIN_WORD_LENGTH = 4
+
+
+def fold_spelling(text):
+    """Normalize text and fold common transliteration variants
+
+    Maps ph->f and q, c->k, collapses doubled letters and drops a word-final
+    'h' after a vowel, so 'Qabala', 'Kabbalah' and 'Cabbala' fold to the same
+    term and 'pentagramm' to 'pentagram'.
+    """
+    text = normalize_key(text)
+    text = text.replace('ph', 'f').replace('q', 'k').replace('c', 'k')
+    text = re.sub(r'(\w)\1+', r'\1', text)
+    return re.sub(r'([aeiou])h\b', r'\1', text)
+
+
+def trigrams(text):
+    """Distinct trigrams of a folded term, padded so short words still have some"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """Trigram posting lists over symbol names, aliases and tradition names
+
+    Each distinct folded term gets an id; every trigram keeps a sorted array of
+    the term ids containing it. A query gathers the posting lists of its own
+    trigrams, counts overlaps per term with NumPy and scores candidates by
+    Jaccard similarity of the trigram sets. Only terms sharing at least one
+    trigram with the query are ever touched.
+    """
+
+    def __init__(self, entries):
+        """Build from (text, target) pairs; a target is ('symbol', id) or ('tradition', name)"""
+        term_ids = {}
+        self.terms = []
+        self.targets = []
+        for text, target in entries:
+            folded = fold_spelling(text)
+            keys = [folded] + [w for w in folded.split(' ') if len(w) >= MIN_WORD_LENGTH and w != folded]
+            for key in keys:
+                if not key:
+                    continue
+                term_id = term_ids.get(key)
+                if term_id is None:
+                    term_id = term_ids[key] = len(self.terms)
+                    self.terms.append(key)
+                    self.targets.append({})
+                # Remember the original text that produced this term for each target
+                self.targets[term_id].setdefault(target, text)
+
+        gram_ids = {}
+        pairs_gram, pairs_term = [], []
+        sizes = np.zeros(len(self.terms), dtype=np.int32)
+        for term_id, term in enumerate(self.terms):
+            grams = trigrams(term)
+            sizes[term_id] = len(grams)
+            for gram in grams:
+                pairs_gram.append(gram_ids.setdefault(gram, len(gram_ids)))
+                pairs_term.append(term_id)
+
+        # CSR layout: postings of gram g are term_ids[indptr[g]:indptr[g + 1]]
+        pairs_gram = np.array(pairs_gram, dtype=np.int64)
+        pairs_term = np.array(pairs_term, dtype=np.int32)
+        order = np.argsort(pairs_gram, kind='stable')
+        self.gram_ids = gram_ids
+        self.term_ids = pairs_term[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(pairs_gram, minlength=len(gram_ids)))])
+        self.sizes = sizes
+
+    @classmethod
+    def build(cls):
+        """Build the index from the symbol and tradition tables"""
+        entries = []
+        for symbol_id, name, tradition in db.session.execute(
+                db.select(Symbol.id, Symbol.name, Symbol.tradition)).all():
+            entries.append((name, ('symbol', symbol_id)))
+            for alias in name_variations(name.lower()):
+                entries.append((alias, ('symbol', symbol_id)))
+            for part in split_traditions(tradition):
+                entries.append((part, ('tradition', part)))
+        for name in db.session.execute(db.select(Tradition.name)).scalars():
+            entries.append((name, ('tradition', name)))
+        return cls(entries)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def match(self, query, limit=10, threshold=SIMILARITY_THRESHOLD):
+        """Return the best targets for query as (target, similarity, matched text), best first"""
+        folded = fold_spelling(query)
+        if not folded:
+            return []
+
+        best = {}
+        keys = [folded] + [w for w in folded.split(' ') if len(w) >= MIN_WORD_LENGTH and w != folded]
+        for key in keys:
+            for term_id, similarity in self._similar_terms(key, threshold):
+                for target, text in self.targets[term_id].items():
+                    if similarity > best.get(target, (0, None))[0]:
+                        best[target] = (similarity, text)
+
+        ranked = sorted(best.items(), key=lambda x: (-x[1][0], str(x[0])))[:limit]
+        return [(target, similarity, text) for target, (similarity, text) in ranked]
+
+    def _similar_terms(self, key, threshold):
+        """(term id, similarity) of indexed terms at or above threshold, best first"""
+        grams = [self.gram_ids[g] for g in trigrams(key) if g in self.gram_ids]
+        if not grams:
+            return []
+        postings = np.concatenate([self.term_ids[self.indptr[g]:self.indptr[g + 1]] for g in grams])
+        candidates, overlap = np.unique(postings, return_counts=True)
+        query_size = len(trigrams(key))
+        similarity = overlap / (query_size + self.sizes[candidates] - overlap)
+        keep = similarity >= threshold
+        candidates, similarity = candidates[keep], similarity[keep]
+        order = np.argsort(-similarity, kind='stable')
+        return list(zip(candidates[order].tolist(), similarity[order].tolist()))
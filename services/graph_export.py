@@ -0,0 +1,126 @@
+import csv
+import io
+import re
+from xml.sax.saxutils import escape, quoteattr
+from models.database import Connection, Symbol, db
+
+# Rows fetched per round trip from the server-side cursor
+BATCH_SIZE = 1000
+
+# Content type and file extension of every export format
+EXPORT_FORMATS = {
+    'graphml': ('application/graphml+xml', 'graphml'),
+    'gexf': ('application/gexf+xml', 'gexf'),
+    'csv': ('text/csv', 'csv')
+}
+
+
+# Characters XML 1.0 does not allow anywhere in a document, even escaped
+XML_INVALID_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+def export_graph(export_format):
+    """Stream the connection graph as chunks of GraphML, GEXF or CSV edge-list text
+
+    Nodes and edges are read through server-side cursors in batches and
+    written as they arrive, so memory use does not grow with the graph.
+
+    Raises:
+        ValueError: if the format is not one of EXPORT_FORMATS
+    """
+    writers = {'graphml': _graphml, 'gexf': _gexf, 'csv': _csv}
+    if export_format not in writers:
+        raise ValueError(f"Unknown export format '{export_format}'; use one of: {', '.join(EXPORT_FORMATS)}")
+    return writers[export_format]()
+
+
+def _stream(query):
+    """Yield lists of rows from a server-side cursor, BATCH_SIZE at a time"""
+    result = db.session.execute(query.execution_options(stream_results=True, yield_per=BATCH_SIZE))
+    for partition in result.partitions():
+        yield partition
+
+
+def _nodes():
+    return _stream(db.select(Symbol.id, Symbol.name, Symbol.tradition, Symbol.century_origin).order_by(Symbol.id))
+
+
+def _edges():
+    return _stream(db.select(Connection.id, Connection.source_id, Connection.target_id,
+                             Connection.strength, Connection.description).order_by(Connection.id))
+
+
+def _text(value):
+    """Escape a value as XML character data, dropping characters XML 1.0 forbids"""
+    return escape(XML_INVALID_CHARS.sub('', value or ''))
+
+
+def _attr(value):
+    """Quote a value as an XML attribute, dropping characters XML 1.0 forbids"""
+    return quoteattr(XML_INVALID_CHARS.sub('', value or ''))
+
+
+def _graphml():
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+           '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+           '  <key id="tradition" for="node" attr.name="tradition" attr.type="string"/>\n'
+           '  <key id="century_origin" for="node" attr.name="century_origin" attr.type="int"/>\n'
+           '  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n'
+           '  <key id="description" for="edge" attr.name="description" attr.type="string"/>\n'
+           '  <graph id="connections" edgedefault="undirected">\n')
+    for rows in _nodes():
+        yield ''.join(
+            f'    <node id="{symbol_id}">'
+            f'<data key="label">{_text(name)}</data>'
+            f'<data key="tradition">{_text(tradition)}</data>'
+            f'<data key="century_origin">{century}</data></node>\n'
+            for symbol_id, name, tradition, century in rows
+        )
+    for rows in _edges():
+        yield ''.join(
+            f'    <edge id="e{edge_id}" source="{source}" target="{target}">'
+            f'<data key="weight">{strength}</data>'
+            f'<data key="description">{_text(description)}</data></edge>\n'
+            for edge_id, source, target, strength, description in rows
+        )
+    yield '  </graph>\n</graphml>\n'
+
+
+def _gexf():
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<gexf xmlns="http://gexf.net/1.3" version="1.3">\n'
+           '  <graph mode="static" defaultedgetype="undirected">\n'
+           '    <attributes class="node">\n'
+           '      <attribute id="tradition" title="tradition" type="string"/>\n'
+           '      <attribute id="century_origin" title="century_origin" type="integer"/>\n'
+           '    </attributes>\n'
+           '    <nodes>\n')
+    for rows in _nodes():
+        yield ''.join(
+            f'      <node id="{symbol_id}" label={_attr(name)}><attvalues>'
+            f'<attvalue for="tradition" value={_attr(tradition)}/>'
+            f'<attvalue for="century_origin" value="{century}"/></attvalues></node>\n'
+            for symbol_id, name, tradition, century in rows
+        )
+    yield '    </nodes>\n    <edges>\n'
+    for rows in _edges():
+        yield ''.join(
+            f'      <edge id="{edge_id}" source="{source}" target="{target}" weight="{strength}"'
+            f' label={_attr(description)}/>\n'
+            for edge_id, source, target, strength, description in rows
+        )
+    yield '    </edges>\n  </graph>\n</gexf>\n'
+
+
+def _csv():
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(['Source', 'Target', 'Weight', 'Id', 'Label'])
+    yield buffer.getvalue()
+    for rows in _edges():
+        buffer.seek(0)
+        buffer.truncate()
+        for edge_id, source, target, strength, description in rows:
+            writer.writerow([source, target, strength, edge_id, description or ''])
+        yield buffer.getvalue()
@@ -0,0 +1,325 @@
+import numpy as np
+from scipy import sparse
+from models.database import Symbol, Connection, db
+from services.cache import dataset_cache
+
+
+def split_traditions(tradition):
+    """Split a multi-tradition string like 'Egyptian/Greek' into its parts"""
+    return [t.strip() for t in (tradition or '').split('/') if t.strip()]
+
+
+class ConnectionGraph:
+    """Compact index-based view of the Connection table
+
+    Symbols are addressed by their position in ``symbol_ids`` (sorted), so edge
+    endpoints can be stored as plain integer arrays.
+    """
+
+    def __init__(self, symbol_ids, names, traditions, edge_ids, sources, targets, strengths):
+        self.symbol_ids = symbol_ids
+        self.names = names
+        self.traditions = traditions
+        self.edge_ids = edge_ids
+        self.sources = sources
+        self.targets = targets
+        self.strengths = strengths
+
+    @property
+    def num_nodes(self):
+        return len(self.symbol_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.edge_ids)
+
+    @classmethod
+    def load(cls):
+        """Build the graph from the database, dropping orphaned connections"""
+        symbol_rows = db.session.execute(
+            db.select(Symbol.id, Symbol.name, Symbol.tradition).order_by(Symbol.id)
+        ).all()
+        symbol_ids = np.array([row[0] for row in symbol_rows], dtype=np.int64)
+        names = [row[1] for row in symbol_rows]
+        traditions = [row[2] for row in symbol_rows]
+
+        edge_rows = db.session.execute(
+            db.select(Connection.id, Connection.source_id, Connection.target_id, Connection.strength)
+        ).all()
+        edge_ids = np.array([row[0] for row in edge_rows], dtype=np.int64)
+        source_ids = np.array([row[1] for row in edge_rows], dtype=np.int64)
+        target_ids = np.array([row[2] for row in edge_rows], dtype=np.int64)
+        strengths = np.array([row[3] for row in edge_rows], dtype=np.float64)
+
+        sources = cls._to_index(symbol_ids, source_ids)
+        targets = cls._to_index(symbol_ids, target_ids)
+        valid = (sources >= 0) & (targets >= 0)
+
+        return cls(symbol_ids, names, traditions,
+                   edge_ids[valid], sources[valid], targets[valid], strengths[valid])
+
+    def index_of(self, ids):
+        """Map an array of symbol ids to node positions (-1 if unknown)"""
+        return self._to_index(self.symbol_ids, np.asarray(ids, dtype=np.int64))
+
+    @staticmethod
+    def _to_index(symbol_ids, ids):
+        """Map symbol ids to node positions, -1 for ids with no symbol"""
+        if len(symbol_ids) == 0:
+            return np.full(len(ids), -1, dtype=np.int64)
+        positions = np.searchsorted(symbol_ids, ids)
+        clipped = np.minimum(positions, len(symbol_ids) - 1)
+        return np.where(symbol_ids[clipped] == ids, clipped, -1)
+
+
+def get_connection_graph():
+    """Return the connection graph for the current dataset version"""
+    return dataset_cache.get(('connection_graph',), ConnectionGraph.load)
+
+
+def tradition_incidence(graph):
+    """Binary symbol x tradition matrix from the (possibly multi-valued) Symbol.tradition
+
+    Returns the CSR matrix and the tradition names in column order.
+    """
+    codes = {}
+    rows, cols = [], []
+    for node, tradition in enumerate(graph.traditions):
+        for name in set(split_traditions(tradition)):
+            rows.append(node)
+            cols.append(codes.setdefault(name, len(codes)))
+    matrix = sparse.coo_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(graph.num_nodes, len(codes))
+    ).tocsr()
+    return matrix, list(codes)
+
+
+def connected_components(num_nodes, sources, targets):
+    """Label connected components with union-find (union by size, path halving)
+
+    Returns an array mapping each node to a component root.
+    """
+    parent = list(range(num_nodes))
+    size = [1] * num_nodes
+
+    for u, v in zip(sources.tolist(), targets.tolist()):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        if u == v:
+            continue
+        if size[u] < size[v]:
+            u, v = v, u
+        parent[v] = u
+        size[u] += size[v]
+
+    labels = []
+    for node in range(num_nodes):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        labels.append(root)
+    return np.array(labels, dtype=np.int64)
+
+
+def bridges_and_articulation_points(num_nodes, sources, targets):
+    """Find bridge edges and articulation points with an iterative Tarjan DFS
+
+    Edges are identified by their position in ``sources``/``targets``, so
+    parallel connections between the same pair are correctly not bridges.
+    Uses an explicit stack and therefore never hits the recursion limit.
+    """
+    num_edges = len(sources)
+    heads = np.concatenate([sources, targets])
+    tails = np.concatenate([targets, sources])
+    edge_index = np.concatenate([np.arange(num_edges), np.arange(num_edges)])
+    order = np.argsort(heads, kind='stable')
+
+    indptr = [0] + np.cumsum(np.bincount(heads, minlength=num_nodes)).tolist()
+    adjacency = tails[order].tolist()
+    adjacency_edges = edge_index[order].tolist()
+
+    discovery = [-1] * num_nodes
+    low = [0] * num_nodes
+    is_articulation = [False] * num_nodes
+    bridges = []
+    timer = 0
+
+    for root in range(num_nodes):
+        if discovery[root] != -1:
+            continue
+        discovery[root] = low[root] = timer
+        timer += 1
+        root_children = 0
+
+        # Each frame: node, edge used to reach it, next adjacency position
+        stack_nodes = [root]
+        stack_edges = [-1]
+        stack_pos = [indptr[root]]
+
+        while stack_nodes:
+            v = stack_nodes[-1]
+            pos = stack_pos[-1]
+
+            if pos < indptr[v + 1]:
+                stack_pos[-1] = pos + 1
+                w = adjacency[pos]
+                edge = adjacency_edges[pos]
+                if edge == stack_edges[-1]:
+                    continue
+                if discovery[w] == -1:
+                    discovery[w] = low[w] = timer
+                    timer += 1
+                    if v == root:
+                        root_children += 1
+                    stack_nodes.append(w)
+                    stack_edges.append(edge)
+                    stack_pos.append(indptr[w])
+                elif discovery[w] < low[v]:
+                    low[v] = discovery[w]
+                continue
+
+            # All neighbours visited: propagate low-link to the parent
+            stack_nodes.pop()
+            stack_pos.pop()
+            edge = stack_edges.pop()
+            if not stack_nodes:
+                continue
+            parent = stack_nodes[-1]
+            if low[v] < low[parent]:
+                low[parent] = low[v]
+            if low[v] > discovery[parent]:
+                bridges.append(edge)
+            if parent != root and low[v] >= discovery[parent]:
+                is_articulation[parent] = True
+
+        if root_children > 1:
+            is_articulation[root] = True
+
+    articulation_points = [node for node in range(num_nodes) if is_articulation[node]]
+    return bridges, articulation_points
+
+
+class GraphAnalysisService:
+    """Service for structural analysis of the symbol connection graph"""
+
+    def get_components(self):
+        """Get connected components of the connection graph"""
+        return dataset_cache.get(('components',), self._compute_components)
+
+    def get_bridges(self):
+        """Get bridge connections and articulation-point symbols"""
+        return dataset_cache.get(('bridges',), self._compute_bridges)
+
+    def get_tradition_matrix(self):
+        """Get tradition x tradition connection counts and strength sums"""
+        return dataset_cache.get(('tradition_matrix',), self._compute_tradition_matrix)
+
+    def _compute_components(self):
+        graph = get_connection_graph()
+        labels = connected_components(graph.num_nodes, graph.sources, graph.targets)
+        _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+
+        members = {}
+        for node, component in enumerate(inverse.tolist()):
+            members.setdefault(component, []).append(node)
+
+        components = []
+        isolated = []
+        for component, nodes in members.items():
+            if counts[component] == 1:
+                isolated.append(int(graph.symbol_ids[nodes[0]]))
+                continue
+            traditions = set()
+            for node in nodes:
+                traditions.update(split_traditions(graph.traditions[node]))
+            components.append({
+                "size": len(nodes),
+                "symbols": graph.symbol_ids[nodes].tolist(),
+                "traditions": sorted(traditions)
+            })
+
+        # Largest components first
+        components.sort(key=lambda x: x["size"], reverse=True)
+        for i, component in enumerate(components):
+            component["component"] = i
+
+        return {
+            "symbol_count": graph.num_nodes,
+            "connection_count": graph.num_edges,
+            "component_count": len(components) + len(isolated),
+            "largest_component_size": components[0]["size"] if components else min(graph.num_nodes, 1),
+            "isolated_symbols": isolated,
+            "components": components
+        }
+
+    def _compute_bridges(self):
+        graph = get_connection_graph()
+        # Self-loops never affect connectivity
+        keep = graph.sources != graph.targets
+        edge_positions = np.flatnonzero(keep)
+        bridges, articulation_points = bridges_and_articulation_points(
+            graph.num_nodes, graph.sources[keep], graph.targets[keep]
+        )
+
+        bridge_list = []
+        for edge in bridges:
+            position = edge_positions[edge]
+            source = int(graph.sources[position])
+            target = int(graph.targets[position])
+            source_traditions = set(split_traditions(graph.traditions[source]))
+            target_traditions = set(split_traditions(graph.traditions[target]))
+            bridge_list.append({
+                "connection_id": int(graph.edge_ids[position]),
+                "source": int(graph.symbol_ids[source]),
+                "target": int(graph.symbol_ids[target]),
+                "strength": float(graph.strengths[position]),
+                "source_tradition": graph.traditions[source],
+                "target_tradition": graph.traditions[target],
+                "cross_tradition": not (source_traditions & target_traditions)
+            })
+
+        # Cross-tradition bridges first, then strongest
+        bridge_list.sort(key=lambda x: (not x["cross_tradition"], -x["strength"]))
+
+        return {
+            "bridge_count": len(bridge_list),
+            "bridges": bridge_list,
+            "articulation_points": [
+                {
+                    "id": int(graph.symbol_ids[node]),
+                    "name": graph.names[node],
+                    "tradition": graph.traditions[node]
+                }
+                for node in articulation_points
+            ]
+        }
+
+    def _compute_tradition_matrix(self):
+        graph = get_connection_graph()
+        incidence, traditions = tradition_incidence(graph)
+
+        # Project every connection onto all traditions of both endpoints at once
+        source_traditions = incidence[graph.sources]
+        target_traditions = incidence[graph.targets]
+        counts = (source_traditions.T @ target_traditions).tocsr()
+        strengths = (source_traditions.T @ sparse.diags(graph.strengths) @ target_traditions).tocsr()
+
+        # Connections are undirected, so a tradition pair counts once per connection when
+        # either direction links it: OR the directions as x + y - xy. The overlap xy is
+        # set exactly when both traditions belong to both endpoints (this includes the diagonal)
+        shared = source_traditions.multiply(target_traditions).tocsr()
+        counts = (counts + counts.T - shared.T @ shared).tocoo()
+        strengths = (strengths + strengths.T - shared.T @ sparse.diags(graph.strengths) @ shared).tocsr()
+        counts.eliminate_zeros()
+
+        return {
+            "traditions": traditions,
+            "rows": counts.row.tolist(),
+            "cols": counts.col.tolist(),
+            "counts": counts.data.astype(np.int64).tolist(),
+            "strength_sums": np.round(np.asarray(strengths[counts.row, counts.col]).ravel(), 4).tolist()
+        }
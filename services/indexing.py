@@ -0,0 +1,303 @@
+import json
+import re
+from sqlalchemy import inspect
+from models.database import Element, ElementCorrespondence, Symbol, SymbolCategory, SymbolVisualTerm, TimePeriod, \
+    TimePeriodSymbol, Tradition, TraditionReference, db
+
+# Maximum stored term length (matches the SymbolVisualTerm.term column)
+MAX_TERM_LENGTH = 100
+
+# Tradition JSON list columns indexed as TraditionReference rows, by kind
+REFERENCE_FIELDS = {'figure': 'key_figures', 'text': 'major_texts', 'concept': 'core_concepts'}
+
+_ensured_tables = set()
+
+
+def ensure_table(model):
+    """Create an index table on first use for databases set up before it existed"""
+    key = (str(db.engine.url), model.__tablename__)
+    if key in _ensured_tables:
+        return
+    connection = db.session.connection()
+    if inspect(connection).has_table(model.__tablename__):
+        # Only remember tables that already existed; a fresh CREATE may still roll back
+        _ensured_tables.add(key)
+    else:
+        model.__table__.create(connection)
+
+
+def changed_ids(pending, since, current, model, models):
+    """Ids of ``model`` rows changed from version ``since`` to ``current``
+
+    ``pending`` holds the (version, changes) records an index received from
+    on_dataset_change. Incremental updates are only safe when those records
+    cover every version in between one by one, and each touches only
+    ``models``; otherwise (first load, a bulk change, a write from another
+    process) None is returned and the caller must rebuild.
+    """
+    if since is None:
+        return None
+    expected = since
+    ids = set()
+    for version, changes in sorted(pending, key=lambda x: x[0]):
+        if version <= expected:
+            continue
+        if changes is None or version != expected + 1 or set(changes) - set(models):
+            return None
+        ids |= changes.get(model, set())
+        expected = version
+    return ids if expected == current else None
+
+
+def normalize_term(term):
+    """Normalize a visual term: lower-case, single spaces, naive singular form"""
+    words = re.findall(r'[a-z0-9]+', (term or '').lower())
+    return ' '.join(_singular(word) for word in words)[:MAX_TERM_LENGTH]
+
+
+def _singular(word):
+    """Strip a plural 's' from longer words ('triangles' -> 'triangle', not 'cross')"""
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def visual_terms(visual_elements):
+    """All index terms for a list of visual elements: each full phrase plus its words"""
+    terms = set()
+    for element in visual_elements or []:
+        phrase = normalize_term(element)
+        if not phrase:
+            continue
+        terms.add(phrase)
+        terms.update(phrase.split(' '))
+    return terms
+
+
+def index_symbol_visual_elements(symbol):
+    """Replace the visual-term postings of one symbol (flushes to obtain an id if needed)"""
+    ensure_table(SymbolVisualTerm)
+    # A symbol not yet in the database has no postings, so bulk ingest skips the delete
+    stored = inspect(symbol).persistent
+    if symbol.id is None:
+        db.session.flush()
+    if stored:
+        SymbolVisualTerm.query.filter_by(symbol_id=symbol.id).delete()
+    elements = json.loads(symbol.visual_elements) if symbol.visual_elements else []
+    for term in visual_terms(elements):
+        db.session.add(SymbolVisualTerm(term=term, symbol_id=symbol.id))
+
+
+def rebuild_visual_index():
+    """Rebuild the whole visual-term index from Symbol.visual_elements"""
+    ensure_table(SymbolVisualTerm)
+    SymbolVisualTerm.query.delete()
+    rows = []
+    for symbol_id, visual_elements in db.session.execute(db.select(Symbol.id, Symbol.visual_elements)).all():
+        elements = json.loads(visual_elements) if visual_elements else []
+        rows.extend({'term': term, 'symbol_id': symbol_id} for term in visual_terms(elements))
+    if rows:
+        db.session.execute(SymbolVisualTerm.__table__.insert(), rows)
+    return len(rows)
+
+
+def flatten_correspondences(correspondences, prefix=''):
+    """Flatten a correspondence dict into (key, value) pairs
+
+    Lists yield one pair per item and nested dicts use dotted keys, so
+    {"colors": ["Red", "Gold"], "planet": {"name": "Mars"}} becomes
+    colors=Red, colors=Gold and planet.name=Mars.
+    """
+    pairs = []
+    for key, value in (correspondences or {}).items():
+        full_key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            pairs.extend(flatten_correspondences(value, full_key + '.'))
+        elif isinstance(value, (list, tuple)):
+            pairs.extend((full_key, str(item)) for item in value if item is not None)
+        elif value is not None:
+            pairs.append((full_key, str(value)))
+    return pairs
+
+
+def _correspondence_rows(element_id, correspondences_json):
+    correspondences = json.loads(correspondences_json) if correspondences_json else {}
+    return [
+        {
+            'element_id': element_id,
+            'key': key[:100],
+            'value': value[:255],
+            'key_norm': key.strip().lower()[:100],
+            'value_norm': value.strip().lower()[:255]
+        }
+        for key, value in flatten_correspondences(correspondences)
+    ]
+
+
+def index_element_correspondences(element):
+    """Replace the flattened correspondence rows of one element (flushes to obtain an id if needed)"""
+    ensure_table(ElementCorrespondence)
+    if element.id is None:
+        db.session.flush()
+    ElementCorrespondence.query.filter_by(element_id=element.id).delete()
+    for row in _correspondence_rows(element.id, element.correspondences):
+        db.session.add(ElementCorrespondence(**row))
+
+
+def rebuild_correspondence_index():
+    """Rebuild the whole correspondence table from Element.correspondences"""
+    ensure_table(ElementCorrespondence)
+    ElementCorrespondence.query.delete()
+    rows = []
+    for element_id, correspondences in db.session.execute(db.select(Element.id, Element.correspondences)).all():
+        rows.extend(_correspondence_rows(element_id, correspondences))
+    if rows:
+        db.session.execute(ElementCorrespondence.__table__.insert(), rows)
+    return len(rows)
+
+
+def normalize_reference(value):
+    """Normalize a figure, text or concept name: lower-case with single spaces"""
+    return ' '.join((value or '').lower().split())[:255]
+
+
+def _reference_rows(tradition):
+    rows = []
+    for kind, field in REFERENCE_FIELDS.items():
+        raw = getattr(tradition, field)
+        seen = set()
+        for value in json.loads(raw) if raw else []:
+            value = str(value).strip()
+            value_norm = normalize_reference(value)
+            if value_norm and value_norm not in seen:
+                seen.add(value_norm)
+                rows.append({'tradition_id': tradition.id, 'kind': kind,
+                             'value': value[:255], 'value_norm': value_norm})
+    return rows
+
+
+def index_tradition_references(tradition):
+    """Replace the figure/text/concept rows of one tradition (flushes to obtain an id if needed)"""
+    ensure_table(TraditionReference)
+    if tradition.id is None:
+        db.session.flush()
+    TraditionReference.query.filter_by(tradition_id=tradition.id).delete()
+    for row in _reference_rows(tradition):
+        db.session.add(TraditionReference(**row))
+
+
+def rebuild_reference_index():
+    """Rebuild the whole figure/text/concept table from the tradition JSON columns"""
+    ensure_table(TraditionReference)
+    TraditionReference.query.delete()
+    rows = []
+    for tradition in Tradition.query.all():
+        rows.extend(_reference_rows(tradition))
+    if rows:
+        db.session.execute(TraditionReference.__table__.insert(), rows)
+    return len(rows)
+
+
+def symbol_year(century):
+    """Representative year of a century of origin, its midpoint (5 -> 450, -3 -> -350)"""
+    return century * 100 - 50
+
+
+def _period_membership(symbol_id=None):
+    """Insert-from-select of (period, symbol) pairs whose year falls in [start_year, end_year)"""
+    year = symbol_year(Symbol.century_origin)
+    query = db.select(TimePeriod.id, Symbol.id).join(
+        Symbol, db.and_(year >= TimePeriod.start_year, year < TimePeriod.end_year))
+    if symbol_id is not None:
+        query = query.where(Symbol.id == symbol_id)
+    return TimePeriodSymbol.__table__.insert().from_select(['period_id', 'symbol_id'], query)
+
+
+def index_symbol_periods(symbol):
+    """Replace the time-period memberships of one symbol (flushes so its century is current)"""
+    ensure_table(TimePeriodSymbol)
+    db.session.flush()
+    TimePeriodSymbol.query.filter_by(symbol_id=symbol.id).delete()
+    db.session.execute(_period_membership(symbol.id))
+
+
+def rebuild_period_index():
+    """Rebuild the whole time-period membership table with one interval join"""
+    ensure_table(TimePeriodSymbol)
+    db.session.flush()
+    TimePeriodSymbol.query.delete()
+    db.session.execute(_period_membership())
+    return db.session.query(TimePeriodSymbol).count()
+
+
+def curated_symbol_categories():
+    """Stored curated categories as metadata["symbol_categories"] entries, in insertion order"""
+    ensure_table(SymbolCategory)
+    categories = {}
+    for name, symbol_id in db.session.execute(
+            db.select(SymbolCategory.name, SymbolCategory.symbol_id).order_by(SymbolCategory.id)):
+        categories.setdefault(name, []).append(symbol_id)
+    return [{"name": name, "symbols": symbols} for name, symbols in categories.items()]
+
+
+def store_symbol_categories(categories):
+    """Make the curated members of each given category exactly its listed symbols
+
+    ``categories`` is the dataset's metadata["symbol_categories"] list of
+    {"name", "symbols": [symbol ids]}. Categories not listed are left alone,
+    ids of symbols not in the database are skipped, and unchanged memberships
+    are not rewritten (so the dataset version only moves on a real change).
+
+    Returns:
+        Number of memberships added and removed
+    """
+    ensure_table(SymbolCategory)
+    changed = 0
+    for category in categories:
+        wanted = set(db.session.execute(
+            db.select(Symbol.id).where(Symbol.id.in_(category.get("symbols", [])))
+        ).scalars())
+        stored = {row.symbol_id: row for row in SymbolCategory.query.filter_by(name=category["name"])}
+        for symbol_id in set(stored) - wanted:
+            db.session.delete(stored[symbol_id])
+        for symbol_id in sorted(wanted - set(stored)):
+            db.session.add(SymbolCategory(name=category["name"], symbol_id=symbol_id))
+        changed += len(set(stored) ^ wanted)
+    return changed
+
+
+def remove_tradition_from_indexes(tradition_id):
+    """Drop all index entries of a tradition that is being deleted"""
+    ensure_table(TraditionReference)
+    TraditionReference.query.filter_by(tradition_id=tradition_id).delete()
+
+
+def remove_element_from_indexes(element_id):
+    """Drop all index entries of an element that is being deleted"""
+    ensure_table(ElementCorrespondence)
+    ElementCorrespondence.query.filter_by(element_id=element_id).delete()
+
+
+def remove_symbol_from_indexes(symbol_id):
+    """Drop all index entries of a symbol that is being deleted"""
+    ensure_table(SymbolVisualTerm)
+    ensure_table(TimePeriodSymbol)
+    ensure_table(SymbolCategory)
+    SymbolVisualTerm.query.filter_by(symbol_id=symbol_id).delete()
+    TimePeriodSymbol.query.filter_by(symbol_id=symbol_id).delete()
+    # Core delete: the symbol's own deletion already moves the dataset version
+    db.session.execute(SymbolCategory.__table__.delete().where(SymbolCategory.symbol_id == symbol_id))
+
+
+def clear_indexes():
+    """Drop every index entry (used before replacing all symbols, elements and traditions)"""
+    ensure_table(SymbolVisualTerm)
+    ensure_table(ElementCorrespondence)
+    ensure_table(TraditionReference)
+    ensure_table(TimePeriodSymbol)
+    ensure_table(SymbolCategory)
+    SymbolVisualTerm.query.delete()
+    ElementCorrespondence.query.delete()
+    TraditionReference.query.delete()
+    TimePeriodSymbol.query.delete()
+    db.session.execute(SymbolCategory.__table__.delete())
@@ -0,0 +1,91 @@
+class IntervalTree:
+    """Static centered interval tree over closed integer intervals
+
+    Built once from ``(start, end, value)`` triples. Point (stabbing) and range
+    overlap queries run in O(log n + k) for k reported intervals. Construction
+    and queries are iterative, so deep trees never hit the recursion limit.
+    """
+
+    class _Node:
+        __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+        def __init__(self, center, intervals):
+            self.center = center
+            # Intervals containing center, sorted two ways for early cut-off
+            self.by_start = sorted(intervals, key=lambda x: x[0])
+            self.by_end = sorted(intervals, key=lambda x: x[1], reverse=True)
+            self.left = None
+            self.right = None
+
+    def __init__(self, intervals):
+        self.root = None
+        intervals = [(start, end, value) for start, end, value in intervals if start <= end]
+        self.size = len(intervals)
+        if not intervals:
+            return
+
+        # Each pending item: (intervals, parent node, attach to the left?)
+        pending = [(intervals, None, False)]
+        while pending:
+            items, parent, is_left = pending.pop()
+            endpoints = sorted([x[0] for x in items] + [x[1] for x in items])
+            center = endpoints[len(endpoints) // 2]
+
+            here, left, right = [], [], []
+            for item in items:
+                if item[1] < center:
+                    left.append(item)
+                elif item[0] > center:
+                    right.append(item)
+                else:
+                    here.append(item)
+
+            node = self._Node(center, here)
+            if parent is None:
+                self.root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+
+            if left:
+                pending.append((left, node, True))
+            if right:
+                pending.append((right, node, False))
+
+    def __len__(self):
+        return self.size
+
+    def at(self, point):
+        """Return values of all intervals containing point"""
+        return self.overlapping(point, point)
+
+    def overlapping(self, start, end):
+        """Return values of all intervals overlapping the closed range [start, end]"""
+        result = []
+        stack = [self.root] if self.root else []
+
+        while stack:
+            node = stack.pop()
+            if end < node.center:
+                for item in node.by_start:
+                    if item[0] > end:
+                        break
+                    result.append(item[2])
+                if node.left:
+                    stack.append(node.left)
+            elif start > node.center:
+                for item in node.by_end:
+                    if item[1] < start:
+                        break
+                    result.append(item[2])
+                if node.right:
+                    stack.append(node.right)
+            else:
+                result.extend(item[2] for item in node.by_start)
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+
+        return result
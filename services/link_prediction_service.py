@@ -0,0 +1,181 @@
+import logging
+import numpy as np
+from scipy import sparse
+from models.database import SuggestedConnection, symbol_element_association, db
+from services.graph_service import ConnectionGraph, tradition_incidence
+
+logger = logging.getLogger('link_prediction')
+
+
+class LinkPredictionService:
+    """Batch job that scores unconnected symbol pairs as candidate connections
+
+    Candidates are pairs at distance two in the connection graph. Each pair is
+    scored with common neighbours, Adamic-Adar and Jaccard, plus the number of
+    shared elements and traditions. Scores are computed one block of rows at a
+    time, so memory stays bounded by ``block_size`` rather than N x N.
+    """
+
+    # Weights of the auxiliary signals in the combined score
+    ELEMENT_WEIGHT = 0.25
+    TRADITION_WEIGHT = 0.5
+
+    def __init__(self, top_k=100, block_size=1024):
+        self.top_k = top_k
+        self.block_size = block_size
+
+    def score_candidates(self):
+        """Return the top-k candidate pairs as a list of score dictionaries"""
+        SuggestedConnection.__table__.create(db.engine, checkfirst=True)
+        graph = ConnectionGraph.load()
+        n = graph.num_nodes
+        if n < 2 or self.top_k <= 0:
+            return []
+
+        adjacency = self._adjacency_matrix(graph)
+        degree = np.asarray(adjacency.sum(axis=1)).ravel()
+        # Common neighbours always have degree >= 2, so log(degree) > 0 where used
+        aa_weights = np.where(degree > 1, 1.0 / np.log(np.maximum(degree, 2)), 0.0)
+        weighted_adjacency = sparse.diags(aa_weights).dot(adjacency).tocsr()
+        excluded = (adjacency + self._reviewed_matrix(graph)).tocsr()
+        excluded.data[:] = 1.0
+        elements = self._element_matrix(graph)
+        traditions, _ = tradition_incidence(graph)
+
+        best = None
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            block = self._score_block(start, stop, adjacency, weighted_adjacency, excluded,
+                                      degree, elements, traditions)
+            best = block if best is None else self._top_k(
+                {key: np.concatenate([best[key], block[key]]) for key in best}
+            )
+
+        order = np.argsort(-best['score'], kind='stable')
+        suggestions = []
+        for i in order.tolist():
+            suggestions.append({
+                'source': int(graph.symbol_ids[best['row'][i]]),
+                'target': int(graph.symbol_ids[best['col'][i]]),
+                'score': float(best['score'][i]),
+                'common_neighbors': int(best['common_neighbors'][i]),
+                'adamic_adar': float(best['adamic_adar'][i]),
+                'jaccard': float(best['jaccard'][i]),
+                'shared_elements': int(best['shared_elements'][i]),
+                'shared_traditions': int(best['shared_traditions'][i])
+            })
+        return suggestions
+
+    def generate_suggestions(self):
+        """Score candidates and replace pending rows in suggested_connection
+
+        Reviewed (accepted/rejected) suggestions are kept and never re-suggested.
+        """
+        suggestions = self.score_candidates()
+
+        SuggestedConnection.query.filter_by(status='pending').delete()
+        for suggestion in suggestions:
+            db.session.add(SuggestedConnection(
+                source_id=suggestion['source'],
+                target_id=suggestion['target'],
+                score=suggestion['score'],
+                common_neighbors=suggestion['common_neighbors'],
+                adamic_adar=suggestion['adamic_adar'],
+                jaccard=suggestion['jaccard'],
+                shared_elements=suggestion['shared_elements'],
+                shared_traditions=suggestion['shared_traditions'],
+                status='pending'
+            ))
+        db.session.commit()
+
+        logger.info(f"Stored {len(suggestions)} suggested connections")
+        return suggestions
+
+    def _score_block(self, start, stop, adjacency, weighted_adjacency, excluded,
+                     degree, elements, traditions):
+        """Score all candidate pairs whose first node lies in rows start:stop"""
+        rows = adjacency[start:stop]
+        common = rows.dot(adjacency).tocsr()
+        # Drop existing connections and already-reviewed pairs
+        common = (common - common.multiply(excluded[start:stop])).tocoo()
+
+        row = common.row.astype(np.int64) + start
+        col = common.col.astype(np.int64)
+        keep = (col > row) & (common.data > 0)
+        row, col, counts = row[keep], col[keep], common.data[keep]
+
+        adamic_adar = np.asarray(
+            rows.dot(weighted_adjacency).tocsr()[row - start, col]
+        ).ravel()
+        jaccard = counts / (degree[row] + degree[col] - counts)
+        shared_elements = np.asarray(elements[row].multiply(elements[col]).sum(axis=1)).ravel()
+        shared_traditions = np.asarray(traditions[row].multiply(traditions[col]).sum(axis=1)).ravel()
+
+        score = adamic_adar + jaccard + \
+            self.ELEMENT_WEIGHT * shared_elements + self.TRADITION_WEIGHT * shared_traditions
+
+        return self._top_k({
+            'row': row,
+            'col': col,
+            'score': score,
+            'common_neighbors': counts,
+            'adamic_adar': adamic_adar,
+            'jaccard': jaccard,
+            'shared_elements': shared_elements,
+            'shared_traditions': shared_traditions
+        })
+
+    def _top_k(self, columns):
+        """Keep only the top_k highest-scoring entries of a column dictionary"""
+        scores = columns['score']
+        if len(scores) <= self.top_k:
+            return columns
+        keep = np.argpartition(-scores, self.top_k - 1)[:self.top_k]
+        return {key: values[keep] for key, values in columns.items()}
+
+    @staticmethod
+    def _adjacency_matrix(graph):
+        """Symmetric 0/1 adjacency matrix without self-loops"""
+        n = graph.num_nodes
+        keep = graph.sources != graph.targets
+        sources, targets = graph.sources[keep], graph.targets[keep]
+        matrix = sparse.coo_matrix(
+            (np.ones(len(sources)), (sources, targets)), shape=(n, n)
+        ).tocsr()
+        matrix = (matrix + matrix.T).tocsr()
+        matrix.data[:] = 1.0
+        return matrix
+
+    @staticmethod
+    def _reviewed_matrix(graph):
+        """Symmetric matrix marking pairs that were already accepted or rejected"""
+        n = graph.num_nodes
+        pairs = db.session.execute(
+            db.select(SuggestedConnection.source_id, SuggestedConnection.target_id)
+            .where(SuggestedConnection.status != 'pending')
+        ).all()
+        sources = graph.index_of([p[0] for p in pairs])
+        targets = graph.index_of([p[1] for p in pairs])
+        keep = (sources >= 0) & (targets >= 0)
+        matrix = sparse.coo_matrix(
+            (np.ones(int(keep.sum())), (sources[keep], targets[keep])), shape=(n, n)
+        )
+        return (matrix + matrix.T).tocsr()
+
+    @staticmethod
+    def _element_matrix(graph):
+        """Binary symbol x element incidence matrix from symbol_element"""
+        rows = db.session.execute(
+            db.select(symbol_element_association.c.symbol_id, symbol_element_association.c.element_id)
+        ).all()
+        symbols = graph.index_of([r[0] for r in rows])
+        element_ids = np.array([r[1] for r in rows], dtype=np.int64)
+        keep = symbols >= 0
+        _, element_codes = np.unique(element_ids[keep], return_inverse=True)
+        num_elements = int(element_codes.max()) + 1 if len(element_codes) else 0
+        matrix = sparse.coo_matrix(
+            (np.ones(len(element_codes)), (symbols[keep], element_codes)),
+            shape=(graph.num_nodes, num_elements)
+        ).tocsr()
+        matrix.data[:] = 1.0
+        return matrix
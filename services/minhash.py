@@ -0,0 +1,182 @@
+import json
+import threading
+import zlib
+import numpy as np
+from models.database import DatasetVersion, Element, Symbol, Tradition, symbol_element_association, \
+    on_dataset_change, db
+from services.graph_service import split_traditions
+from services.indexing import REFERENCE_FIELDS, changed_ids, normalize_reference
+
+# Mersenne prime modulus of the universal hash family a * x + b mod p
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+class MinHashLSH:
+    """MinHash signatures of feature sets, bucketed by locality-sensitive hashing
+
+    Each signature holds ``num_perm`` minima of universal hashes over the
+    hashed features; the fraction of equal positions estimates the Jaccard
+    similarity of two sets. Signatures are cut into ``bands`` bands and every
+    band is a bucket key, so a query only compares keys sharing at least one
+    bucket: pairs with Jaccard above roughly (1/bands)^(1/rows) are found
+    with high probability without scanning every key. The default 64 bands
+    of 2 rows put that threshold near 0.125, since traditions share only a
+    small part of their concepts, figures and elements.
+    """
+
+    def __init__(self, num_perm=128, bands=64, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.signatures = {}
+        self.buckets = [{} for _ in range(bands)]
+
+    def signature(self, features):
+        """MinHash signature (uint64 array) of a non-empty set of strings"""
+        hashes = np.array([zlib.crc32(f.encode('utf-8')) for f in features], dtype=np.uint64)
+        # a < 2^32 and hash < 2^32, so a * hash + b stays below 2^64
+        values = (np.outer(hashes, self.a) + self.b) % np.uint64(MERSENNE_PRIME)
+        return values.min(axis=0)
+
+    def insert(self, key, features):
+        """Add or replace a key; keys without features are removed"""
+        self.remove(key)
+        if not features:
+            return
+        signature = self.signature(features)
+        self.signatures[key] = signature
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(bucket_key, set()).add(key)
+
+    def remove(self, key):
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band].get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band][bucket_key]
+
+    def query(self, key, limit=10):
+        """Return (other key, estimated Jaccard) for keys sharing a bucket with key, best first"""
+        signature = self.signatures.get(key)
+        if signature is None:
+            return []
+        candidates = set()
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            candidates |= self.buckets[band].get(bucket_key, set())
+        candidates.discard(key)
+
+        scored = [(other, float(np.mean(self.signatures[other] == signature))) for other in candidates]
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return scored[:limit]
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+
+class TraditionSimilarityIndex:
+    """MinHash/LSH index of traditions over concepts, figures, texts and symbol elements
+
+    Follows the dataset version like the facet index: when only traditions
+    changed, just their signatures are recomputed from change events; symbol
+    or element changes (which move element features) rebuild all signatures.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self.version = None
+        self.lsh = MinHashLSH()
+        self.names = {}     # tradition id -> name
+        self.ids = {}       # lower-cased name -> tradition id
+        on_dataset_change(self._on_change)
+
+    def similar(self, name, limit=10):
+        """Approximate Jaccard neighbors of a tradition, or None if it is unknown"""
+        self.sync()
+        with self._lock:
+            tradition_id = self.ids.get((name or '').lower())
+            if tradition_id is None:
+                return None
+            return [{"name": self.names[other], "similarity": round(similarity, 4)}
+                    for other, similarity in self.lsh.query(tradition_id, limit)]
+
+    def sync(self):
+        """Bring the index up to the current dataset version"""
+        current = DatasetVersion.current()
+        with self._lock:
+            if self.version == current:
+                return
+            pending, self._pending = self._pending, []
+
+            changed = changed_ids(pending, self.version, current, 'Tradition',
+                                  ('Tradition', 'Connection', 'TimePeriod'))
+            if changed is not None:
+                self._update(changed)
+            else:
+                self.lsh = MinHashLSH()
+                self.names = {}
+                self.ids = {}
+                self._update(None)
+            self.version = current
+
+    def _on_change(self, version, changes):
+        with self._lock:
+            self._pending.append((version, changes))
+
+    def _update(self, tradition_ids):
+        """Recompute signatures of some traditions (all if tradition_ids is None)"""
+        query = db.select(Tradition)
+        if tradition_ids is not None:
+            if not tradition_ids:
+                return
+            query = query.where(Tradition.id.in_(list(tradition_ids)))
+        traditions = db.session.execute(query).scalars().all()
+
+        for tradition_id in tradition_ids or []:
+            self.lsh.remove(tradition_id)
+            name = self.names.pop(tradition_id, None)
+            if name is not None:
+                self.ids.pop(name.lower(), None)
+
+        elements = self._elements_by_tradition()
+        for tradition in traditions:
+            self.names[tradition.id] = tradition.name
+            self.ids[tradition.name.lower()] = tradition.id
+            self.lsh.insert(tradition.id, self._features(tradition, elements.get(tradition.name, set())))
+
+    @staticmethod
+    def _features(tradition, elements):
+        """Prefixed feature strings: figure:, text:, concept: and element:"""
+        features = {f"element:{e.lower()}" for e in elements}
+        for kind, field in REFERENCE_FIELDS.items():
+            raw = getattr(tradition, field)
+            for value in json.loads(raw) if raw else []:
+                value = normalize_reference(str(value))
+                if value:
+                    features.add(f"{kind}:{value}")
+        return features
+
+    @staticmethod
+    def _elements_by_tradition():
+        """Element names of the symbols of each tradition"""
+        elements = {}
+        for tradition, element in db.session.execute(
+                db.select(Symbol.tradition, Element.name).distinct()
+                .join(symbol_element_association, symbol_element_association.c.symbol_id == Symbol.id)
+                .join(Element, Element.id == symbol_element_association.c.element_id)).all():
+            for name in split_traditions(tradition):
+                elements.setdefault(name, set()).add(element)
+        return elements
+
+
+# Process-wide index shared by the tradition endpoints
+tradition_similarity_index = TraditionSimilarityIndex()
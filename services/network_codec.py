@@ -0,0 +1,75 @@
+import struct
+import numpy as np
+
+# Leading bytes and layout version of the columnar network payload
+COLUMNAR_MAGIC = b'SYMN'
+COLUMNAR_VERSION = 1
+
+# magic, version, node count, link count, element reference count, string count, string bytes
+HEADER = struct.Struct('<4s6I')
+
+
+class StringTable:
+    """Dictionary encoder: every distinct string is stored once and referenced by index"""
+
+    def __init__(self):
+        self.codes = {}
+        self.strings = []
+
+    def code(self, value):
+        value = value or ''
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def pack(self):
+        """Return (offsets, bytes): string i is data[offsets[i]:offsets[i + 1]] in UTF-8"""
+        encoded = [s.encode('utf-8') for s in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return offsets, b''.join(encoded)
+
+
+def encode_columnar(network):
+    """Pack the network payload ({"nodes", "links"}) into one little-endian binary buffer
+
+    After a 28-byte header (see HEADER) come 4-byte columns, in order:
+
+        node id (i4), node century (i4), node name, description, tradition
+        and color (u4 string codes), node element offsets (u4, nodes + 1),
+        element codes (u4), link source, target (i4), link strength (f4),
+        link description (u4 string code), string offsets (u4, strings + 1)
+
+    followed by the UTF-8 string data. Repeated strings (traditions, colors,
+    element names, link descriptions) are stored once in the string table.
+    """
+    nodes, links = network['nodes'], network['links']
+    table = StringTable()
+
+    element_offsets = [0]
+    element_codes = []
+    for node in nodes:
+        element_codes.extend(table.code(e) for e in (node['element'] or '').split(',') if e)
+        element_offsets.append(len(element_codes))
+
+    columns = [
+        np.array([n['id'] for n in nodes], dtype='<i4'),
+        np.array([n['century'] for n in nodes], dtype='<i4'),
+        np.array([table.code(n['name']) for n in nodes], dtype='<u4'),
+        np.array([table.code(n['description']) for n in nodes], dtype='<u4'),
+        np.array([table.code(n['tradition']) for n in nodes], dtype='<u4'),
+        np.array([table.code(n['color']) for n in nodes], dtype='<u4'),
+        np.array(element_offsets, dtype='<u4'),
+        np.array(element_codes, dtype='<u4'),
+        np.array([l['source'] for l in links], dtype='<i4'),
+        np.array([l['target'] for l in links], dtype='<i4'),
+        np.array([l['strength'] for l in links], dtype='<f4'),
+        np.array([table.code(l['description']) for l in links], dtype='<u4')
+    ]
+    offsets, data = table.pack()
+
+    header = HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, len(nodes), len(links),
+                         len(element_codes), len(table.strings), len(data))
+    return b''.join([header] + [column.tobytes() for column in columns] + [offsets.tobytes(), data])
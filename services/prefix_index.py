@@ -0,0 +1,195 @@
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+from models.database import Connection, DatasetVersion, Element, Symbol, Tradition, symbol_element_association, \
+    on_dataset_change, db
+from scrapers.aliases import name_variations
+from services.graph_service import split_traditions
+from services.indexing import changed_ids
+
+# Prefixes up to this length match many keys; their answers are memoized
+MEMO_PREFIX_LENGTH = 2
+
+
+def normalize_key(text):
+    """Lower-case, strip diacritics and collapse punctuation to single spaces"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.findall(r'\w+', text))
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over symbol names, aliases, traditions and elements
+
+    Every suggestion is stored under its full normalized text and under each
+    later word start, so 'horus' finds 'Eye of Horus'. A prefix lookup is a
+    bisect into the sorted key array followed by a top-k selection by weight:
+    connection degree for symbols and aliases, symbol count for traditions and
+    elements. Matches at the start of the text rank above word matches.
+
+    Like the facet index, it follows the dataset version: keys of changed
+    symbols are replaced in place from change events and weights are
+    recounted, while tradition/element edits or unknown changes rebuild it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self.version = None
+        self._reset()
+        on_dataset_change(self._on_change)
+
+    def _reset(self):
+        self.keys = []          # sorted (key, entry id, starts text?) tuples
+        self.entries = {}       # entry id -> (text, type, symbol id or None, symbol name or None)
+        self.by_symbol = {}     # symbol id -> entry ids of its name and aliases
+        self.weights = {}       # (type, ref) -> popularity weight
+        self.next_entry = 0
+        self.memo = {}
+
+    def suggest(self, prefix, limit=10):
+        """Return up to limit suggestions whose text (or a word in it) starts with prefix"""
+        self.sync()
+        prefix = normalize_key(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        with self._lock:
+            memo_key = (prefix, limit)
+            if memo_key in self.memo:
+                return self.memo[memo_key]
+
+            start = bisect.bisect_left(self.keys, (prefix,))
+            end = bisect.bisect_left(self.keys, (prefix + '\uffff',), start)
+            best = {}
+            for _, entry_id, at_start in self.keys[start:end]:
+                best[entry_id] = best.get(entry_id, False) or at_start
+
+            ranked = heapq.nlargest(limit, best.items(), key=self._rank)
+            suggestions = [self._suggestion(entry_id) for entry_id, _ in ranked]
+            if len(prefix) <= MEMO_PREFIX_LENGTH:
+                self.memo[memo_key] = suggestions
+            return suggestions
+
+    def sync(self):
+        """Bring the index up to the current dataset version"""
+        current = DatasetVersion.current()
+        with self._lock:
+            if self.version == current:
+                return
+            pending, self._pending = self._pending, []
+
+            changed = changed_ids(pending, self.version, current, 'Symbol', ('Symbol', 'Connection'))
+            if changed is not None:
+                self._update_symbols(changed)
+                self.weights = self._load_weights()
+                self.memo = {}
+            else:
+                self._rebuild()
+            self.version = current
+
+    def _rank(self, item):
+        entry_id, at_start = item
+        text, kind, symbol_id, _ = self.entries[entry_id]
+        weight = self.weights.get((kind, symbol_id if symbol_id is not None else text), 0)
+        # Prefer a symbol's own name over its aliases at equal weight
+        return at_start, weight, kind != 'alias', -len(text)
+
+    def _suggestion(self, entry_id):
+        text, kind, symbol_id, symbol_name = self.entries[entry_id]
+        suggestion = {
+            "text": text,
+            "type": kind,
+            "score": self.weights.get((kind, symbol_id if symbol_id is not None else text), 0)
+        }
+        if symbol_id is not None:
+            suggestion["symbol_id"] = symbol_id
+            suggestion["symbol"] = symbol_name
+        return suggestion
+
+    def _on_change(self, version, changes):
+        with self._lock:
+            self._pending.append((version, changes))
+
+    def _rebuild(self):
+        self._reset()
+        keys = []
+        for symbol_id, name in db.session.execute(db.select(Symbol.id, Symbol.name)).all():
+            keys.extend(self._symbol_keys(symbol_id, name))
+        for kind, model in (('tradition', Tradition), ('element', Element)):
+            for name in db.session.execute(db.select(model.name)).scalars():
+                keys.extend(self._entry_keys(name, kind))
+        keys.sort()
+        self.keys = keys
+        self.weights = self._load_weights()
+
+    def _update_symbols(self, symbol_ids):
+        """Replace the keys of changed symbols in the sorted array"""
+        if not symbol_ids:
+            return
+        for symbol_id in symbol_ids:
+            for entry_id in self.by_symbol.pop(symbol_id, []):
+                text = self.entries.pop(entry_id)[0]
+                for key, at_start in self._word_starts(text):
+                    position = bisect.bisect_left(self.keys, (key, entry_id, at_start))
+                    if position < len(self.keys) and self.keys[position] == (key, entry_id, at_start):
+                        del self.keys[position]
+
+        rows = db.session.execute(
+            db.select(Symbol.id, Symbol.name).where(Symbol.id.in_(list(symbol_ids)))
+        ).all()
+        for symbol_id, name in rows:
+            for key in self._symbol_keys(symbol_id, name):
+                bisect.insort(self.keys, key)
+
+    def _symbol_keys(self, symbol_id, name):
+        """Register the name and aliases of one symbol and return their keys"""
+        keys = list(self._entry_keys(name, 'symbol', symbol_id, name))
+        seen = {normalize_key(name)}
+        for alias in name_variations(name.lower()):
+            if normalize_key(alias) not in seen:
+                seen.add(normalize_key(alias))
+                keys.extend(self._entry_keys(alias, 'alias', symbol_id, name))
+        return keys
+
+    def _entry_keys(self, text, kind, symbol_id=None, symbol_name=None):
+        entry_id = self.next_entry
+        self.next_entry += 1
+        self.entries[entry_id] = (text, kind, symbol_id, symbol_name)
+        if symbol_id is not None:
+            self.by_symbol.setdefault(symbol_id, []).append(entry_id)
+        return [(key, entry_id, at_start) for key, at_start in self._word_starts(text)]
+
+    @staticmethod
+    def _word_starts(text):
+        """(key, starts text?) for the full normalized text and each later word start"""
+        words = normalize_key(text).split(' ')
+        return [(' '.join(words[i:]), i == 0) for i in range(len(words)) if words[i]]
+
+    @staticmethod
+    def _load_weights():
+        """Connection degree per symbol and symbol counts per tradition and element"""
+        weights = {}
+        for column in (Connection.source_id, Connection.target_id):
+            for symbol_id, count in db.session.execute(
+                    db.select(column, db.func.count()).group_by(column)).all():
+                for kind in ('symbol', 'alias'):
+                    weights[(kind, symbol_id)] = weights.get((kind, symbol_id), 0) + count
+
+        for tradition, count in db.session.execute(
+                db.select(Symbol.tradition, db.func.count()).group_by(Symbol.tradition)).all():
+            for name in split_traditions(tradition):
+                weights[('tradition', name)] = weights.get(('tradition', name), 0) + count
+
+        for name, count in db.session.execute(
+                db.select(Element.name, db.func.count())
+                .join(symbol_element_association, symbol_element_association.c.element_id == Element.id)
+                .group_by(Element.name)).all():
+            weights[('element', name)] = count
+        return weights
+
+
+# Process-wide index shared by the suggest endpoint
+prefix_index = PrefixIndex()
@@ -0,0 +1,340 @@
+import argparse
+import inspect
+import io
+import json
+import os
+import re
+import tempfile
+from rich.console import Console
+from sqlalchemy import event
+from sqlalchemy.schema import CreateIndex, DropIndex
+from models.database import Connection, Symbol, db
+from services.cache import dataset_cache
+from services.graph_export import export_graph
+
+# Snapshot of every captured plan, committed so plan changes show up in review
+SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'query_plans.json')
+
+# Tables that grow with the dataset; scanning one in an index-driven query is a regression
+LARGE_TABLES = frozenset({
+    'symbol', 'connection', 'symbol_element', 'symbol_visual_term', 'element_correspondence',
+    'tradition_reference', 'time_period_symbol', 'similar_symbol', 'symbol_text_digest', 'suggested_connection'
+})
+
+# SQLite reports full scans as 'SCAN <table or alias>'; virtual (FTS5) tables search their own index
+SCAN_PATTERN = re.compile(r'^SCAN (\w+)\b(?! VIRTUAL TABLE)')
+
+
+class StatementRecorder:
+    """Context manager collecting the statements an engine executes
+
+    Only statements that read rows (SELECT/WITH, UPDATE, DELETE and
+    INSERT ... SELECT) are kept; each distinct SQL text is recorded once
+    with the parameters of its first execution.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = {}
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        head = statement.lstrip().upper()
+        if executemany or head.startswith('EXPLAIN'):
+            return
+        if head.startswith(('SELECT', 'WITH', 'UPDATE', 'DELETE')) or \
+                (head.startswith('INSERT') and ' SELECT ' in head):
+            self.statements.setdefault(' '.join(statement.split()), parameters)
+
+
+def explain(statement, parameters):
+    """EXPLAIN QUERY PLAN of a statement as indented detail lines"""
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def full_scans(plan):
+    """Large tables (or their aliases) that a plan scans in full"""
+    scanned = set()
+    for line in plan:
+        match = SCAN_PATTERN.match(line.strip())
+        if match:
+            table = re.sub(r'_\d+$', '', match.group(1))
+            if table in LARGE_TABLES:
+                scanned.add(table)
+    return scanned
+
+
+# Calls made for each public service method: (service, method, args, kwargs, index_driven).
+# check-plans fails for a public method without an entry, so new queries cannot skip it.
+# Whole-dataset aggregates and LIKE filters are not index-driven and are only snapshotted.
+SERVICE_CASES = [
+    ("symbol", "get_all_symbols", (), {}, False),
+    ("symbol", "get_symbol_by_id", (1,), {}, True),
+    ("symbol", "get_connections", (), {}, False),
+    ("symbol", "get_network_data", (), {}, False),
+    ("symbol", "get_network_data", (), {"sample": 10}, False),
+    ("symbol", "get_timeline_data", (), {}, False),
+    ("symbol", "get_binned_timeline", (), {"start": -1000, "end": 1000, "bins": 10}, False),
+    ("symbol", "get_connected_symbols", (1,), {}, True),
+    ("symbol", "search", ("pentagram",), {}, True),
+    ("symbol", "fuzzy_search", ("pentagramm",), {}, False),
+    ("symbol", "suggest", ("pe",), {}, True),
+    ("symbol", "faceted_search", ("cross",), {"filters": {"tradition": ["Christian"]}}, True),
+    ("symbol", "find_by_visual_terms", (["circle", "star"],), {}, True),
+    ("symbol", "get_visual_term_frequencies", ("ci",), {}, True),
+    ("tradition", "get_all_traditions", (), {}, False),
+    ("tradition", "get_tradition_by_name", ("Egyptian",), {}, True),
+    ("tradition", "get_timeline_data", (), {}, False),
+    ("tradition", "get_tradition_symbols", ("Egyptian",), {}, False),
+    ("tradition", "get_core_concepts", ("Egyptian",), {}, True),
+    ("tradition", "get_key_figures", ("Egyptian",), {}, True),
+    ("tradition", "get_traditions_by_reference", ("figure", "Hermes Trismegistus"), {}, True),
+    ("tradition", "get_shared_references", ("concept",), {}, False),
+    ("tradition", "get_similar_traditions", ("Egyptian",), {}, True),
+    ("tradition", "get_active_traditions", (5,), {}, False),
+    ("tradition", "get_overlapping_traditions", ("Egyptian",), {}, False),
+    ("tradition", "get_concurrent_matrix", (), {}, False),
+    ("analysis", "get_element_distribution", (), {}, False),
+    ("analysis", "get_tradition_symbol_frequency", (), {}, False),
+    ("analysis", "get_geographic_distribution", (), {}, False),
+    ("analysis", "get_element_by_name", ("Protection",), {}, True),
+    ("analysis", "get_tradition_influence", (), {}, False),
+    ("analysis", "get_tradition_influence", (), {"weight_by_strength": True, "use_centrality": True}, False),
+    ("analysis", "get_symbol_categories", (), {}, False),
+    ("analysis", "get_regional_influence", (), {}, False),
+    ("analysis", "get_tradition_transitions", (), {}, False),
+    ("analysis", "get_cube", (["tradition"],), {"filters": ["century:-5..5"]}, False),
+    ("analysis", "get_correspondence_matches", ("colors", "purple"), {}, True),
+    ("graph", "get_components", (), {}, False),
+    ("graph", "get_bridges", (), {}, False),
+    ("graph", "get_tradition_matrix", (), {}, False),
+    ("time_period", "get_time_periods", (), {}, False),
+    ("time_period", "get_period_symbols", ("Classical (0-500 CE)",), {}, True),
+    ("query", "execute", ({"symbols": {"ids": [1, 2], "connections": {"fields": ["strength"]},
+                                       "elements": {}, "traditions": {}}},), {}, True),
+    ("similarity", "get_similar", (1,), {}, True),
+    # Writers last: they change the data the read cases above are checked against
+    ("similarity", "compute", (), {"full": True}, False),
+    ("link_prediction", "score_candidates", (), {}, False),
+    ("link_prediction", "generate_suggestions", (), {}, False),
+]
+
+
+def plan_services():
+    """Service instances checked by the plan harness, by short name"""
+    from routes.api_routes import analysis_service, graph_service, query_service, similarity_service, \
+        symbol_service, time_period_service, tradition_service
+    from services.link_prediction_service import LinkPredictionService
+    return {
+        "symbol": symbol_service,
+        "tradition": tradition_service,
+        "analysis": analysis_service,
+        "graph": graph_service,
+        "time_period": time_period_service,
+        "query": query_service,
+        "similarity": similarity_service,
+        "link_prediction": LinkPredictionService()
+    }
+
+
+def uncovered_methods(services=None):
+    """Public service methods that no SERVICE_CASES entry calls"""
+    covered = {(service, method) for service, method, _, _, _ in SERVICE_CASES}
+    return sorted(
+        f"{name}.{method}"
+        for name, service in (services or plan_services()).items()
+        for method, _ in inspect.getmembers(type(service), inspect.isfunction)
+        if not method.startswith('_') and (name, method) not in covered
+    )
+
+
+def plan_cases():
+    """(name, callable, index_driven) for the queries issued by the services and CLI tools"""
+    services = plan_services()
+    cases = []
+    for service, method, args, kwargs, index_driven in SERVICE_CASES:
+        name = f"{service}.{method}"
+        if kwargs:
+            name += '(' + ', '.join(f"{k}={v!r}" for k, v in kwargs.items()) + ')'
+        call = getattr(services[service], method)
+        cases.append((name, lambda call=call, args=args, kwargs=kwargs: _consume(call(*args, **kwargs)),
+                      index_driven))
+
+    cases += [
+        ("graph_export.export_graph", lambda: _consume(export_graph('csv')), False),
+        ("db_manager.connection_between", lambda: Connection.between(1, 2), True),
+        ("db_manager.list_symbols", lambda: _cli('list_symbols', tradition="Egyptian", element="Protection",
+                                                 period="1 CE"), False),
+        ("db_manager.list_traditions", lambda: _cli('list_traditions'), False),
+        ("db_manager.list_connections", lambda: _cli('list_connections'), False),
+        ("db_manager.stats", lambda: _cli('stats'), False),
+        ("db_manager.export_data", lambda: _with_json_file(None, lambda path: _cli('export_data', file=path)), False),
+        ("db_manager.prune_orphans", lambda: _cli('prune_orphans'), False),
+        ("db_sync.synchronize", lambda: _with_json_file(_sync_sample(), _synchronize), True),
+        ("db_manager.import_data", lambda: _with_json_file(_import_sample(), _import), True),
+        ("db_manager.reindex", lambda: _cli('reindex'), False),
+        ("db_manager.migrate", lambda: _cli('migrate'), False),
+        ("db_manager.delete_tradition", lambda: _cli('delete_tradition', name="Plan Check Tradition"), True),
+        ("db_manager.delete_symbol", lambda: _cli('delete_symbol', id=9001), True)
+    ]
+    return cases
+
+
+class _Confirm:
+    """Stand-in for rich's Confirm that accepts every prompt"""
+
+    @staticmethod
+    def ask(*args, **kwargs):
+        return True
+
+
+def _cli(command, **options):
+    """Run a db_manager command non-interactively, discarding its console output"""
+    import db_manager
+    console, confirm = db_manager.console, db_manager.Confirm
+    db_manager.console, db_manager.Confirm = Console(file=io.StringIO()), _Confirm
+    try:
+        getattr(db_manager, command)(argparse.Namespace(**options))
+    finally:
+        db_manager.console, db_manager.Confirm = console, confirm
+
+
+def _consume(result):
+    """Drain generators (streamed exports) so their queries run"""
+    if inspect.isgenerator(result):
+        for _ in result:
+            pass
+    return result
+
+
+def _with_json_file(data, run):
+    """Call run(path) with a temporary JSON file holding data (empty if data is None)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        if data is not None:
+            json.dump(data, f)
+    try:
+        run(f.name)
+    finally:
+        os.remove(f.name)
+
+
+def _sync_sample():
+    symbol = Symbol.query.get(1)
+    return {
+        "symbols": [dict(symbol.to_dict(), description="Updated by the plan check", century_origin=-29),
+                    {"id": 9001, "name": "Plan Check Sigil", "tradition": "Modern Occult",
+                     "century_origin": 21, "description": "", "usage": "", "visual_elements": []}],
+        "traditions": [{"name": "Egyptian", "region": "North Africa"}],
+        "connections": [{"source": 2, "target": 1, "strength": 0.5}, {"source": 9001, "target": 16}]
+    }
+
+
+def _import_sample():
+    return {
+        "symbols": [{"id": 9002, "name": "Plan Check Seal", "tradition": "Plan Check Tradition",
+                     "century_origin": 3, "description": "", "usage": "", "visual_elements": ["circle"]}],
+        "traditions": [{"name": "Plan Check Tradition", "start_century": 1, "end_century": 5,
+                        "key_figures": ["Plan Checker"]}],
+        "connections": [{"source": 9002, "target": 9001, "strength": 0.3}, {"source": 1, "target": 2}]
+    }
+
+
+def _import(path):
+    _cli('import_data', file=path, mode="merge")
+
+
+def _synchronize(path):
+    from db_sync import synchronize_db_with_json
+    synchronize_db_with_json(path, app=_current_app())
+
+
+def _current_app():
+    from flask import current_app
+    return current_app._get_current_object()
+
+
+def order_indexes():
+    """Recreate every declared index in name order
+
+    create_all emits a table's indexes in set order, which changes between
+    runs, and SQLite picks between equally good indexes by schema order.
+    Only for the throwaway plan database: a fixed order keeps snapshots stable.
+    """
+    connection = db.session.connection()
+    for table in db.metadata.sorted_tables:
+        indexes = sorted(table.indexes, key=lambda ix: ix.name)
+        for index in indexes:
+            connection.execute(DropIndex(index, if_exists=True))
+        for index in indexes:
+            connection.execute(CreateIndex(index))
+    db.session.commit()
+
+
+def capture_plans(cases=None):
+    """Run each case on the current app's database and return its statements with their plans
+
+    Returns:
+        {case name: {"index_driven": bool, "queries": [{"sql", "plan", "scans"}]}}
+    """
+    from services.facet_index import facet_index
+    from services.minhash import tradition_similarity_index
+    from services.prefix_index import prefix_index
+
+    # Build the in-memory indexes up front so their one-off loads are not attributed to a case
+    for index in (facet_index, prefix_index, tradition_similarity_index):
+        index.sync()
+
+    captured = {}
+    for name, run, index_driven in cases or plan_cases():
+        dataset_cache.clear()
+        with StatementRecorder(db.engine) as recorder:
+            run()
+        queries = []
+        for statement, parameters in recorder.statements.items():
+            plan = explain(statement, parameters)
+            queries.append({"sql": statement, "plan": plan, "scans": sorted(full_scans(plan))})
+        captured[name] = {"index_driven": index_driven, "queries": queries}
+    db.session.rollback()
+    return captured
+
+
+def check_plans(captured, snapshot, uncovered=()):
+    """Compare captured plans against a snapshot
+
+    Returns:
+        (failures, changed): (case, message) for every index-driven query that
+        scans a large table and every uncovered public service method, and
+        names of cases whose plans differ from the snapshot
+    """
+    failures = [(name, f"index-driven query scans '{table}': {query['sql']}")
+                for name, case in captured.items() if case["index_driven"]
+                for query in case["queries"] for table in query["scans"]]
+    failures += [(method, "public service method has no SERVICE_CASES entry in services/query_plans.py")
+                 for method in uncovered]
+    changed = sorted(name for name in set(captured) | set(snapshot) if captured.get(name) != snapshot.get(name))
+    return failures, changed
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_snapshot(captured, path=SNAPSHOT_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(captured, f, indent=2, ensure_ascii=False)
+        f.write('\n')
@@ -0,0 +1,278 @@
+import json
+from models.database import Connection, Element, Symbol, Tradition, symbol_element_association, db
+from services.graph_service import split_traditions
+
+# Deepest relation nesting accepted in a query spec
+MAX_DEPTH = 4
+
+# Fields and relations of every entity type; a relation maps to its target type
+SCHEMA = {
+    'symbol': {
+        'fields': ('id', 'name', 'tradition', 'century_origin', 'description', 'usage', 'visual_elements'),
+        'relations': {'connections': 'connection', 'elements': 'element', 'traditions': 'tradition'}
+    },
+    'connection': {
+        'fields': ('id', 'source', 'target', 'strength', 'description'),
+        'relations': {'neighbor': 'symbol', 'source_symbol': 'symbol', 'target_symbol': 'symbol'}
+    },
+    'tradition': {
+        'fields': ('name', 'region', 'start_century', 'end_century', 'major_texts', 'key_figures', 'core_concepts'),
+        'relations': {'symbols': 'symbol'}
+    },
+    'element': {
+        'fields': ('name', 'description', 'correspondences'),
+        'relations': {'symbols': 'symbol'}
+    }
+}
+
+# Relations that resolve to a single object rather than a list
+SINGLE_RELATIONS = {'neighbor', 'source_symbol', 'target_symbol'}
+
+# Root collections of a query and the entity type they return
+ROOTS = {'symbols': 'symbol', 'traditions': 'tradition', 'elements': 'element'}
+
+# Columns stored as JSON strings and decoded in the response
+JSON_FIELDS = {'visual_elements', 'major_texts', 'key_figures', 'core_concepts', 'correspondences'}
+
+
+class BatchLoader:
+    """Per-request loader that coalesces key lookups into one batch fetch
+
+    ``fetch(keys)`` returns a dict for the keys it found. Results are cached
+    for the rest of the request, so a key is fetched at most once.
+    """
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.cache = {}
+
+    def load_many(self, keys):
+        missing = [key for key in dict.fromkeys(keys) if key not in self.cache]
+        if missing:
+            found = self.fetch(missing)
+            for key in missing:
+                self.cache[key] = found.get(key)
+        return {key: self.cache[key] for key in keys}
+
+    def prime(self, key, value):
+        self.cache.setdefault(key, value)
+
+
+class QueryService:
+    """Resolve nested JSON query specs over symbols, connections, traditions and elements
+
+    A spec names one root collection and a nested selection, e.g.::
+
+        {"symbols": {"ids": [1], "fields": ["name"],
+                     "connections": {"fields": ["strength"],
+                                     "neighbor": {"fields": ["name"],
+                                                  "traditions": {"fields": ["region"]}}}}}
+
+    Selections are resolved breadth-first: all rows reaching a selection are
+    expanded together through batch loaders, so every relation in the spec
+    costs one IN query no matter how many rows flow through it.
+    """
+
+    def execute(self, spec):
+        """Resolve a query spec and return {root: [objects]}
+
+        Raises:
+            ValueError: if the spec is malformed or too deep
+        """
+        if not isinstance(spec, dict) or len(spec) != 1 or next(iter(spec)) not in ROOTS:
+            raise ValueError(f"Query must have exactly one root: {', '.join(ROOTS)}")
+        root, selection = next(iter(spec.items()))
+        if not isinstance(selection, dict):
+            raise ValueError(f"Selection of '{root}' must be an object")
+        kind = ROOTS[root]
+        self._validate(kind, selection, root, 1)
+
+        loaders = self._loaders()
+        rows = self._root_rows(kind, selection, loaders)
+        results = [self._project(kind, row, selection) for row in rows]
+
+        # Each frontier item: (type, selection, [(row, output object)])
+        frontier = [(kind, selection, list(zip(rows, results)))]
+        while frontier:
+            next_frontier = []
+            for kind, selection, pairs in frontier:
+                for relation, child_kind in SCHEMA[kind]['relations'].items():
+                    if relation not in selection or not pairs:
+                        continue
+                    child_selection = selection[relation]
+                    children = self._resolve(kind, relation, [row for row, _ in pairs], loaders)
+                    child_pairs = []
+                    for (row, output), child_rows in zip(pairs, children):
+                        if relation in SINGLE_RELATIONS:
+                            child = child_rows[0] if child_rows else None
+                            output[relation] = self._project(child_kind, child, child_selection) if child else None
+                            if child:
+                                child_pairs.append((child, output[relation]))
+                        else:
+                            output[relation] = [self._project(child_kind, c, child_selection) for c in child_rows]
+                            child_pairs.extend(zip(child_rows, output[relation]))
+                    next_frontier.append((child_kind, child_selection, child_pairs))
+            frontier = next_frontier
+
+        return {root: results}
+
+    def _validate(self, kind, selection, path, depth):
+        if depth > MAX_DEPTH:
+            raise ValueError(f"Query is nested deeper than {MAX_DEPTH} levels at '{path}'")
+        allowed = {'fields'} | set(SCHEMA[kind]['relations'])
+        if depth == 1:
+            allowed |= {'ids', 'names'}
+        unknown = set(selection) - allowed
+        if unknown:
+            raise ValueError(f"Unknown keys at '{path}': {', '.join(sorted(unknown))}")
+        if 'ids' in selection and not (isinstance(selection['ids'], list) and all(
+                isinstance(i, int) and not isinstance(i, bool) for i in selection['ids'])):
+            raise ValueError(f"'ids' at '{path}' must be a list of integers")
+        if 'names' in selection and not (isinstance(selection['names'], list) and all(
+                isinstance(n, str) for n in selection['names'])):
+            raise ValueError(f"'names' at '{path}' must be a list of strings")
+        fields = selection.get('fields', [])
+        if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields) or \
+                set(fields) - set(SCHEMA[kind]['fields']):
+            raise ValueError(f"Invalid fields at '{path}'; allowed: {', '.join(SCHEMA[kind]['fields'])}")
+        for relation, child_kind in SCHEMA[kind]['relations'].items():
+            if relation in selection:
+                if not isinstance(selection[relation], dict):
+                    raise ValueError(f"Selection of '{path}.{relation}' must be an object")
+                self._validate(child_kind, selection[relation], f"{path}.{relation}", depth + 1)
+
+    def _project(self, kind, row, selection):
+        """Pick the selected fields of a row (all fields if none were selected)"""
+        fields = selection.get('fields') or SCHEMA[kind]['fields']
+        output = {}
+        for field in fields:
+            value = row.get(field)
+            if field in JSON_FIELDS:
+                value = json.loads(value) if value else ([] if field != 'correspondences' else {})
+            output[field] = value
+        return output
+
+    def _root_rows(self, kind, selection, loaders):
+        ids, names = selection.get('ids'), selection.get('names')
+        if kind == 'symbol':
+            if ids is not None:
+                found = loaders['symbol'].load_many(ids)
+                return [row for row in found.values() if row]
+            query = db.select(*Symbol.__table__.columns)
+            if names is not None:
+                query = query.where(Symbol.name.in_(names))
+            rows = self._rows(query.order_by(Symbol.id))
+            for row in rows:
+                loaders['symbol'].prime(row['id'], row)
+            return rows
+
+        model = Tradition if kind == 'tradition' else Element
+        query = db.select(*model.__table__.columns)
+        if ids is not None:
+            query = query.where(model.id.in_(ids))
+        if names is not None:
+            query = query.where(model.name.in_(names))
+        return self._rows(query.order_by(model.name))
+
+    def _resolve(self, kind, relation, rows, loaders):
+        """Related rows for each parent row, loaded in one batch"""
+        if kind == 'symbol' and relation == 'connections':
+            found = loaders['connections'].load_many([row['id'] for row in rows])
+            return [[dict(c, _from=row['id']) for c in found[row['id']] or []] for row in rows]
+        if kind == 'symbol' and relation == 'elements':
+            found = loaders['elements'].load_many([row['id'] for row in rows])
+            return [found[row['id']] or [] for row in rows]
+        if kind == 'symbol' and relation == 'traditions':
+            names = [split_traditions(row['tradition']) for row in rows]
+            found = loaders['tradition'].load_many([n for row_names in names for n in row_names])
+            return [[found[n] for n in row_names if found[n]] for row_names in names]
+        if kind == 'connection':
+            if relation == 'neighbor':
+                keys = [row['target'] if row.get('_from') == row['source'] else row['source'] for row in rows]
+            else:
+                keys = [row['source'] if relation == 'source_symbol' else row['target'] for row in rows]
+            found = loaders['symbol'].load_many(keys)
+            return [[found[key]] if found[key] else [] for key in keys]
+        if kind == 'tradition':
+            found = loaders['tradition_symbols'].load_many([row['name'] for row in rows])
+            symbols = [found[row['name']] or [] for row in rows]
+        else:
+            found = loaders['element_symbols'].load_many([row['id'] for row in rows])
+            symbols = [found[row['id']] or [] for row in rows]
+        for row_symbols in symbols:
+            for symbol in row_symbols:
+                loaders['symbol'].prime(symbol['id'], symbol)
+        return symbols
+
+    def _loaders(self):
+        return {
+            'symbol': BatchLoader(self._fetch_symbols),
+            'connections': BatchLoader(self._fetch_connections),
+            'elements': BatchLoader(self._fetch_symbol_elements),
+            'tradition': BatchLoader(self._fetch_traditions),
+            'tradition_symbols': BatchLoader(self._fetch_tradition_symbols),
+            'element_symbols': BatchLoader(self._fetch_element_symbols)
+        }
+
+    @staticmethod
+    def _rows(query):
+        return [dict(row) for row in db.session.execute(query).mappings()]
+
+    def _fetch_symbols(self, ids):
+        rows = self._rows(db.select(*Symbol.__table__.columns).where(Symbol.id.in_(ids)))
+        return {row['id']: row for row in rows}
+
+    def _fetch_connections(self, symbol_ids):
+        rows = self._rows(
+            db.select(Connection.id, Connection.source_id.label('source'), Connection.target_id.label('target'),
+                      Connection.strength, Connection.description)
+            .where(db.or_(Connection.source_id.in_(symbol_ids), Connection.target_id.in_(symbol_ids)))
+            .order_by(Connection.id)
+        )
+        wanted = set(symbol_ids)
+        by_symbol = {}
+        for row in rows:
+            for end in {row['source'], row['target']} & wanted:
+                by_symbol.setdefault(end, []).append(row)
+        return by_symbol
+
+    def _fetch_symbol_elements(self, symbol_ids):
+        rows = self._rows(
+            db.select(symbol_element_association.c.symbol_id.label('_symbol_id'), *Element.__table__.columns)
+            .join(Element, Element.id == symbol_element_association.c.element_id)
+            .where(symbol_element_association.c.symbol_id.in_(symbol_ids))
+            .order_by(Element.name)
+        )
+        by_symbol = {}
+        for row in rows:
+            by_symbol.setdefault(row.pop('_symbol_id'), []).append(row)
+        return by_symbol
+
+    def _fetch_traditions(self, names):
+        rows = self._rows(db.select(*Tradition.__table__.columns).where(Tradition.name.in_(names)))
+        return {row['name']: row for row in rows}
+
+    def _fetch_tradition_symbols(self, names):
+        conditions = []
+        for name in names:
+            conditions += [Symbol.tradition == name, Symbol.tradition.like(f"{name}/%"),
+                           Symbol.tradition.like(f"%/{name}"), Symbol.tradition.like(f"%/{name}/%")]
+        rows = self._rows(db.select(*Symbol.__table__.columns).where(db.or_(*conditions)).order_by(Symbol.id))
+        wanted = set(names)
+        by_name = {}
+        for row in rows:
+            for name in set(split_traditions(row['tradition'])) & wanted:
+                by_name.setdefault(name, []).append(row)
+        return by_name
+
+    def _fetch_element_symbols(self, element_ids):
+        rows = self._rows(
+            db.select(symbol_element_association.c.element_id.label('_element_id'), *Symbol.__table__.columns)
+            .join(Symbol, Symbol.id == symbol_element_association.c.symbol_id)
+            .where(symbol_element_association.c.element_id.in_(element_ids))
+            .order_by(Symbol.id)
+        )
+        by_element = {}
+        for row in rows:
+            by_element.setdefault(row.pop('_element_id'), []).append(row)
+        return by_element
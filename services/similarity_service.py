@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import re
+import numpy as np
+from scipy import sparse
+from models.database import SimilarSymbol, Symbol, SymbolTextDigest, db
+from services.indexing import ensure_table
+
+logger = logging.getLogger('similarity')
+
+# Words too common in symbol descriptions to say anything about similarity
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from in into is it its of on or that the their
+    this to was were with used use symbol symbols represents representing often
+""".split())
+
+
+def tokenize(text):
+    """Lower-case word tokens of at least three letters, without stop words"""
+    return [word for word in re.findall(r'[a-z]+', (text or '').lower())
+            if len(word) > 2 and word not in STOP_WORDS]
+
+
+def symbol_text(description, usage, visual_elements):
+    """Text a symbol is compared on: description, usage and visual elements"""
+    elements = json.loads(visual_elements) if visual_elements else []
+    return ' '.join([description or '', usage or '', ' '.join(elements)])
+
+
+class SimilarityService:
+    """Batch job that stores the top-k TF-IDF cosine neighbors of every symbol
+
+    Texts are vectorized with sublinear term frequency and smoothed IDF and
+    L2-normalized, so cosine similarity is a sparse dot product. Neighbors are
+    found one block of rows at a time (``X[block] @ X.T``), keeping memory
+    bounded by ``block_size`` rather than N x N.
+
+    Incremental runs compare a digest of each symbol's text with the digest
+    stored at the last run and only recompute the neighbor lists of changed
+    symbols, of symbols whose list points at a changed or deleted symbol, and
+    of symbols a changed symbol now ranks into. Unchanged pairs keep their
+    stored scores, so IDF drift is only picked up by a full run.
+    """
+
+    def __init__(self, top_k=10, block_size=512):
+        self.top_k = top_k
+        self.block_size = block_size
+
+    def get_similar(self, symbol_id, limit=10):
+        """Get stored neighbors of a symbol, most similar first"""
+        ensure_table(SimilarSymbol)
+        rows = db.session.execute(
+            db.select(Symbol, SimilarSymbol.score)
+            .join(SimilarSymbol, SimilarSymbol.neighbor_id == Symbol.id)
+            .where(SimilarSymbol.symbol_id == symbol_id)
+            .order_by(SimilarSymbol.score.desc(), Symbol.id)
+            .limit(limit)
+        ).all()
+        return [{"id": symbol.id, "name": symbol.name, "tradition": symbol.tradition,
+                 "score": round(score, 4)} for symbol, score in rows]
+
+    def compute(self, full=False):
+        """Recompute neighbor lists (all of them, or only those affected by text changes)
+
+        Returns:
+            Number of symbols whose neighbor lists were recomputed
+        """
+        ensure_table(SimilarSymbol)
+        ensure_table(SymbolTextDigest)
+
+        rows = db.session.execute(
+            db.select(Symbol.id, Symbol.description, Symbol.usage, Symbol.visual_elements).order_by(Symbol.id)
+        ).all()
+        symbol_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        texts = [symbol_text(*row[1:]) for row in rows]
+        digests = {int(i): hashlib.sha1(text.encode('utf-8')).hexdigest() for i, text in zip(symbol_ids, texts)}
+        stored = dict(db.session.execute(db.select(SymbolTextDigest.symbol_id, SymbolTextDigest.digest)).all())
+
+        removed = set(stored) - set(digests)
+        matrix = self._tfidf_matrix(texts)
+        if full or not stored:
+            positions = np.arange(len(symbol_ids))
+        else:
+            changed = {i for i, digest in digests.items() if stored.get(i) != digest}
+            if not changed and not removed:
+                return 0
+            positions = self._affected_positions(matrix, symbol_ids, changed, removed)
+
+        neighbors = self._neighbors(matrix, positions)
+        recomputed = [int(symbol_ids[p]) for p in positions]
+
+        for start in range(0, len(recomputed), 500):
+            chunk = recomputed[start:start + 500]
+            SimilarSymbol.query.filter(SimilarSymbol.symbol_id.in_(chunk)).delete(synchronize_session=False)
+        if removed:
+            SimilarSymbol.query.filter(db.or_(SimilarSymbol.symbol_id.in_(list(removed)),
+                                              SimilarSymbol.neighbor_id.in_(list(removed)))) \
+                .delete(synchronize_session=False)
+
+        new_rows = [{"symbol_id": int(symbol_ids[p]), "neighbor_id": int(symbol_ids[q]), "score": score}
+                    for p, row in zip(positions, neighbors) for q, score in row]
+        if new_rows:
+            db.session.execute(db.insert(SimilarSymbol), new_rows)
+
+        SymbolTextDigest.query.delete()
+        if digests:
+            db.session.execute(db.insert(SymbolTextDigest),
+                               [{"symbol_id": i, "digest": d} for i, d in digests.items()])
+        db.session.commit()
+
+        logger.info(f"Recomputed similar symbols for {len(recomputed)} of {len(symbol_ids)} symbols")
+        return len(recomputed)
+
+    def _affected_positions(self, matrix, symbol_ids, changed, removed):
+        """Row positions whose neighbor lists may differ after changing/removing some symbols"""
+        id_positions = {int(i): p for p, i in enumerate(symbol_ids)}
+        affected = {id_positions[i] for i in changed if i in id_positions}
+
+        # Lists that currently point at a changed or deleted symbol
+        stale = list(changed | removed)
+        owners = db.session.execute(
+            db.select(SimilarSymbol.symbol_id).where(SimilarSymbol.neighbor_id.in_(stale)).distinct()
+        ).scalars()
+        affected.update(id_positions[i] for i in owners if i in id_positions)
+
+        # Lists a changed symbol would now enter: its similarity beats the current k-th score
+        thresholds = np.zeros(len(symbol_ids))
+        for symbol_id, lowest, count in db.session.execute(
+                db.select(SimilarSymbol.symbol_id, db.func.min(SimilarSymbol.score), db.func.count())
+                .group_by(SimilarSymbol.symbol_id)).all():
+            if symbol_id in id_positions and count >= self.top_k:
+                thresholds[id_positions[symbol_id]] = lowest
+
+        changed_positions = np.array(sorted(id_positions[i] for i in changed if i in id_positions), dtype=np.int64)
+        for start in range(0, len(changed_positions), self.block_size):
+            block = changed_positions[start:start + self.block_size]
+            best = np.asarray(matrix[block].dot(matrix.T).max(axis=0).todense()).ravel()
+            affected.update(np.nonzero(best > thresholds)[0].tolist())
+
+        return np.array(sorted(affected), dtype=np.int64)
+
+    def _neighbors(self, matrix, positions):
+        """Top-k (position, score) neighbors for each requested row, one block at a time"""
+        result = []
+        for start in range(0, len(positions), self.block_size):
+            block = positions[start:start + self.block_size]
+            scores = matrix[block].dot(matrix.T).tocsr()
+            for offset, row in enumerate(block):
+                cols = scores.indices[scores.indptr[offset]:scores.indptr[offset + 1]]
+                values = scores.data[scores.indptr[offset]:scores.indptr[offset + 1]]
+                keep = (cols != row) & (values > 0)
+                cols, values = cols[keep], values[keep]
+                if len(values) > self.top_k:
+                    top = np.argpartition(-values, self.top_k - 1)[:self.top_k]
+                    cols, values = cols[top], values[top]
+                order = np.lexsort((cols, -values))
+                result.append([(int(cols[i]), float(values[i])) for i in order])
+        return result
+
+    @staticmethod
+    def _tfidf_matrix(texts):
+        """L2-normalized TF-IDF matrix (documents x vocabulary) with sublinear tf"""
+        vocabulary = {}
+        rows, cols, counts = [], [], []
+        for row, text in enumerate(texts):
+            term_counts = {}
+            for word in tokenize(text):
+                term = vocabulary.setdefault(word, len(vocabulary))
+                term_counts[term] = term_counts.get(term, 0) + 1
+            rows.extend([row] * len(term_counts))
+            cols.extend(term_counts.keys())
+            counts.extend(term_counts.values())
+
+        n = len(texts)
+        matrix = sparse.csr_matrix(
+            (1.0 + np.log(np.array(counts, dtype=np.float64)), (rows, cols)),
+            shape=(n, len(vocabulary))
+        )
+        document_frequency = np.bincount(np.array(cols, dtype=np.int64), minlength=len(vocabulary))
+        idf = np.log((1.0 + n) / (1.0 + document_frequency)) + 1.0
+        matrix = matrix.dot(sparse.diags(idf)).tocsr()
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).dot(matrix).tocsr()
@@ -1,4 +1,17 @@
-from models.database import Symbol, Connection, db
+import math
+import random
+import numpy as np
+from models.database import Symbol, Connection, Element, SymbolVisualTerm, symbol_element_association, db
+from services.cache import dataset_cache
+from services.facet_index import facet_index
+from services.fuzzy_index import FuzzyIndex
+from services.fulltext import element_symbol_ids, fulltext_available, like_search_symbols, search_symbols
+from services.indexing import ensure_table, normalize_term
+from services.prefix_index import prefix_index
+from services.graph_service import get_connection_graph, split_traditions
+
+# Default number of ranked results returned by search
+SEARCH_LIMIT = 50
 
 
 class SymbolService:
@@ -20,12 +33,76 @@ class SymbolService:
         connections = Connection.query.all()
         return [connection.to_dict() for connection in connections]
 
-    def get_network_data(self):
-        """Get prepared network visualization data"""
+    def get_network_data(self, sample=None):
+        """Get prepared network visualization data
+
+        With ``sample``, return a representative subgraph of about that many
+        symbols (see _sample_symbol_ids) and the connections among them. Samples
+        are cached per dataset version and size.
+        """
+        if sample is not None:
+            return dataset_cache.get(('network_sample', sample), lambda: self._compute_network_sample(sample))
+
         # Get all symbols and connections
         symbols = Symbol.query.all()
         connections = Connection.query.all()
-
+        return self._network_payload(symbols, connections)
+
+    def _compute_network_sample(self, size):
+        ids = self._sample_symbol_ids(size)
+        symbols = Symbol.query.options(db.selectinload(Symbol.elements)) \
+            .filter(Symbol.id.in_(ids)).order_by(Symbol.id).all()
+        connections = Connection.query.filter(Connection.source_id.in_(ids), Connection.target_id.in_(ids)).all()
+        return self._network_payload(symbols, connections)
+
+    @staticmethod
+    def _sample_symbol_ids(size, seed=0):
+        """Ids of about ``size`` symbols, stratified by primary tradition
+
+        ``size`` is split between primary traditions in proportion to their
+        symbol counts (largest remainder, at least one per tradition while the
+        budget allows). Within each tradition symbols are drawn by weighted
+        reservoir sampling (Efraimidis-Spirakis: key u ** (1 / w), keep the
+        largest keys) with w = 1 + degree + strength sum, so well-connected
+        symbols are favoured without dropping small traditions. Keys for all
+        symbols come from one vectorized pass over the cached connection graph.
+        """
+        graph = get_connection_graph()
+        n = graph.num_nodes
+        if n <= size:
+            return graph.symbol_ids.tolist()
+
+        primaries = [(split_traditions(t) or [''])[0] for t in graph.traditions]
+        strata, codes = np.unique(np.array(primaries, dtype=object), return_inverse=True)
+        counts = np.bincount(codes, minlength=len(strata))
+
+        # Proportional quotas, one per tradition first when there is room for it
+        quotas = np.full(len(strata), 1 if size >= len(strata) else 0, dtype=np.int64)
+        shares = (size - quotas.sum()) * counts / n
+        quotas = np.minimum(counts, quotas + shares.astype(np.int64))
+        # Hand out what is left by largest remainder, in rounds since small strata fill up
+        remainder_order = np.lexsort((np.arange(len(strata)), -(shares - np.floor(shares))))
+        while quotas.sum() < size:
+            for stratum in remainder_order:
+                if quotas.sum() >= size:
+                    break
+                if quotas[stratum] < counts[stratum]:
+                    quotas[stratum] += 1
+
+        weights = 1.0 + np.bincount(graph.sources, minlength=n) + np.bincount(graph.targets, minlength=n) \
+            + np.bincount(graph.sources, weights=graph.strengths, minlength=n) \
+            + np.bincount(graph.targets, weights=graph.strengths, minlength=n)
+        keys = np.random.RandomState(seed).random_sample(n) ** (1.0 / weights)
+
+        # Largest keys first within each stratum, then keep the first quota of each
+        order = np.lexsort((-keys, codes))
+        rank = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts)
+        chosen = order[rank < quotas[codes[order]]]
+        return sorted(graph.symbol_ids[chosen].tolist())
+
+    @staticmethod
+    def _network_payload(symbols, connections):
+        """Nodes (with tradition colors) and links for the network graph"""
         # Create color mapping
         traditions = set()
         for symbol in symbols:
@@ -33,7 +110,6 @@ class SymbolService:
                 traditions.add(tradition.strip())
 
         # Create a color scale for traditions
-        import random
         from colorsys import hsv_to_rgb
 
         def random_color():
@@ -76,28 +152,134 @@ class SymbolService:
         timeline_data = []
 
         for symbol in symbols:
-            century = symbol.century_origin
-            year = century * 100 - 50  # Approximate middle of century
-
-            if century <= 0:
-                year_display = f"{abs(year)} BCE"
-            else:
-                year_display = f"{year} CE"
-
-            timeline_data.append({
-                "id": symbol.id,
-                "name": symbol.name,
-                "tradition": symbol.tradition,
-                "element": ','.join([e.name for e in symbol.elements]),
-                "year": year,
-                "year_display": year_display,
-                "description": symbol.description
-            })
+            timeline_data.append(self._timeline_entry(symbol))
 
         # Sort by year
         timeline_data = sorted(timeline_data, key=lambda x: x["year"])
         return timeline_data
 
+    # Bins holding at most this many symbols also list the symbols themselves
+    TIMELINE_DETAIL_THRESHOLD = 25
+
+    def get_binned_timeline(self, start=None, end=None, bins=20):
+        """Get a level-of-detail symbol timeline between two years
+
+        Each bin carries its symbol count broken down by tradition and element;
+        sparse bins (at or below TIMELINE_DETAIL_THRESHOLD) also list their symbols.
+        """
+        years, ids = self._get_timeline_index()
+        if start is None:
+            start = int(years[0]) if len(years) else 0
+        if end is None:
+            end = int(years[-1]) if len(years) else 0
+        if end < start:
+            start, end = end, start
+        bins = max(1, min(int(bins), 500))
+        width = max((end - start) / bins, 1e-9)
+
+        # Slice the sorted year array for the requested range
+        lo = int(np.searchsorted(years, start, side='left'))
+        hi = int(np.searchsorted(years, end, side='right'))
+        range_years = years[lo:hi]
+        range_ids = ids[lo:hi]
+        bin_index = np.minimum(((range_years - start) / width).astype(np.int64), bins - 1)
+        counts = np.bincount(bin_index, minlength=bins)
+
+        buckets = [
+            {
+                "start": round(start + i * width, 2),
+                "end": round(start + (i + 1) * width, 2),
+                "count": int(counts[i]),
+                "traditions": {},
+                "elements": {}
+            }
+            for i in range(bins)
+        ]
+
+        # Tradition and element breakdowns from grouped queries over the century index
+        first_century = math.ceil((start + 50) / 100)
+        last_century = math.floor((end + 50) / 100)
+
+        tradition_rows = db.session.execute(
+            db.select(Symbol.century_origin, Symbol.tradition, db.func.count())
+            .where(Symbol.century_origin.between(first_century, last_century))
+            .group_by(Symbol.century_origin, Symbol.tradition)
+        ).all()
+        for century, tradition, count in tradition_rows:
+            bucket = buckets[self._bin_for_century(century, start, width, bins)]
+            for name in split_traditions(tradition):
+                bucket["traditions"][name] = bucket["traditions"].get(name, 0) + count
+
+        element_rows = db.session.execute(
+            db.select(Symbol.century_origin, Element.name, db.func.count())
+            .join(symbol_element_association, symbol_element_association.c.symbol_id == Symbol.id)
+            .join(Element, Element.id == symbol_element_association.c.element_id)
+            .where(Symbol.century_origin.between(first_century, last_century))
+            .group_by(Symbol.century_origin, Element.name)
+        ).all()
+        for century, element, count in element_rows:
+            bucket = buckets[self._bin_for_century(century, start, width, bins)]
+            bucket["elements"][element] = bucket["elements"].get(element, 0) + count
+
+        # Individual symbols only for sparse bins, loaded with a single IN query
+        detail_bins = set(np.flatnonzero((counts > 0) & (counts <= self.TIMELINE_DETAIL_THRESHOLD)).tolist())
+        detail_ids = [int(i) for i, b in zip(range_ids.tolist(), bin_index.tolist()) if b in detail_bins]
+        if detail_ids:
+            symbols = Symbol.query.options(db.selectinload(Symbol.elements)) \
+                .filter(Symbol.id.in_(detail_ids)).all()
+            for bucket in buckets:
+                if bucket["count"] and bucket["count"] <= self.TIMELINE_DETAIL_THRESHOLD:
+                    bucket["symbols"] = []
+            for symbol in sorted(symbols, key=lambda x: (x.century_origin, x.id)):
+                entry = self._timeline_entry(symbol)
+                buckets[self._bin_for_century(symbol.century_origin, start, width, bins)]["symbols"].append(entry)
+
+        return {
+            "start": start,
+            "end": end,
+            "bins": bins,
+            "total": int(hi - lo),
+            "buckets": buckets
+        }
+
+    def _get_timeline_index(self):
+        """Sorted (year, symbol id) arrays, cached per dataset version"""
+        def load():
+            rows = db.session.execute(
+                db.select(Symbol.century_origin, Symbol.id).order_by(Symbol.century_origin, Symbol.id)
+            ).all()
+            years = np.array([row[0] * 100 - 50 for row in rows], dtype=np.int64)
+            ids = np.array([row[1] for row in rows], dtype=np.int64)
+            return years, ids
+        return dataset_cache.get(('timeline_index',), load)
+
+    @staticmethod
+    def _bin_for_century(century, start, width, bins):
+        """Bin position of a century's midpoint year"""
+        year = century * 100 - 50
+        return max(0, min(int((year - start) / width), bins - 1))
+
+    @staticmethod
+    def _timeline_entry(symbol):
+        """Timeline representation of a single symbol"""
+        century = symbol.century_origin
+        year = century * 100 - 50  # Approximate middle of century
+
+        if century <= 0:
+            year_display = f"{abs(year)} BCE"
+        else:
+            year_display = f"{year} CE"
+
+        return {
+            "id": symbol.id,
+            "name": symbol.name,
+            "tradition": symbol.tradition,
+            "element": ','.join([e.name for e in symbol.elements]),
+            "year": year,
+            "year_display": year_display,
+            "description": symbol.description
+        }
+
     def get_connected_symbols(self, symbol_id):
         """Get all symbols directly connected to the specified symbol"""
         # Get the symbol
@@ -127,32 +309,196 @@ class SymbolService:
 
         return connected_symbols
 
-    def search(self, query):
-        """Search symbols by name, tradition, element, or description"""
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Search symbols by name, tradition, element, or description
+
+        Text matches come from the FTS5 index ranked by BM25, each with a
+        highlighted snippet; without FTS5 an unranked LIKE scan is used.
+        Symbols matched only through an element name follow the text matches.
+        """
         if not query:
             return []
 
-        query = f"%{query.lower()}%"
+        if fulltext_available():
+            matches = search_symbols(query, limit)
+        else:
+            matches = like_search_symbols(query, limit)
+
+        seen = {symbol_id for symbol_id, _, _ in matches}
+        for symbol_id in element_symbol_ids(query):
+            if len(matches) >= limit:
+                break
+            if symbol_id not in seen:
+                seen.add(symbol_id)
+                matches.append((symbol_id, None, None))
+
+        if not matches:
+            # Nothing matched literally; the query is probably misspelled
+            return self.fuzzy_search(query, limit)
+
+        ids = [symbol_id for symbol_id, _, _ in matches]
+        symbols = Symbol.query.options(db.selectinload(Symbol.elements)) \
+            .filter(Symbol.id.in_(ids)).all() if ids else []
+        by_id = {symbol.id: symbol for symbol in symbols}
+
+        results = []
+        for symbol_id, score, snippet in matches:
+            if symbol_id not in by_id:
+                continue
+            result = by_id[symbol_id].to_dict()
+            result["score"] = round(score, 4) if score is not None else None
+            result["snippet"] = snippet
+            results.append(result)
+        return results
+
+    def fuzzy_search(self, query, limit=SEARCH_LIMIT):
+        """Typo-tolerant search over symbol names, aliases and traditions
+
+        Matching symbols come first, then symbols of matching traditions. Each
+        result carries its trigram similarity as score and the indexed text it
+        matched as snippet.
+        """
+        index = dataset_cache.get(('fuzzy_index',), FuzzyIndex.build)
+        matches = []
+        seen = set()
+        for (kind, ref), similarity, text in index.match(query, limit):
+            if kind == 'symbol':
+                candidates = [ref]
+            else:
+                candidates = facet_index.ids_with('tradition', ref)
+            for symbol_id in candidates:
+                if symbol_id not in seen:
+                    seen.add(symbol_id)
+                    matches.append((symbol_id, similarity, text))
+
+        matches = matches[:limit]
+        ids = [symbol_id for symbol_id, _, _ in matches]
+        symbols = Symbol.query.options(db.selectinload(Symbol.elements)) \
+            .filter(Symbol.id.in_(ids)).all() if ids else []
+        by_id = {symbol.id: symbol for symbol in symbols}
+
+        results = []
+        for symbol_id, similarity, text in matches:
+            if symbol_id in by_id:
+                result = by_id[symbol_id].to_dict()
+                result["score"] = round(similarity, 4)
+                result["snippet"] = text
+                result["fuzzy"] = True
+                results.append(result)
+        return results
+
+    def suggest(self, prefix, limit=10):
+        """Get typeahead suggestions (symbols, aliases, traditions, elements) for a prefix"""
+        return prefix_index.suggest(prefix, limit)
+
+    def faceted_search(self, query=None, filters=None, limit=50):
+        """Search symbols with facet filters and per-facet counts
+
+        Args:
+            query: optional text matched against name, tradition, description and element
+            filters: dict mapping facet (tradition, element, century) to accepted values
+            limit: maximum number of symbol dicts to return
+
+        Returns:
+            Dictionary with total, results (up to limit) and facet counts
+        """
+        candidate_ids = self._match_ids(query) if query else None
+        ids, facets = facet_index.search(candidate_ids, filters)
+
+        page = ids[:limit]
+        symbols = Symbol.query.options(db.selectinload(Symbol.elements)) \
+            .filter(Symbol.id.in_(page)).all() if page else []
+        by_id = {symbol.id: symbol for symbol in symbols}
+
+        return {
+            "query": query or "",
+            "total": len(ids),
+            "results": [by_id[i].to_dict() for i in page if i in by_id],
+            "facets": facets
+        }
 
-        # Search in symbols
-        symbols = Symbol.query.filter(
-            db.or_(
-                db.func.lower(Symbol.name).like(query),
-                db.func.lower(Symbol.tradition).like(query),
-                db.func.lower(Symbol.description).like(query)
-            )
+    def _match_ids(self, query):
+        """Ids of symbols whose text fields or elements match query"""
+        search = search_symbols if fulltext_available() else like_search_symbols
+        ids = {symbol_id for symbol_id, _, _ in search(query)}
+        ids.update(element_symbol_ids(query))
+        return ids
+
+    def find_by_visual_terms(self, terms, op='and'):
+        """Get symbols whose visual elements contain all (op='and') or any (op='or') terms"""
+        terms = [t for t in (normalize_term(term) for term in terms) if t]
+        if not terms:
+            return []
+
+        ensure_table(SymbolVisualTerm)
+        postings = {term: [] for term in terms}
+        rows = db.session.execute(
+            db.select(SymbolVisualTerm.term, SymbolVisualTerm.symbol_id)
+            .where(SymbolVisualTerm.term.in_(terms))
+            .order_by(SymbolVisualTerm.term, SymbolVisualTerm.symbol_id)
         ).all()
+        for term, symbol_id in rows:
+            postings[term].append(symbol_id)
 
-        # Also search in elements
-        element_symbols = []
-        from models.database import Element
-        elements = Element.query.filter(db.func.lower(Element.name).like(query)).all()
-        for element in elements:
-            for symbol in element.symbols:
-                if symbol not in symbols:
-                    element_symbols.append(symbol)
+        # Merge shortest lists first so intersections shrink as early as possible
+        lists = sorted(postings.values(), key=len)
+        merge = self._intersect_sorted if op == 'and' else self._union_sorted
+        ids = lists[0]
+        for other in lists[1:]:
+            ids = merge(ids, other)
 
-        # Combine results
-        all_symbols = symbols + element_symbols
+        if not ids:
+            return []
+        symbols = Symbol.query.options(db.selectinload(Symbol.elements)) \
+            .filter(Symbol.id.in_(ids)).order_by(Symbol.id).all()
+        return [symbol.to_dict() for symbol in symbols]
 
-        return [symbol.to_dict() for symbol in all_symbols]
\ No newline at end of file
+    def get_visual_term_frequencies(self, prefix='', limit=20):
+        """Get visual terms starting with prefix and their symbol counts, most frequent first"""
+        ensure_table(SymbolVisualTerm)
+        query = db.select(SymbolVisualTerm.term, db.func.count().label('count'))
+        prefix = normalize_term(prefix) if prefix else ''
+        if prefix:
+            # Range scan on the term index instead of LIKE
+            query = query.where(SymbolVisualTerm.term >= prefix, SymbolVisualTerm.term < prefix + '\uffff')
+        rows = db.session.execute(
+            query.group_by(SymbolVisualTerm.term)
+            .order_by(db.desc('count'), SymbolVisualTerm.term)
+            .limit(limit)
+        ).all()
+        return [{"term": term, "count": count} for term, count in rows]
+
+    @staticmethod
+    def _intersect_sorted(a, b):
+        """Intersection of two ascending id lists"""
+        result = []
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i] == b[j]:
+                result.append(a[i])
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return result
+
+    @staticmethod
+    def _union_sorted(a, b):
+        """Union of two ascending id lists"""
+        result = []
+        i = j = 0
+        while i < len(a) or j < len(b):
+            if j >= len(b) or (i < len(a) and a[i] < b[j]):
+                value = a[i]
+                i += 1
+            elif i >= len(a) or b[j] < a[i]:
+                value = b[j]
+                j += 1
+            else:
+                value = a[i]
+                i += 1
+                j += 1
+            result.append(value)
+        return result
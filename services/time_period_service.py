@@ -0,0 +1,43 @@
+from models.database import Symbol, TimePeriod, TimePeriodSymbol, db
+from services.cache import dataset_cache
+from services.indexing import ensure_table
+
+
+class TimePeriodService:
+    """Service for time periods and their symbols, answered from the membership index"""
+
+    def get_time_periods(self):
+        """Return all time periods in chronological order with their symbol counts"""
+        return dataset_cache.get(('time_periods',), self._compute_time_periods)
+
+    def get_period_symbols(self, name):
+        """Return the symbols of a time period (matched case-insensitively), or None if unknown"""
+        # Resolve the name first so only existing periods get a cache entry
+        period_id = dataset_cache.get(('time_period_ids',), self._compute_period_ids).get(name.lower())
+        if period_id is None:
+            return None
+        return dataset_cache.get(('time_period_symbols', period_id), lambda: self._compute_period_symbols(period_id))
+
+    def _compute_period_ids(self):
+        """Lower-cased period name -> id (the first period of that name)"""
+        ids = {}
+        for period_id, name in db.session.execute(
+                db.select(TimePeriod.id, TimePeriod.name).order_by(TimePeriod.id)).all():
+            ids.setdefault(name.lower(), period_id)
+        return ids
+
+    def _compute_time_periods(self):
+        ensure_table(TimePeriodSymbol)
+        counts = dict(db.session.execute(
+            db.select(TimePeriodSymbol.period_id, db.func.count()).group_by(TimePeriodSymbol.period_id)
+        ).all())
+        periods = TimePeriod.query.order_by(TimePeriod.start_year, TimePeriod.id).all()
+        return [dict(period.to_dict(), symbol_count=counts.get(period.id, 0)) for period in periods]
+
+    def _compute_period_symbols(self, period_id):
+        ensure_table(TimePeriodSymbol)
+        period = db.session.get(TimePeriod, period_id)
+        symbols = Symbol.query.join(TimePeriodSymbol, TimePeriodSymbol.symbol_id == Symbol.id) \
+            .filter(TimePeriodSymbol.period_id == period.id) \
+            .order_by(Symbol.century_origin, Symbol.id).all()
+        return {"period": period.to_dict(), "symbols": [symbol.to_dict() for symbol in symbols]}
@@ -1,6 +1,9 @@
-from models.database import Tradition, Symbol, db
+from models.database import Tradition, TraditionReference, Symbol, db
 import json
-from models.database import Tradition, Symbol, db
+from services.cache import dataset_cache
+from services.indexing import REFERENCE_FIELDS, ensure_table, normalize_reference
+from services.interval_index import IntervalTree
+from services.minhash import tradition_similarity_index
 
 class TraditionService:
     """Service for handling tradition-related operations"""
@@ -73,4 +76,137 @@ class TraditionService:
         tradition = Tradition.query.filter(db.func.lower(Tradition.name) == tradition_name.lower()).first()
         if tradition and tradition.key_figures:
             return json.loads(tradition.key_figures)
-        return []
\ No newline at end of file
+        return []
+
+    def get_traditions_by_reference(self, kind, value):
+        """Get traditions listing a key figure, major text or core concept
+
+        Args:
+            kind: 'figure', 'text' or 'concept'
+            value: name to look up (case and spacing insensitive)
+        """
+        if kind not in REFERENCE_FIELDS:
+            raise ValueError(f"Unknown reference kind '{kind}'")
+        ensure_table(TraditionReference)
+        rows = db.session.execute(
+            db.select(Tradition, TraditionReference.value)
+            .join(TraditionReference, TraditionReference.tradition_id == Tradition.id)
+            .where(TraditionReference.kind == kind,
+                   TraditionReference.value_norm == normalize_reference(value))
+            .order_by(Tradition.start_century, Tradition.name)
+        ).all()
+        return [{
+            "name": tradition.name,
+            "region": tradition.region,
+            "start_century": tradition.start_century,
+            "end_century": tradition.end_century,
+            "matched": matched
+        } for tradition, matched in rows]
+
+    def get_shared_references(self, kind, min_traditions=2, limit=50):
+        """Get figures, texts or concepts listed by at least min_traditions traditions, most shared first"""
+        if kind not in REFERENCE_FIELDS:
+            raise ValueError(f"Unknown reference kind '{kind}'")
+        ensure_table(TraditionReference)
+        count = db.func.count(db.distinct(TraditionReference.tradition_id))
+        shared = db.session.execute(
+            db.select(TraditionReference.value_norm, db.func.min(TraditionReference.value), count)
+            .where(TraditionReference.kind == kind)
+            .group_by(TraditionReference.value_norm)
+            .having(count >= min_traditions)
+            .order_by(count.desc(), TraditionReference.value_norm)
+            .limit(limit)
+        ).all()
+        if not shared:
+            return []
+
+        names = {}
+        for value_norm, name in db.session.execute(
+                db.select(TraditionReference.value_norm, Tradition.name)
+                .join(Tradition, Tradition.id == TraditionReference.tradition_id)
+                .where(TraditionReference.kind == kind,
+                       TraditionReference.value_norm.in_([row[0] for row in shared]))
+                .order_by(Tradition.name)).all():
+            names.setdefault(value_norm, []).append(name)
+
+        return [{"value": value, "count": n, "traditions": names.get(value_norm, [])}
+                for value_norm, value, n in shared]
+
+    def get_similar_traditions(self, tradition_name, limit=10):
+        """Get traditions with similar concepts, figures, texts and symbol elements, or None if unknown"""
+        return tradition_similarity_index.similar(tradition_name, limit)
+
+    def get_active_traditions(self, century):
+        """Get traditions whose lifespan includes the given century"""
+        index = self._get_interval_index()
+        return sorted(index.at(century), key=lambda x: (x["start_century"], x["name"]))
+
+    def get_overlapping_traditions(self, tradition_name):
+        """Get traditions whose lifespan overlaps the named tradition, or None if unknown"""
+        index = self._get_interval_index()
+        tradition = self._get_lifespans().get(tradition_name.lower())
+        if not tradition:
+            return None
+
+        overlapping = []
+        for other in index.overlapping(tradition["start_century"], tradition["end_century"]):
+            if other["name"] == tradition["name"]:
+                continue
+            overlapping.append(dict(other, overlap_centuries=self._overlap(tradition, other)))
+
+        overlapping.sort(key=lambda x: (-x["overlap_centuries"], x["name"]))
+        return overlapping
+
+    def get_concurrent_matrix(self):
+        """Get pairwise lifespan overlaps between traditions in row/col/value form"""
+        return dataset_cache.get(('tradition_concurrency',), self._compute_concurrent_matrix)
+
+    def _compute_concurrent_matrix(self):
+        index = self._get_interval_index()
+        traditions = sorted(self._get_lifespans().values(), key=lambda x: (x["start_century"], x["name"]))
+        positions = {t["name"]: i for i, t in enumerate(traditions)}
+
+        rows, cols, values = [], [], []
+        for i, tradition in enumerate(traditions):
+            for other in index.overlapping(tradition["start_century"], tradition["end_century"]):
+                j = positions[other["name"]]
+                if j <= i:
+                    continue
+                rows.append(i)
+                cols.append(j)
+                values.append(self._overlap(tradition, other))
+
+        return {
+            "traditions": [t["name"] for t in traditions],
+            "rows": rows,
+            "cols": cols,
+            "overlap_centuries": values
+        }
+
+    def _get_lifespans(self):
+        """Lifespan records keyed by lower-cased tradition name, cached per dataset version"""
+        def load():
+            rows = db.session.execute(
+                db.select(Tradition.name, Tradition.start_century, Tradition.end_century, Tradition.region)
+            ).all()
+            return {
+                row[0].lower(): {
+                    "name": row[0],
+                    "start_century": row[1],
+                    "end_century": row[2],
+                    "region": row[3]
+                }
+                for row in rows
+            }
+        return dataset_cache.get(('tradition_lifespans',), load)
+
+    def _get_interval_index(self):
+        """Interval tree over tradition lifespans, cached per dataset version"""
+        return dataset_cache.get(('tradition_interval_index',), lambda: IntervalTree(
+            (t["start_century"], t["end_century"], t) for t in self._get_lifespans().values()
+        ))
+
+    @staticmethod
+    def _overlap(a, b):
+        """Number of centuries two lifespans share (inclusive)"""
+        return min(a["end_century"], b["end_century"]) - max(a["start_century"], b["start_century"]) + 1
@@ -1,5 +1,78 @@
 // Network graph visualization of symbol connections
 
+// Decode the binary payload of /api/network?format=columnar into {nodes, links}
+// (layout documented in services/network_codec.py)
+function decodeColumnarNetwork(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'SYMN' || view.getUint32(4, true) !== 1) {
+        throw new Error("Unsupported network payload");
+    }
+    const nodeCount = view.getUint32(8, true);
+    const linkCount = view.getUint32(12, true);
+    const elementCount = view.getUint32(16, true);
+    const stringCount = view.getUint32(20, true);
+    const stringBytes = view.getUint32(24, true);
+
+    // Every column is 4-byte aligned, so typed arrays can view the buffer directly
+    let offset = 28;
+    const column = (Type, length) => {
+        const array = new Type(buffer, offset, length);
+        offset += length * 4;
+        return array;
+    };
+    const ids = column(Int32Array, nodeCount);
+    const centuries = column(Int32Array, nodeCount);
+    const names = column(Uint32Array, nodeCount);
+    const descriptions = column(Uint32Array, nodeCount);
+    const traditions = column(Uint32Array, nodeCount);
+    const colors = column(Uint32Array, nodeCount);
+    const elementOffsets = column(Uint32Array, nodeCount + 1);
+    const elementCodes = column(Uint32Array, elementCount);
+    const sources = column(Int32Array, linkCount);
+    const targets = column(Int32Array, linkCount);
+    const strengths = column(Float32Array, linkCount);
+    const linkDescriptions = column(Uint32Array, linkCount);
+    const stringOffsets = column(Uint32Array, stringCount + 1);
+
+    const decoder = new TextDecoder();
+    const data = new Uint8Array(buffer, offset, stringBytes);
+    const strings = new Array(stringCount);
+    for (let i = 0; i < stringCount; i++) {
+        strings[i] = decoder.decode(data.subarray(stringOffsets[i], stringOffsets[i + 1]));
+    }
+
+    const nodes = new Array(nodeCount);
+    for (let i = 0; i < nodeCount; i++) {
+        const elements = [];
+        for (let j = elementOffsets[i]; j < elementOffsets[i + 1]; j++) {
+            elements.push(strings[elementCodes[j]]);
+        }
+        nodes[i] = {
+            id: ids[i],
+            name: strings[names[i]],
+            tradition: strings[traditions[i]],
+            element: elements.join(','),
+            century: centuries[i],
+            color: strings[colors[i]],
+            description: strings[descriptions[i]]
+        };
+    }
+
+    const links = new Array(linkCount);
+    for (let i = 0; i < linkCount; i++) {
+        links[i] = {
+            source: sources[i],
+            target: targets[i],
+            // Float32 storage: round away the float noise (3 decimals)
+            strength: Math.round(strengths[i] * 1000) / 1000,
+            description: strings[linkDescriptions[i]]
+        };
+    }
+
+    return { nodes, links };
+}
+
 function initializeNetworkGraph() {
     console.log("Initializing network graph visualization");
 
@@ -46,12 +119,16 @@ function initializeNetworkGraph() {
         .style('border', '1px solid #8a2be2')
         .style('z-index', '1000');
 
-    // Load data
-    fetch('/api/network')
+    // Load data as compact columnar binary
+    fetch('/api/network?format=columnar')
         .then(response => {
             console.log("Network data response status:", response.status);
-            return response.json();
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.arrayBuffer();
         })
+        .then(decodeColumnarNetwork)
         .then(data => {
             console.log("Network data received", data);
             const nodes = data.nodes;
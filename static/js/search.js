@@ -15,6 +15,36 @@ function initializeSearch() {
         }
     });
 
+    // Typeahead suggestions from the lightweight prefix endpoint
+    const suggestionList = document.getElementById('searchSuggestions');
+    let suggestTimer = null;
+    if (suggestionList) {
+        searchInput.addEventListener('input', function() {
+            clearTimeout(suggestTimer);
+            const prefix = searchInput.value.trim();
+            if (!prefix) {
+                suggestionList.innerHTML = '';
+                return;
+            }
+            suggestTimer = setTimeout(() => {
+                fetch(`/api/suggest?prefix=${encodeURIComponent(prefix)}&limit=8`)
+                    .then(response => response.json())
+                    .then(suggestions => {
+                        suggestionList.innerHTML = '';
+                        suggestions.forEach(suggestion => {
+                            const option = document.createElement('option');
+                            option.value = suggestion.type === 'alias' ? suggestion.symbol : suggestion.text;
+                            option.label = suggestion.type === 'alias'
+                                ? `${suggestion.text} → ${suggestion.symbol}`
+                                : `${suggestion.text} (${suggestion.type})`;
+                            suggestionList.appendChild(option);
+                        });
+                    })
+                    .catch(error => console.error('Error loading suggestions:', error));
+            }, 150);
+        });
+    }
+
     function performSearch() {
         const query = searchInput.value;
         if (!query) return;
@@ -48,6 +78,7 @@ function initializeSearch() {
                         <p>Tradition: ${symbol.tradition}<br>
                         Element: ${symbol.element}<br>
                         Origin: ${centuryText}</p>
+                        ${symbol.snippet ? `<p class="search-snippet">${symbol.snippet}</p>` : ''}
                     `;
 
                     // Click to show details
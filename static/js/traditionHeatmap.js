@@ -1,5 +1,74 @@
 // static/js/traditionHeatmap.js
+// Tradition x tradition connection heatmap
+
 function initializeTraditionHeatmap() {
-  console.log("Tradition heatmap initialization called");
-  // Implementation will come later
-}
\ No newline at end of file
+    console.log("Initializing tradition heatmap visualization");
+
+    const container = document.getElementById('traditionHeatmap');
+    if (!container) {
+        console.error("Tradition heatmap container not found");
+        return;
+    }
+
+    // Fetch sparse tradition matrix (row/col/value form)
+    fetch('/api/analytics/tradition-matrix')
+        .then(response => {
+            console.log("Tradition matrix response status:", response.status);
+            return response.json();
+        })
+        .then(data => {
+            console.log("Tradition matrix data received", data);
+
+            const size = data.traditions.length;
+
+            // Expand the sparse entries into dense grids for Plotly
+            const counts = Array.from({length: size}, () => Array(size).fill(0));
+            const strengths = Array.from({length: size}, () => Array(size).fill(0));
+            for (let i = 0; i < data.rows.length; i++) {
+                counts[data.rows[i]][data.cols[i]] = data.counts[i];
+                strengths[data.rows[i]][data.cols[i]] = data.strength_sums[i];
+            }
+
+            const trace = {
+                type: 'heatmap',
+                x: data.traditions,
+                y: data.traditions,
+                z: counts,
+                customdata: strengths,
+                colorscale: [
+                    [0, '#1e1e1e'],
+                    [0.5, '#6a5acd'],
+                    [1, '#dda0dd']
+                ],
+                hovertemplate: '<b>%{y}</b> ↔ <b>%{x}</b><br>Connections: %{z}<br>Total strength: %{customdata}<extra></extra>'
+            };
+
+            const layout = {
+                paper_bgcolor: 'rgba(0,0,0,0)',
+                plot_bgcolor: 'rgba(0,0,0,0)',
+                font: {
+                    family: 'Arial, sans-serif',
+                    color: '#e0e0e0'
+                },
+                xaxis: {
+                    tickangle: -45,
+                    automargin: true
+                },
+                yaxis: {
+                    automargin: true
+                },
+                margin: {
+                    l: 20,
+                    r: 20,
+                    t: 20,
+                    b: 20
+                }
+            };
+
+            Plotly.newPlot('traditionHeatmap', [trace], layout, {responsive: true});
+        })
+        .catch(error => {
+            console.error("Error loading tradition matrix data:", error);
+            container.innerHTML = `<div class="alert alert-danger">Error loading tradition matrix: ${error.message}</div>`;
+        });
+}